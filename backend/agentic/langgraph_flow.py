@@ -8,6 +8,7 @@ from langchain_core.output_parsers import PydanticOutputParser
 
 # Import the agent status tracking module directly
 from backend.core.agent_status import update_agent_status
+from backend.core.session_memory import memory, snapshot_id_of
 
 # Define constants for agent names to avoid duplication
 PLANNER_AGENT = "Planning Agent"
@@ -18,6 +19,15 @@ DEBATE_AGENT = "Debate Orchestrator"
 CRITIQUE_AGENT = "Critique Evaluator"
 ERROR_AGENT = "Error Handler"
 
+def state_data(state: Dict[str, Any]) -> Tuple[Any, Any]:
+    """
+    The dataset a node runs on and its snapshot id: the frame passed in the state,
+    else the current session's frame.
+    """
+    if state.get('data') is not None:
+        return state['data'], state.get('snapshot_id')
+    return memory.df, memory.snapshot_id
+
 # Define structured output models for better type safety and validation
 class PlannerOutput(BaseModel):
     next_node: str = Field(description="The next node to route to")
@@ -153,17 +163,16 @@ def chart_node(state: Dict[str, Any]) -> Dict[str, Any]:
     
     try:
         from backend.agents.chart_agent import ChartAgent
-        from backend.core.session_memory import memory
         
         query = state.get('query', '')
-        df = state.get('data') if state.get('data') is not None else memory.df
+        df, snapshot_id = state_data(state)
         
         if isinstance(df, pd.DataFrame) and not df.empty:
             # Initialize agent with standard configuration
             agent = ChartAgent()
             
             # Run the agent with the query and data
-            result = agent.run(query, df)
+            result = agent.run(query, df, snapshot_id=snapshot_id)
             
             if "error" in result:
                 # Handle error case
@@ -238,17 +247,16 @@ def sql_node(state: Dict[str, Any]) -> Dict[str, Any]:
     
     try:
         from backend.agents.sql_agent import SQLAgent
-        from backend.core.session_memory import memory
         
         query = state.get('query', '')
-        df = state.get('data') if state.get('data') is not None else memory.df
+        df, snapshot_id = state_data(state)
         
         if isinstance(df, pd.DataFrame) and not df.empty:
             # Initialize agent with standard configuration
             agent = SQLAgent()
             
             # Run the agent with the query and data
-            result = agent.run(query, df)
+            result = agent.run(query, df, snapshot_id=snapshot_id)
             
             if "error" in result or (isinstance(result.get("output", {}), dict) and "sql_error" in result.get("output", {})):
                 # Handle error case
@@ -324,17 +332,16 @@ def insight_node(state: Dict[str, Any]) -> Dict[str, Any]:
     
     try:
         from backend.agents.insight_agent import InsightAgent
-        from backend.core.session_memory import memory
         
         query = state.get('query', '')
-        df = state.get('data') if state.get('data') is not None else memory.df
+        df, snapshot_id = state_data(state)
         
         if isinstance(df, pd.DataFrame) and not df.empty:
             # Initialize agent with standard configuration
             agent = InsightAgent()
             
             # Run the agent with the query and data
-            result = agent.run(query, df)
+            result = agent.run(query, df, snapshot_id=snapshot_id)
             
             if "error" in result:
                 # Handle error case
@@ -406,17 +413,16 @@ def debate_node(state: Dict[str, Any]) -> Dict[str, Any]:
     
     try:
         from backend.agents.debate_agent import DebateAgent
-        from backend.core.session_memory import memory
         
         query = state.get('query', '')
-        df = state.get('data') if state.get('data') is not None else memory.df
+        df, snapshot_id = state_data(state)
         
         if isinstance(df, pd.DataFrame) and not df.empty:
             # Initialize debate agent
             agent = DebateAgent()
             
             # Run the agent with the query and data
-            result = agent.run(query, df)
+            result = agent.run(query, df, snapshot_id=snapshot_id)
             
             if "error" in result:
                 # Handle error case
@@ -499,10 +505,9 @@ def critique_node(state: Dict[str, Any]) -> Dict[str, Any]:
     
     try:
         from backend.agents.critique_agent import CritiqueAgent
-        from backend.core.session_memory import memory
         
         query = state.get('query', '')
-        df = state.get('data') if state.get('data') is not None else memory.df
+        df, snapshot_id = state_data(state)
         result = state.get('result', {})
         
         if not result:
@@ -538,7 +543,7 @@ def critique_node(state: Dict[str, Any]) -> Dict[str, Any]:
         agent = CritiqueAgent()
         
         # Run critique with the query, data, and answer
-        critique_result = agent.run(query, df, answer=answer)
+        critique_result = agent.run(query, df, answer=answer, snapshot_id=snapshot_id)
         
         if "error" in critique_result:
             state["critique"] = critique_result
@@ -615,8 +620,7 @@ def error_handler_node(state: Dict[str, Any]) -> Dict[str, Any]:
     
     # Try to provide some basic information about the data
     try:
-        from backend.core.session_memory import memory
-        df = state.get('data') if state.get('data') is not None else memory.df
+        df, _ = state_data(state)
         if isinstance(df, pd.DataFrame) and not df.empty:
             basic_info = {
                 "rows": len(df),
@@ -688,7 +692,7 @@ def build_multiagent_graph():
 # Build the graph once at module level
 multiagent_flow = build_multiagent_graph()
 
-async def run_multiagent_flow_async(query, data=None, session_id="default"):
+async def run_multiagent_flow_async(query, data=None, session_id="default", snapshot_id=None):
     """
     Asynchronous version of the multiagent flow for better performance
     
@@ -696,6 +700,8 @@ async def run_multiagent_flow_async(query, data=None, session_id="default"):
         query (str): The user's query
         data (Any, optional): Data to process (e.g., DataFrame)
         session_id (str, optional): Session identifier for tracking agent status
+        snapshot_id (str, optional): Version id of the dataset snapshot `data` is;
+            looked up from `data` when omitted
         
     Returns:
         Dict: Results from the agent flow including steps and result
@@ -711,6 +717,7 @@ async def run_multiagent_flow_async(query, data=None, session_id="default"):
             "steps": [],
             "history": [],
             "session_id": session_id,
+            "snapshot_id": snapshot_id or snapshot_id_of(data),
             "start_time": pd.Timestamp.now()
         }
         
@@ -766,7 +773,7 @@ async def run_multiagent_flow_async(query, data=None, session_id="default"):
         
         return {"status": "error", "message": str(e)}
 
-def run_multiagent_flow(query, data=None, session_id="default"):
+def run_multiagent_flow(query, data=None, session_id="default", snapshot_id=None):
     """
     Run the multiagent flow with the given query and data
     This is a synchronous wrapper around the async function for backward compatibility
@@ -775,6 +782,8 @@ def run_multiagent_flow(query, data=None, session_id="default"):
         query (str): The user's query
         data (Any, optional): Data to process (e.g., DataFrame)
         session_id (str, optional): Session identifier for tracking agent status
+        snapshot_id (str, optional): Version id of the dataset snapshot `data` is;
+            looked up from `data` when omitted
         
     Returns:
         Dict: Results from the agent flow including steps and result
@@ -789,7 +798,7 @@ def run_multiagent_flow(query, data=None, session_id="default"):
             loop = asyncio.new_event_loop()
             asyncio.set_event_loop(loop)
             
-        return loop.run_until_complete(run_multiagent_flow_async(query, data, session_id))
+        return loop.run_until_complete(run_multiagent_flow_async(query, data, session_id, snapshot_id))
     except Exception as e:
         logger.error(f"Error in multiagent flow sync wrapper: {str(e)}")
         import traceback
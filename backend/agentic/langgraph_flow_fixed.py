@@ -5,6 +5,7 @@ import pandas as pd
 
 # Import the agent status tracking module directly
 from backend.core.agent_status import update_agent_status
+from backend.core.session_memory import snapshot_id_of
 
 def planner_node(state: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -283,7 +284,7 @@ def build_multiagent_graph():
 # Build the graph once at module level
 multiagent_flow = build_multiagent_graph()
 
-def run_multiagent_flow(query, data=None, session_id="default"):
+def run_multiagent_flow(query, data=None, session_id="default", snapshot_id=None):
     """
     Run the multiagent flow with the given query and data
     
@@ -291,6 +292,8 @@ def run_multiagent_flow(query, data=None, session_id="default"):
         query (str): The user's query
         data (Any, optional): Data to process (e.g., DataFrame)
         session_id (str, optional): Session identifier for tracking agent status
+        snapshot_id (str, optional): Version id of the dataset snapshot `data` is;
+            looked up from `data` when omitted
         
     Returns:
         Dict: Results from the agent flow including steps and result
@@ -305,7 +308,8 @@ def run_multiagent_flow(query, data=None, session_id="default"):
             "result": "",
             "steps": [],
             "history": [],
-            "session_id": session_id
+            "session_id": session_id,
+            "snapshot_id": snapshot_id or snapshot_id_of(data)
         }
         
         # Invoke the graph with the initial state
@@ -11,6 +11,7 @@ import logging
 from datetime import datetime, timedelta
 from enum import Enum
 from backend.core.logging import logger
+from backend.core.session_memory import snapshot_id_of
 from backend.core.tracing import traced
 
 # Add OpenTelemetry imports for detailed tracing
@@ -131,10 +132,14 @@ class AgentCache:
         key_content = f"{query}:{data_hash}:{kwargs_str}"
         return hashlib.md5(key_content.encode()).hexdigest()
     
-    def _hash_dataframe(self, df: pd.DataFrame) -> str:
-        """Create a hash representing dataframe content"""
+    def _hash_dataframe(self, df: pd.DataFrame, snapshot_id: Optional[str] = None) -> str:
+        """Identify dataframe content: its snapshot id when known, else a content hash"""
         if df is None or df.empty:
             return "empty_df"
+        snapshot_id = snapshot_id or snapshot_id_of(df)
+        if snapshot_id:
+            # Session snapshots are immutable, so the id stands for the content
+            return f"snapshot:{snapshot_id}"
         try:
             # Use pandas hash function for efficiency
             return str(hash(pd.util.hash_pandas_object(df).sum()))
@@ -142,13 +147,13 @@ class AgentCache:
             # Fallback to string representation hash
             return hashlib.md5(str(df.head()).encode()).hexdigest()
     
-    def get(self, query: str, data: pd.DataFrame, **kwargs) -> Optional[Dict]:
+    def get(self, query: str, data: pd.DataFrame, snapshot_id: Optional[str] = None, **kwargs) -> Optional[Dict]:
         """Get cached result if available and valid"""
         if self.policy == CachePolicy.NONE:
             self.misses += 1
             return None
             
-        data_hash = self._hash_dataframe(data)
+        data_hash = self._hash_dataframe(data, snapshot_id)
         cache_key = self._generate_key(query, data_hash, **kwargs)
         
         if cache_key not in self._cache:
@@ -167,12 +172,12 @@ class AgentCache:
         self.hits += 1
         return cached_item.get("result")
     
-    def set(self, query: str, data: pd.DataFrame, result: Dict, **kwargs):
+    def set(self, query: str, data: pd.DataFrame, result: Dict, snapshot_id: Optional[str] = None, **kwargs):
         """Cache a result"""
         if self.policy == CachePolicy.NONE:
             return
             
-        data_hash = self._hash_dataframe(data)
+        data_hash = self._hash_dataframe(data, snapshot_id)
         cache_key = self._generate_key(query, data_hash, **kwargs)
         
         self._cache[cache_key] = {
@@ -431,12 +436,12 @@ class BaseAgent:
                 "message": "An unexpected error occurred. Try again or contact support."
             }
     
-    def _check_cache(self, query: str, data: pd.DataFrame, **kwargs) -> Optional[Dict[str, Any]]:
+    def _check_cache(self, query: str, data: pd.DataFrame, snapshot_id: Optional[str] = None, **kwargs) -> Optional[Dict[str, Any]]:
         """Check if we have a cached result for this query and data"""
         if not self._cache or not self._config.cache_results:
             return None
             
-        cached_result = self._cache.get(query, data, **kwargs)
+        cached_result = self._cache.get(query, data, snapshot_id, **kwargs)
         if cached_result:
             # Update metrics for cache hit
             self._metrics.cache_hits += 1
@@ -509,6 +514,7 @@ class BaseAgent:
                        start_time: float,
                        retry_count: int,
                        current_span: Any,
+                       snapshot_id: Optional[str] = None,
                        **kwargs) -> Dict[str, Any]:
         """Handle successful execution and prepare response"""
         # Update metrics
@@ -534,7 +540,7 @@ class BaseAgent:
             
         # Cache successful result if caching is enabled
         if self._cache and self._config.cache_results:
-            self._cache.set(query, data, response, **kwargs)
+            self._cache.set(query, data, response, snapshot_id, **kwargs)
         
         # Emit completion event
         self._emit_event(AgentEvent.COMPLETE, {
@@ -545,12 +551,14 @@ class BaseAgent:
         return response
     
     @traced(name="agent_run")
-    def run(self, query: str, data: pd.DataFrame = None, **kwargs) -> Dict[str, Any]:
+    def run(self, query: str, data: pd.DataFrame = None, snapshot_id: Optional[str] = None, **kwargs) -> Dict[str, Any]:
         """
         Enhanced run method with caching, retry logic, and comprehensive metrics.
         Args:
             query: The user's question
             data: The data to operate on
+            snapshot_id: Version id of the session snapshot `data` is (keys the cache
+                without hashing the frame; looked up from `data` when omitted)
             **kwargs: Additional parameters
         Returns:
             Dict with structured output from the agent
@@ -560,7 +568,7 @@ class BaseAgent:
         max_retries = self._config.retry_attempts
         
         # Check cache first if enabled
-        cached_result = self._check_cache(query, data, **kwargs)
+        cached_result = self._check_cache(query, data, snapshot_id, **kwargs)
         if cached_result:
             return cached_result
         
@@ -589,7 +597,7 @@ class BaseAgent:
                 
                 # Handle successful execution
                 return self._handle_success(
-                    query, data, final_result, start_time, retry_count, current_span, **kwargs
+                    query, data, final_result, start_time, retry_count, current_span, snapshot_id, **kwargs
                 )
                 
             except Exception as e:
@@ -196,7 +196,7 @@ class ChartAgent(BaseAgent):
         """
         # Find date columns as potential x-axis for time series
         date_cols = [col for col in self.df.columns if pd.api.types.is_datetime64_any_dtype(self.df[col])]
-        numeric_cols = self.df.select_dtypes(include=["float", "int"]).columns.tolist()
+        numeric_cols = self.df.select_dtypes(include=["number"]).columns.tolist()
         categorical_cols = self.df.select_dtypes(include=["object", "category", "bool"]).columns.tolist()
         
         # For time series, prioritize date columns as x
@@ -2,29 +2,150 @@
 DataCleanerAgent: Handles data cleaning, normalization, and preparation for analysis.
 """
 
+import os
 import pandas as pd
 import re
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from backend.core.logging import logger
-from typing import Any, Dict, List, Union, Optional
-from backend.agents.base_agent import BaseAgent
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Union, Optional
+from pydantic import Field
+from backend.agents.base_agent import BaseAgent, AgentConfig
+from backend.core.change_log import ColumnChangeLog
+from backend.core.date_formats import DateFormats, parse_dates
+from backend.core.duplicates import RowHashes
+from backend.core.column_analysis import (
+    ColumnAnalysis,
+    ColumnAnalysisCache,
+    PARSE_DATETIME,
+    PARSE_NUMERIC,
+)
+from config.constants import (
+    CLEANER_SAMPLE_CONFIDENCE,
+    CLEANER_SAMPLE_MIN_ROWS,
+    CLEANER_SAMPLE_ROWS,
+    OUTLIER_SAMPLE_MIN_ROWS,
+    OUTLIER_SAMPLE_ROWS,
+    PLAN_DRIFT_TOLERANCE,
+)
+import traceback
+
+# Default worker threads for per-column cleaning (1 = sequential)
+CLEANER_WORKERS = int(os.getenv("CLEANER_WORKERS", "1"))
+
+# Unit detection rules in precedence order; the first rule whose substring occurs in
+# the stripped, lower-cased value decides the conversion type ("lbs" and "mile" are
+# implied by "lb" and "mi")
+_UNIT_RULES = [
+    ("weight_kg", ("kg",)),
+    ("weight_lb_to_kg", ("lb", "pound")),
+    ("weight_oz_to_kg", ("oz", "ounce")),
+    ("distance_km", ("km",)),
+    ("distance_mi_to_km", ("mi",)),
+    ("distance_ft_to_m", ("ft", "foot", "feet")),
+    ("currency", ("₹", "$", "€", "£", "¥")),
+    ("temp_f_to_c", ("°f", "fahrenheit")),
+    ("temp_c", ("°c", "celsius")),
+]
+_UNIT_KINDS = np.array([kind for kind, _ in _UNIT_RULES], dtype=object)
+_UNIT_RANKS = {needle: rank for rank, (_, needles) in enumerate(_UNIT_RULES) for needle in needles}
+_UNIT_ANY_PATTERN = "|".join(re.escape(needle) for needle in _UNIT_RANKS)
+# Lookahead so findall reports overlapping needles too ("°ft" holds both "°f" and "ft");
+# no needle is a prefix of another rule's needle, so none is shadowed at its position
+_UNIT_FIND_PATTERN = f"(?=({_UNIT_ANY_PATTERN}))"
+# conversion type -> (array conversion, decimals to round to or None)
+_UNIT_CONVERSIONS = {
+    "weight_kg": (lambda x: x, 2),
+    "weight_lb_to_kg": (lambda x: x * 0.453592, 2),  # Convert to kg
+    "weight_oz_to_kg": (lambda x: x * 0.0283495, 3),  # Convert to kg
+    "distance_km": (lambda x: x, 3),
+    "distance_mi_to_km": (lambda x: x * 1.60934, 3),  # Convert to km
+    "distance_ft_to_m": (lambda x: x * 0.3048, 3),  # Convert to meters
+    "currency": (lambda x: x, None),
+    "temp_f_to_c": (lambda x: (x - 32) * 5 / 9, 2),  # Convert to Celsius
+    "temp_c": (lambda x: x, None),
+}
+
+
+def _describe_date_formats(formats: Iterable[str], default: Optional[str] = None) -> Optional[str]:
+    """The format a date column was parsed with, "mixed" if several, else `default`."""
+    formats = list(formats or [])
+    if len(formats) == 1:
+        return formats[0]
+    return "mixed" if formats else default
+
+
+def _round_like_python(values: np.ndarray, decimals: int) -> np.ndarray:
+    """
+    Round an array exactly like the builtin round(). np.round scales by 10**decimals
+    first, which can flip values that sit next to a .5 tie (or lose precision on huge
+    values); those few are rounded with round() itself.
+    """
+    scaled = values * 10.0 ** decimals
+    rounded = np.round(values, decimals)
+    unsure = (
+        (np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6)
+        | (np.abs(scaled) >= 2.0 ** 52)
+        | ~np.isfinite(scaled)
+    )
+    if unsure.any():
+        rounded[unsure] = [round(float(v), decimals) for v in values[unsure]]
+    return rounded
+
+
+class DataCleanerConfig(AgentConfig):
+    """Configuration for DataCleanerAgent"""
+    sample_min_rows: int = Field(
+        default=CLEANER_SAMPLE_MIN_ROWS,
+        description="Frames with at least this many rows screen columns on a sample before full type detection",
+    )
+    sample_rows: int = Field(
+        default=CLEANER_SAMPLE_ROWS, description="Non-null values per column in the screening sample (0 disables)"
+    )
+    sample_confidence: float = Field(
+        default=CLEANER_SAMPLE_CONFIDENCE, description="Confidence required to rule a column out from its sample"
+    )
+    outlier_sample_min_rows: int = Field(
+        default=OUTLIER_SAMPLE_MIN_ROWS,
+        description="Frames with at least this many rows estimate outlier quartiles from a row sample (0 disables)",
+    )
+    outlier_sample_rows: int = Field(
+        default=OUTLIER_SAMPLE_ROWS, description="Rows sampled to estimate outlier quartiles"
+    )
+    workers: int = Field(
+        default=CLEANER_WORKERS,
+        description="Worker threads that clean columns in parallel (1 cleans them one after another)",
+    )
 
 
 class DataCleanerAgent(BaseAgent):
     name = "DataCleanerAgent"
     role = "Cleans and normalizes data for analysis"
 
-    def __init__(self, df: pd.DataFrame, config=None):
+    def __init__(self, df: pd.DataFrame, config=None, typed_columns: Optional[Iterable[str]] = None):
         """
         Initialize the DataCleanerAgent with a DataFrame.
         Args:
             df (pd.DataFrame): The data to clean.
-            config: Optional configuration
+            config: Optional configuration (dict, AgentConfig or DataCleanerConfig)
+            typed_columns: Columns whose dtype came from the source schema (e.g. Parquet);
+                string-to-numeric/date/unit inference is skipped for them.
         """
+        if not isinstance(config, DataCleanerConfig):
+            if isinstance(config, AgentConfig):
+                config = config.dict()
+            config = DataCleanerConfig(**(config or {}))
         super().__init__(config)
-        self.df = df.copy() if df is not None else pd.DataFrame()
-        self.original_df = df.copy() if df is not None else pd.DataFrame()
+        self.typed_columns = set(typed_columns or [])
+        self.outlier_bounds = {}  # column -> (lower, upper) IQR bounds from the last handle_outliers
+        self.clipped_shares = {}  # column -> share of rows handle_outliers capped
+        self.conversion_failures = {}  # column -> share of non-null values a numeric/date conversion lost
+        self.date_formats = {}  # column -> {"formats", "dayfirst"} a date conversion parsed with
+        self.plan_drift = []  # reasons the last replay_plan or apply_column_decisions found the plan drifted
+        self.column_analysis = ColumnAnalysisCache()  # parse results shared by detection and cleaning
+        self.row_hashes = RowHashes()  # duplicate analysis, kept in step with the working frame
+        self._load(df if df is not None else pd.DataFrame())
         self.cleaning_operations = []  # Track operations performed
         self.detailed_results = {}  # Store detailed operation results
         logger.info(f"[{self.name}] Initialized with DataFrame shape: {df.shape if df is not None else (0,0)}")
@@ -41,28 +162,10 @@ class DataCleanerAgent(BaseAgent):
         """
         # Update dataframe if provided in the call
         if data is not None and not data.empty:
-            self.df = data.copy()
-            self.original_df = data.copy()
+            self._load(data)
             
         # Initialize detailed results structure
-        self.detailed_results = {
-            "units_normalized": [],
-            "numeric_conversions": [],
-            "date_conversions": [],
-            "outliers_fixed": [],
-            "duplicates_removed": 0,
-            "duplicate_details": {
-                "total_duplicates": 0,
-                "percentage_of_data": 0.0,
-                "potential_duplicate_columns": [],
-                "sample_rows": []
-            },
-            "missing_values_handled": {
-                "total_filled": 0,
-                "strategies": {},
-                "columns": []
-            }
-        }
+        self.detailed_results = self._empty_detailed_results()
         
         # Only continue if we have data to work with
         if self.df is None or self.df.empty:
@@ -92,120 +195,33 @@ class DataCleanerAgent(BaseAgent):
             columns = self.df.columns.tolist()
             logger.info(f"[{self.name}] Found columns: {columns}")
             
-            # Detect and populate numeric conversions
-            for column in columns:
-                # Check if column contains numeric values
-                if self.df[column].dtype == 'object':  # If column is string/object
-                    # Try to convert to numeric
-                    numeric_series = pd.to_numeric(self.df[column], errors='coerce')
-                    na_before = self.df[column].isna().sum()
-                    na_after = numeric_series.isna().sum()
-                    
-                    # If conversion is possible (at least some values convert successfully)
-                    if na_after < len(self.df):
-                        success_count = len(self.df) - na_after
-                        success_rate = (success_count / len(self.df)) * 100
-                        
-                        if success_rate > 50:  # If more than 50% can be converted
-                            examples = []
-                            # Get example conversions
-                            for i in range(min(2, len(self.df))):
-                                if not pd.isna(numeric_series.iloc[i]):
-                                    examples.append({
-                                        "from": str(self.df[column].iloc[i]),
-                                        "to": float(numeric_series.iloc[i]),
-                                        "index": i
-                                    })
-                            
-                            # Add to numeric_conversions
-                            self.detailed_results["numeric_conversions"].append({
-                                "column": column,
-                                "from_type": "string",
-                                "to_type": "float" if "." in str(self.df[column].iloc[0]) else "int",
-                                "success_rate": round(success_rate, 1),
-                                "values_converted": success_count,
-                                "total_values": len(self.df),
-                                "na_before": int(na_before),
-                                "na_after": int(na_after),
-                                "examples": examples,
-                                "min_value": float(numeric_series.min()),
-                                "max_value": float(numeric_series.max())
-                            })
+            # Detect and populate numeric conversions (columns may be analysed in parallel;
+            # entries are appended in column order)
+            for entry in self._map_columns(self._detect_numeric_conversion, columns):
+                if entry is not None:
+                    self.detailed_results["numeric_conversions"].append(entry)
             
             # Detect and populate date conversions
-            for column in columns:
-                if self.df[column].dtype == 'object':  # If column is string/object
-                    # Try to convert to datetime
-                    try:
-                        date_series = pd.to_datetime(self.df[column], errors='coerce')
-                        na_before = self.df[column].isna().sum()
-                        na_after = date_series.isna().sum()
-                        
-                        # If conversion is possible (at least some values convert successfully)
-                        if na_after < len(self.df):
-                            success_count = len(self.df) - na_after
-                            success_rate = (success_count / len(self.df)) * 100
-                            
-                            if success_rate > 50:  # If more than 50% can be converted
-                                # Detect format
-                                sample_val = str(self.df[column].iloc[0])
-                                format_detected = None
-                                
-                                if "-" in sample_val:
-                                    if sample_val.count("-") == 2:
-                                        if sample_val[4] == "-":  # YYYY-MM-DD
-                                            format_detected = "%Y-%m-%d"
-                                        else:  # DD-MM-YYYY or MM-DD-YYYY
-                                            format_detected = "%d-%m-%Y"
-                                elif "/" in sample_val:
-                                    format_detected = "%m/%d/%Y"
-                                
-                                # Check if time components exist
-                                has_time = ":" in sample_val
-                                
-                                examples = []
-                                # Get example conversions
-                                for i in range(min(2, len(self.df))):
-                                    if not pd.isna(date_series.iloc[i]):
-                                        examples.append({
-                                            "from": str(self.df[column].iloc[i]),
-                                            "to": date_series.iloc[i].strftime("%Y-%m-%d"),
-                                            "index": i
-                                        })
-                                
-                                # Add to date_conversions
-                                self.detailed_results["date_conversions"].append({
-                                    "column": column,
-                                    "from_type": "string",
-                                    "to_type": "datetime",
-                                    "success_rate": round(success_rate, 1),
-                                    "values_converted": success_count,
-                                    "format_detected": format_detected or "auto-detected",
-                                    "date_range": {
-                                        "min": date_series.min().strftime("%Y-%m-%d") if not pd.isna(date_series.min()) else "",
-                                        "max": date_series.max().strftime("%Y-%m-%d") if not pd.isna(date_series.max()) else ""
-                                    },
-                                    "examples": examples,
-                                    "na_before": int(na_before),
-                                    "na_after": int(na_after),
-                                    "time_components": has_time
-                                })
-                    except Exception as e:
-                        logger.warning(f"[{self.name}] Error detecting date format for column {column}: {e}")
-            
-            # Check for duplicates
-            duplicate_count = self.df.duplicated().sum()
+            for entry in self._map_columns(self._detect_date_conversion, columns):
+                if entry is not None:
+                    self.detailed_results["date_conversions"].append(entry)
+            
+            # Check for duplicates (row hashes are reused by remove_duplicates)
+            duplicate_mask = self.row_hashes.duplicated(self.df)
+            duplicate_count = duplicate_mask.sum()
             if duplicate_count > 0:
                 self.detailed_results["duplicates_removed"] = int(duplicate_count)
                 self.detailed_results["duplicate_details"] = {
                     "total_duplicates": int(duplicate_count),
                     "percentage_of_data": round((duplicate_count / len(self.df)) * 100, 1),
                     "potential_duplicate_columns": [],
-                    "sample_rows": self.df[self.df.duplicated(keep='first')].iloc[0:1].to_dict('records')
+                    "sample_rows": self.df[duplicate_mask].iloc[0:1].to_dict('records')
                 }
                 
-                # Identify columns that might be causing duplicates
+                # Identify columns that might be causing duplicates (only columns with repeated values)
                 for column in columns:
+                    if not self.row_hashes.has_repeats(self.df, column):
+                        continue
                     value_counts = self.df[column].value_counts()
                     if value_counts.max() > 1:
                         most_common_val = value_counts.idxmax()
@@ -244,6 +260,55 @@ class DataCleanerAgent(BaseAgent):
             result_df = self.clean()
         
         # Add real operations based on the detailed_results we generated
+        self.cleaning_operations = self._report_operations()
+        
+        # Calculate cleaning impact statistics
+        stats = self._calculate_cleaning_stats()
+        
+        logger.info(
+            f"[{self.name}] Column analysis: {self.column_analysis.misses} columns parsed, "
+            f"{self.column_analysis.hits} reuses"
+        )
+        # Parsed copies are only needed while cleaning this upload
+        self.column_analysis.invalidate()
+
+        # Log the detailed results structure to confirm it's being used
+        logger.info(f"[{self.name}] _execute returning data with {len(self.cleaning_operations)} operations")
+        logger.info(f"[{self.name}] detailed_results has keys: {list(self.detailed_results.keys())}")
+        logger.info(f"[{self.name}] units_normalized size: {len(self.detailed_results.get('units_normalized', []))}")
+        logger.info(f"[{self.name}] numeric_conversions size: {len(self.detailed_results.get('numeric_conversions', []))}")
+        logger.info(f"[{self.name}] date_conversions size: {len(self.detailed_results.get('date_conversions', []))}")
+        
+        return {
+            "cleaned_data": result_df,
+            "operations": self.cleaning_operations,
+            "cleaning_stats": stats,
+            "detailed_results": self.detailed_results
+        }
+
+    def _empty_detailed_results(self) -> Dict[str, Any]:
+        """Detailed results structure before any cleaning step has reported"""
+        return {
+            "units_normalized": [],
+            "numeric_conversions": [],
+            "date_conversions": [],
+            "outliers_fixed": [],
+            "duplicates_removed": 0,
+            "duplicate_details": {
+                "total_duplicates": 0,
+                "percentage_of_data": 0.0,
+                "potential_duplicate_columns": [],
+                "sample_rows": []
+            },
+            "missing_values_handled": {
+                "total_filled": 0,
+                "strategies": {},
+                "columns": []
+            }
+        }
+
+    def _report_operations(self) -> List[Dict[str, Any]]:
+        """Report operations derived from detailed_results"""
         operations = []
         
         # Add numeric conversion operations
@@ -271,31 +336,126 @@ class DataCleanerAgent(BaseAgent):
             operations.append({
                 "operation": "remove_duplicates",
                 "count_removed": self.detailed_results["duplicates_removed"],
-                "original_count": len(self.original_df),
+                "original_count": self.change_log.rows_before,
                 "new_count": len(self.df),
-                "percentage_removed": f"{round((self.detailed_results['duplicates_removed'] / len(self.original_df)) * 100, 1)}%"
+                "percentage_removed": f"{round((self.detailed_results['duplicates_removed'] / self.change_log.rows_before) * 100, 1)}%"
             })
+        return operations
+
+    def _detect_numeric_conversion(self, column: str) -> Optional[Dict[str, Any]]:
+        """
+        Report entry for a column that would convert to numeric, or None.
+        Args:
+            column (str): Column to analyse.
+        Returns:
+            Optional[Dict[str, Any]]: The numeric_conversions entry.
+        """
+        # Check if column contains numeric values
+        if not (self._needs_inference(column) and self._may_convert(column, PARSE_NUMERIC)):
+            return None
+        # Try to convert to numeric (parsed once, reused by fix_numerics)
+        analysis = self._analysis(column)
+        numeric_series = analysis.numeric
+        na_before = analysis.na_count
+        na_after = analysis.numeric_na_count
         
-        # Store operations
-        self.cleaning_operations = operations
-        
-        # Calculate cleaning impact statistics
-        stats = self._calculate_cleaning_stats()
+        # If conversion is possible (at least some values convert successfully)
+        if na_after >= len(self.df):
+            return None
+        success_count = len(self.df) - na_after
+        success_rate = (success_count / len(self.df)) * 100
+        if success_rate <= 50:  # More than 50% must convert
+            return None
         
-        # Log the detailed results structure to confirm it's being used
-        logger.info(f"[{self.name}] _execute returning data with {len(self.cleaning_operations)} operations")
-        logger.info(f"[{self.name}] detailed_results has keys: {list(self.detailed_results.keys())}")
-        logger.info(f"[{self.name}] units_normalized size: {len(self.detailed_results.get('units_normalized', []))}")
-        logger.info(f"[{self.name}] numeric_conversions size: {len(self.detailed_results.get('numeric_conversions', []))}")
-        logger.info(f"[{self.name}] date_conversions size: {len(self.detailed_results.get('date_conversions', []))}")
+        examples = []
+        # Get example conversions
+        for i in range(min(2, len(self.df))):
+            if not pd.isna(numeric_series.iloc[i]):
+                examples.append({
+                    "from": str(self.df[column].iloc[i]),
+                    "to": float(numeric_series.iloc[i]),
+                    "index": i
+                })
         
         return {
-            "cleaned_data": result_df,
-            "operations": self.cleaning_operations,
-            "cleaning_stats": stats,
-            "detailed_results": self.detailed_results
+            "column": column,
+            "from_type": "string",
+            "to_type": "float" if "." in str(self.df[column].iloc[0]) else "int",
+            "success_rate": round(success_rate, 1),
+            "values_converted": success_count,
+            "total_values": len(self.df),
+            "na_before": int(na_before),
+            "na_after": int(na_after),
+            "examples": examples,
+            "min_value": float(numeric_series.min()),
+            "max_value": float(numeric_series.max())
         }
 
+    def _detect_date_conversion(self, column: str) -> Optional[Dict[str, Any]]:
+        """
+        Report entry for a column that would convert to datetime, or None.
+        Args:
+            column (str): Column to analyse.
+        Returns:
+            Optional[Dict[str, Any]]: The date_conversions entry.
+        """
+        if not (self._needs_inference(column) and self._may_convert(column, PARSE_DATETIME)):
+            return None
+        # Try to convert to datetime
+        try:
+            analysis = self._analysis(column)
+            date_series = analysis.datetime
+            na_before = analysis.na_count
+            na_after = analysis.datetime_na_count
+            
+            # If conversion is possible (at least some values convert successfully)
+            if na_after >= len(self.df):
+                return None
+            success_count = len(self.df) - na_after
+            success_rate = (success_count / len(self.df)) * 100
+            if success_rate <= 50:  # More than 50% must convert
+                return None
+            
+            # Formats the column was actually parsed with (several for mixed-format columns)
+            date_formats = analysis.date_formats
+            format_detected = _describe_date_formats(date_formats)
+            
+            # Check if time components exist
+            sample_val = str(self.df[column].iloc[0])
+            has_time = ":" in sample_val
+            
+            examples = []
+            # Get example conversions
+            for i in range(min(2, len(self.df))):
+                if not pd.isna(date_series.iloc[i]):
+                    examples.append({
+                        "from": str(self.df[column].iloc[i]),
+                        "to": date_series.iloc[i].strftime("%Y-%m-%d"),
+                        "index": i
+                    })
+            
+            return {
+                "column": column,
+                "from_type": "string",
+                "to_type": "datetime",
+                "success_rate": round(success_rate, 1),
+                "values_converted": success_count,
+                "format_detected": format_detected or "auto-detected",
+                "formats": date_formats,
+                "dayfirst": bool(analysis.date_inference and analysis.date_inference.dayfirst),
+                "date_range": {
+                    "min": date_series.min().strftime("%Y-%m-%d") if not pd.isna(date_series.min()) else "",
+                    "max": date_series.max().strftime("%Y-%m-%d") if not pd.isna(date_series.max()) else ""
+                },
+                "examples": examples,
+                "na_before": int(na_before),
+                "na_after": int(na_after),
+                "time_components": has_time
+            }
+        except Exception as e:
+            logger.warning(f"[{self.name}] Error detecting date format for column {column}: {e}")
+            return None
+
     def normalize_units(self) -> pd.DataFrame:
         """
         Normalize units in string columns (e.g., kg, lbs, currency).
@@ -308,78 +468,15 @@ class DataCleanerAgent(BaseAgent):
                 logger.warning(f"[{self.name}] Cannot normalize units on empty DataFrame")
                 return self.df
                 
-            for col in self.df.columns:
-                if self.df[col].dtype == "object":
-                    original_values = self.df[col].copy()
-                    
-                    # Track conversion types
-                    unit_types_found = set()
-                    sample_conversions = []
-                    
-                    # Process each value and track transformations
-                    for idx, val in enumerate(self.df[col]):
-                        if isinstance(val, str):
-                            val_lower = val.strip().lower()
-                            conversion_type = None
-                            
-                            # Detect unit type
-                            if "kg" in val_lower:
-                                conversion_type = "weight_kg"
-                            elif any(unit in val_lower for unit in ["lb", "lbs", "pound"]):
-                                conversion_type = "weight_lb_to_kg"
-                            elif any(unit in val_lower for unit in ["oz", "ounce"]):
-                                conversion_type = "weight_oz_to_kg"
-                            elif "km" in val_lower:
-                                conversion_type = "distance_km"
-                            elif "mi" in val_lower or "mile" in val_lower:
-                                conversion_type = "distance_mi_to_km"
-                            elif "ft" in val_lower or "foot" in val_lower or "feet" in val_lower:
-                                conversion_type = "distance_ft_to_m"
-                            elif any(currency in val_lower for currency in ["₹", "$", "€", "£", "¥"]):
-                                conversion_type = "currency"
-                            elif "°f" in val_lower or "fahrenheit" in val_lower:
-                                conversion_type = "temp_f_to_c"
-                            elif "°c" in val_lower or "celsius" in val_lower:
-                                conversion_type = "temp_c"
-                                
-                            if conversion_type:
-                                unit_types_found.add(conversion_type)
-                                # Store a few examples of conversions
-                                if len(sample_conversions) < 5:
-                                    sample_conversions.append({
-                                        "from": val,
-                                        "conversion_type": conversion_type
-                                    })
-                    
-                    # Apply the standardization
-                    self.df[col] = self.df[col].apply(self._standardize_unit)
-                    
-                    # Check if any values changed
-                    changed_mask = original_values != self.df[col]
-                    changed_count = changed_mask.sum()
-                    
-                    if changed_count > 0:
-                        # Update the sample conversions with "to" values
-                        for i, sample in enumerate(sample_conversions):
-                            if i < len(changed_mask) and changed_mask.iloc[i]:
-                                sample["to"] = self.df[col].iloc[i]
-                            
-                        self.cleaning_operations.append({
-                            "operation": "normalize_units",
-                            "column": col,
-                            "count_changed": changed_count,
-                            "unit_types": list(unit_types_found)
-                        })
-                        
-                        # Update detailed results with enhanced information
-                        self.detailed_results["units_normalized"].append({
-                            "column": col,
-                            "count_changed": changed_count,
-                            "unit_types": list(unit_types_found),
-                            "examples": sample_conversions,
-                            "original_sample": original_values[changed_mask].head(3).tolist(),
-                            "normalized_sample": self.df[col][changed_mask].head(3).tolist()
-                        })
+            columns = self.df.columns.tolist()
+            for col, (standardized, operation, details) in zip(
+                columns, self._map_columns(self._normalize_units_column, columns)
+            ):
+                if standardized is not None:
+                    self._set_column(col, standardized, "normalize_units")
+                if operation is not None:
+                    self.cleaning_operations.append(operation)
+                    self.detailed_results["units_normalized"].append(details)
                     
             logger.info(f"[{self.name}] normalize_units completed.")
             return self.df
@@ -388,60 +485,142 @@ class DataCleanerAgent(BaseAgent):
             logger.error(f"[{self.name}] Error in normalize_units: {str(e)}")
             return self.df  # Return original DataFrame if error
 
-    def _standardize_unit(self, val: Any) -> Any:
+    def _normalize_units_column(self, col: str) -> tuple:
         """
-        Standardize a single value for units and currency.
+        Normalize the units of one column without touching the working frame.
         Args:
-            val (Any): The value to standardize.
+            col (str): Column to normalize.
         Returns:
-            Any: The standardized value.
+            tuple: (normalized series or None if unchanged, cleaning operation or None,
+                units_normalized entry or None).
         """
-        if not isinstance(val, str):
-            return val
+        if not self._needs_inference(col):
+            return None, None, None
+        original_values = self.df[col]
+        
+        # Standardize the whole column at once and track conversion types
+        standardized, conversion_types = self._standardize_units(original_values)
+        found_pos = np.flatnonzero(pd.notna(conversion_types))
+        # Insert in first-seen order so the set iterates as the per-value loop's did
+        unit_types_found = set(pd.unique(conversion_types[found_pos]))
+        sample_conversions = [
+            {"from": original_values.iloc[pos], "conversion_type": conversion_types[pos]}
+            for pos in found_pos[:5]
+        ]
+        
+        # Check if any values changed
+        changed_mask = original_values != standardized
+        changed_count = changed_mask.sum()
+        normalized = None if standardized is original_values else standardized
+        if changed_count == 0:
+            return normalized, None, None
+        
+        # Update the sample conversions with "to" values
+        for i, sample in enumerate(sample_conversions):
+            if i < len(changed_mask) and changed_mask.iloc[i]:
+                sample["to"] = standardized.iloc[i]
+        
+        operation = {
+            "operation": "normalize_units",
+            "column": col,
+            "count_changed": changed_count,
+            "unit_types": list(unit_types_found)
+        }
+        details = {
+            "column": col,
+            "count_changed": changed_count,
+            "unit_types": list(unit_types_found),
+            "examples": sample_conversions,
+            "original_sample": original_values[changed_mask].head(3).tolist(),
+            "normalized_sample": standardized[changed_mask].head(3).tolist()
+        }
+        return normalized, operation, details
 
+    def _standardize_units(self, series: pd.Series) -> tuple:
+        """
+        Standardize units and currency in a whole column at once. Distinct values
+        are classified against _UNIT_RULES (the earliest matching rule wins), numbers are
+        extracted with one regex pass and converted with array operations, and the
+        results are mapped back onto the rows. Unparseable values are left unchanged,
+        and the input series itself is returned if no value or dtype changes.
+        Args:
+            series (pd.Series): The object column to standardize.
+        Returns:
+            tuple: (standardized pd.Series, object ndarray with the conversion type of each row or None)
+        """
+        values = series.to_numpy(dtype=object)
         try:
-            val_lower = val.strip().lower()
-            # Define regex pattern for extracting numeric values once to reduce duplication
-            numeric_pattern = r'[^\d.]'
-            
-            # Weight normalization
-            if "kg" in val_lower:
-                numeric_val = float(re.sub(numeric_pattern, '', val_lower))
-                return round(numeric_val, 2)
-            elif any(unit in val_lower for unit in ["lb", "lbs", "pound"]):
-                lbs = float(re.sub(numeric_pattern, '', val_lower))
-                return round(lbs * 0.453592, 2)  # Convert to kg
-            elif any(unit in val_lower for unit in ["oz", "ounce"]):
-                oz = float(re.sub(numeric_pattern, '', val_lower))
-                return round(oz * 0.0283495, 3)  # Convert to kg
-                
-            # Distance/length normalization
-            elif "km" in val_lower:
-                numeric_val = float(re.sub(numeric_pattern, '', val_lower))
-                return round(numeric_val, 3)
-            elif "mi" in val_lower or "mile" in val_lower:
-                miles = float(re.sub(numeric_pattern, '', val_lower))
-                return round(miles * 1.60934, 3)  # Convert to km
-            elif "ft" in val_lower or "foot" in val_lower or "feet" in val_lower:
-                feet = float(re.sub(numeric_pattern, '', val_lower))
-                return round(feet * 0.3048, 3)  # Convert to meters
-                
-            # Currency normalization
-            elif any(currency in val_lower for currency in ["₹", "$", "€", "£", "¥"]):
-                numeric_val = re.sub(numeric_pattern, '', val_lower)
-                return float(numeric_val) if numeric_val else val
-            
-            # Temperature
-            elif "°f" in val_lower or "fahrenheit" in val_lower:
-                fahrenheit = float(re.sub(numeric_pattern, '', val_lower))
-                return round((fahrenheit - 32) * 5/9, 2)  # Convert to Celsius
-            elif "°c" in val_lower or "celsius" in val_lower:
-                return float(re.sub(numeric_pattern, '', val_lower))
-                
-        except Exception as e:
-            logger.error(f"[{self.name}] Error standardizing unit: {val}, error: {str(e)}")
-            
-        return val
+            codes, uniques = pd.factorize(values)
+        except TypeError:
+            # Unhashable cells: treat every row as distinct
+            codes, uniques = np.arange(len(values)), values
+        known = codes >= 0
+        conversion_types = np.full(len(values), None, dtype=object)
+        try:
+            # Surrounding whitespace never holds a needle, digit or dot, so lower() alone suffices
+            lowered = pd.Series(uniques, dtype=object).str.lower()
+        except AttributeError:
+            # No string values in the column
+            lowered = None
+
+        remaining_strings = 0
+        any_converted = False
+        if lowered is not None:
+            is_string = lowered.notna().to_numpy()
+            # One regex pass finds values mentioning any unit; the conversion type of each is
+            # the highest-precedence rule among all needles it contains
+            candidate_pos = np.flatnonzero(lowered.str.contains(_UNIT_ANY_PATTERN, na=False).to_numpy(dtype=bool))
+            candidates = pd.Series(lowered.to_numpy()[candidate_pos], dtype=object)
+            ranks = candidates.str.findall(_UNIT_FIND_PATTERN).explode().map(_UNIT_RANKS)
+            kinds = _UNIT_KINDS[ranks.groupby(level=0).min().to_numpy(dtype=int)]
+            unique_kinds = np.full(len(uniques), None, dtype=object)
+            unique_kinds[candidate_pos] = kinds
+
+            digits = candidates.str.replace(r"[^\d.]+", "", regex=True)
+            try:
+                numbers = digits.astype(float).to_numpy()
+                parsable = np.ones(len(candidates), dtype=bool)
+            except ValueError:
+                parsable = digits.str.fullmatch(r"\d+\.?\d*|\.\d+", na=False).to_numpy()
+                numbers = np.full(len(candidates), np.nan)
+                numbers[parsable] = digits[parsable].astype(float).to_numpy()
+            converted = np.full(len(candidates), np.nan)
+            for kind, (convert, decimals) in _UNIT_CONVERSIONS.items():
+                mask = parsable & (kinds == kind)
+                if mask.any():
+                    result = convert(numbers[mask])
+                    converted[mask] = result if decimals is None else _round_like_python(result, decimals)
+
+            # Currency without any digits is kept silently; everything else was a parse failure
+            failed = ~parsable & ~((kinds == "currency") & (digits == "").to_numpy())
+            if failed.any():
+                logger.error(
+                    f"[{self.name}] Error standardizing unit: {int(failed.sum())} distinct values in "
+                    f"{series.name} could not be parsed, e.g. {uniques[candidate_pos[failed][0]]!r}; left unchanged"
+                )
+
+            # Map the per-distinct-value results back onto the rows
+            unique_parsed = np.zeros(len(uniques), dtype=bool)
+            unique_parsed[candidate_pos] = parsable
+            unique_converted = np.full(len(uniques), np.nan)
+            unique_converted[candidate_pos] = converted
+
+            conversion_types[known] = unique_kinds[codes[known]]
+            row_parsed = np.zeros(len(values), dtype=bool)
+            row_parsed[known] = unique_parsed[codes[known]]
+            any_converted = bool(row_parsed.any())
+            if any_converted:
+                values = values.copy()
+                values[row_parsed] = unique_converted[codes[row_parsed]]
+            remaining_strings = int((is_string[codes[known]] & ~row_parsed[known]).sum())
+
+        standardized = pd.Series(values, index=series.index, name=series.name, dtype=object)
+        if remaining_strings == 0:
+            # Same dtype inference Series.apply performs once no strings are left
+            standardized = standardized.infer_objects()
+        if not any_converted and standardized.dtype == series.dtype:
+            return series, conversion_types
+        return standardized, conversion_types
 
     def fix_numerics(self) -> pd.DataFrame:
         """
@@ -455,64 +634,14 @@ class DataCleanerAgent(BaseAgent):
                 logger.warning(f"[{self.name}] Cannot fix numerics on empty DataFrame")
                 return self.df
                 
-            for col in self.df.columns:
-                if self.df[col].dtype == "object":
-                    original_dtype = self.df[col].dtype
-                    original_values = self.df[col].copy()
-                    
-                    try:
-                        # Try to convert to numeric with coercing to identify all potential numbers
-                        self.df[col] = pd.to_numeric(self.df[col], errors="coerce")
-                        
-                        # Gather conversion examples
-                        changed_mask = pd.notna(self.df[col]) & (self.df[col].astype(str) != original_values.astype(str))
-                        conversion_examples = []
-                        
-                        if changed_mask.any():
-                            # Get up to 5 examples of converted values
-                            sample_indices = changed_mask[changed_mask].index[:5]
-                            for idx in sample_indices:
-                                conversion_examples.append({
-                                    "from": str(original_values[idx]),
-                                    "to": str(self.df[col][idx]),
-                                    "index": int(idx)
-                                })
-                        
-                        # Calculate conversion stats
-                        conversion_count = pd.notna(self.df[col]).sum()
-                        original_non_na_count = original_values.notna().sum()
-                        success_rate = round(conversion_count / max(1, original_non_na_count) * 100, 2)
-                        
-                        # Check if conversion was successful
-                        if self.df[col].dtype != original_dtype and success_rate > 50:
-                            self.cleaning_operations.append({
-                                "operation": "convert_numeric",
-                                "column": col,
-                                "from_type": str(original_dtype),
-                                "to_type": str(self.df[col].dtype),
-                                "conversion_rate": f"{success_rate}%",
-                                "values_converted": int(conversion_count)
-                            })
-                            
-                            # Update detailed results with more informative data
-                            self.detailed_results["numeric_conversions"].append({
-                                "column": col,
-                                "from_type": str(original_dtype),
-                                "to_type": str(self.df[col].dtype),
-                                "success_rate": success_rate,
-                                "values_converted": int(conversion_count),
-                                "total_values": int(original_non_na_count),
-                                "na_before": int(original_values.isna().sum()),
-                                "na_after": int(self.df[col].isna().sum()),
-                                "examples": conversion_examples,
-                                "min_value": None if self.df[col].isna().all() else float(self.df[col].min()),
-                                "max_value": None if self.df[col].isna().all() else float(self.df[col].max())
-                            })
-                        else:
-                            # Revert if the conversion wasn't successful
-                            self.df[col] = original_values
-                    except Exception as e:
-                        logger.error(f"[{self.name}] Error fixing numerics in column {col}: {str(e)}")
+            columns = self.df.columns.tolist()
+            for col, result in zip(columns, self._map_columns(self._fix_numerics_column, columns)):
+                if result is not None:
+                    numeric, operation, details = result
+                    self._set_column(col, numeric, "fix_numerics")
+                    self.conversion_failures[col] = round(1 - details["success_rate"] / 100, 4)
+                    self.cleaning_operations.append(operation)
+                    self.detailed_results["numeric_conversions"].append(details)
                         
             logger.info(f"[{self.name}] fix_numerics completed.")
             return self.df
@@ -521,6 +650,74 @@ class DataCleanerAgent(BaseAgent):
             logger.error(f"[{self.name}] Error in fix_numerics: {str(e)}")
             return self.df  # Return original DataFrame if error
 
+    def _fix_numerics_column(self, col: str) -> Optional[tuple]:
+        """
+        Convert one column to numeric without touching the working frame.
+        Args:
+            col (str): Column to convert.
+        Returns:
+            Optional[tuple]: (numeric series, cleaning operation, numeric_conversions entry),
+                or None if the column is kept.
+        """
+        if not (self._needs_inference(col) and self._may_convert(col, PARSE_NUMERIC)):
+            return None
+        original_dtype = self.df[col].dtype
+        original_values = self.df[col]
+        
+        try:
+            # Numeric parse with coercing to identify all potential numbers (shared with detection)
+            numeric = self._analysis(col).numeric
+            
+            # Gather conversion examples
+            changed_mask = pd.notna(numeric) & (numeric.astype(str) != original_values.astype(str))
+            conversion_examples = []
+            
+            if changed_mask.any():
+                # Get up to 5 examples of converted values
+                sample_indices = changed_mask[changed_mask].index[:5]
+                for idx in sample_indices:
+                    conversion_examples.append({
+                        "from": str(original_values[idx]),
+                        "to": str(numeric[idx]),
+                        "index": int(idx)
+                    })
+            
+            # Calculate conversion stats
+            conversion_count = pd.notna(numeric).sum()
+            original_non_na_count = original_values.notna().sum()
+            success_rate = round(conversion_count / max(1, original_non_na_count) * 100, 2)
+            
+            # Keep the conversion only if it was successful
+            if numeric.dtype == original_dtype or success_rate <= 50:
+                return None
+            operation = {
+                "operation": "convert_numeric",
+                "column": col,
+                "from_type": str(original_dtype),
+                "to_type": str(numeric.dtype),
+                "conversion_rate": f"{success_rate}%",
+                "values_converted": int(conversion_count)
+            }
+            
+            # Detailed results with more informative data
+            details = {
+                "column": col,
+                "from_type": str(original_dtype),
+                "to_type": str(numeric.dtype),
+                "success_rate": success_rate,
+                "values_converted": int(conversion_count),
+                "total_values": int(original_non_na_count),
+                "na_before": int(original_values.isna().sum()),
+                "na_after": int(numeric.isna().sum()),
+                "examples": conversion_examples,
+                "min_value": None if numeric.isna().all() else float(numeric.min()),
+                "max_value": None if numeric.isna().all() else float(numeric.max())
+            }
+            return numeric, operation, details
+        except Exception as e:
+            logger.error(f"[{self.name}] Error fixing numerics in column {col}: {str(e)}")
+            return None
+
     def normalize_dates(self) -> pd.DataFrame:
         """
         Normalize date/time columns to datetime dtype.
@@ -533,92 +730,18 @@ class DataCleanerAgent(BaseAgent):
                 logger.warning(f"[{self.name}] Cannot normalize dates on empty DataFrame")
                 return self.df
             
-            # Identify potential date columns
-            date_keywords = ["date", "time", "day", "year", "month"]
-            potential_date_cols = [
-                col for col in self.df.columns
-                if any(keyword in col.lower() for keyword in date_keywords)
-                or (self.df[col].dtype == "object" and self._is_likely_date(self.df[col]))
-            ]
-            
-            for col in potential_date_cols:
-                original_dtype = self.df[col].dtype
-                original_values = self.df[col].copy()
-                
-                try:
-                    # Try to convert to datetime
-                    self.df[col] = pd.to_datetime(self.df[col], errors='coerce')
-                    
-                    # Get conversion stats
-                    conversion_count = pd.notna(self.df[col]).sum()
-                    original_non_na_count = original_values.notna().sum()
-                    success_rate = round(conversion_count / max(1, original_non_na_count) * 100, 2)
-                    
-                    # Collect sample conversions
-                    changed_mask = pd.notna(self.df[col]) & (original_values != self.df[col])
-                    date_examples = []
-                    
-                    if changed_mask.any():
-                        # Get up to 5 examples of date conversions
-                        sample_indices = changed_mask[changed_mask].index[:5]
-                        for idx in sample_indices:
-                            date_examples.append({
-                                "from": str(original_values[idx]),
-                                "to": str(self.df[col][idx]),
-                                "index": int(idx)
-                            })
-                    
-                    # Check if conversion was successful
-                    if pd.api.types.is_datetime64_dtype(self.df[col].dtype) and success_rate > 50:
-                        # Generate format string based on data
-                        format_detected = "Unknown"
-                        if not self.df[col].empty and not self.df[col].isna().all():
-                            sample_date = self.df[col].dropna().iloc[0]
-                            if isinstance(sample_date, pd.Timestamp):
-                                if sample_date.hour == 0 and sample_date.minute == 0 and sample_date.second == 0:
-                                    format_detected = "YYYY-MM-DD"
-                                else:
-                                    format_detected = "YYYY-MM-DD HH:MM:SS"
-                        
-                        # Extract date range
-                        min_date = None
-                        max_date = None
-                        if not self.df[col].isna().all():
-                            min_date = self.df[col].min().strftime("%Y-%m-%d") if pd.notna(self.df[col].min()) else None
-                            max_date = self.df[col].max().strftime("%Y-%m-%d") if pd.notna(self.df[col].max()) else None
-                        
-                        self.cleaning_operations.append({
-                            "operation": "convert_datetime",
-                            "column": col,
-                            "from_type": str(original_dtype),
-                            "to_type": "datetime64",
-                            "success_rate": f"{success_rate}%",
-                            "format_detected": format_detected,
-                            "date_range": f"{min_date} to {max_date}" if min_date and max_date else "unknown"
-                        })
-                        
-                        # Update detailed results with enhanced information
-                        self.detailed_results["date_conversions"].append({
-                            "column": col,
-                            "from_type": str(original_dtype),
-                            "to_type": "datetime64",
-                            "success_rate": success_rate,
-                            "values_converted": int(conversion_count),
-                            "format_detected": format_detected,
-                            "date_range": {
-                                "min": min_date,
-                                "max": max_date
-                            },
-                            "examples": date_examples,
-                            "na_before": int(original_values.isna().sum()),
-                            "na_after": int(self.df[col].isna().sum()),
-                            "time_components": not self.df[col].dropna().dt.time.eq(pd.Timestamp('00:00:00').time()).all() if not self.df[col].empty else False
-                        })
-                    else:
-                        # If conversion wasn't successful, revert
-                        self.df[col] = original_values
-                except Exception as e:
-                    logger.error(f"[{self.name}] Error converting column {col} to datetime: {str(e)}")
+            columns = self.df.columns.tolist()
+            for col, result in zip(columns, self._map_columns(self._normalize_dates_column, columns)):
+                if result is not None:
+                    dates, operation, details = result
+                    self._set_column(col, dates, "normalize_dates")
+                    self.conversion_failures[col] = round(1 - details["success_rate"] / 100, 4)
+                    self.date_formats[col] = {
+                        "formats": sorted(details["formats"], key=details["formats"].get, reverse=True),
+                        "dayfirst": details["dayfirst"],
+                    }
+                    self.cleaning_operations.append(operation)
+                    self.detailed_results["date_conversions"].append(details)
             
             logger.info(f"[{self.name}] normalize_dates completed.")
             return self.df
@@ -627,6 +750,161 @@ class DataCleanerAgent(BaseAgent):
             logger.error(f"[{self.name}] Error in normalize_dates: {str(e)}")
             return self.df
     
+    def _normalize_dates_column(self, col: str) -> Optional[tuple]:
+        """
+        Convert one potential date column to datetime without touching the working frame.
+        Args:
+            col (str): Column to convert.
+        Returns:
+            Optional[tuple]: (datetime series, cleaning operation, date_conversions entry),
+                or None if the column is kept.
+        """
+        # Only potential date columns: a date-like name or date-like values
+        date_keywords = ["date", "time", "day", "year", "month"]
+        if col in self.typed_columns or not (
+            any(keyword in col.lower() for keyword in date_keywords)
+            or (self.df[col].dtype == "object" and self._is_likely_date(self.df[col]))
+        ):
+            return None
+        if not self._may_convert(col, PARSE_DATETIME):
+            return None
+        original_dtype = self.df[col].dtype
+        original_values = self.df[col]
+        
+        try:
+            # Datetime parse (shared with detection)
+            analysis = self._analysis(col)
+            dates = analysis.datetime
+            
+            # Get conversion stats
+            conversion_count = pd.notna(dates).sum()
+            original_non_na_count = original_values.notna().sum()
+            success_rate = round(conversion_count / max(1, original_non_na_count) * 100, 2)
+            
+            # Collect sample conversions
+            changed_mask = pd.notna(dates) & (original_values != dates)
+            date_examples = []
+            
+            if changed_mask.any():
+                # Get up to 5 examples of date conversions
+                sample_indices = changed_mask[changed_mask].index[:5]
+                for idx in sample_indices:
+                    date_examples.append({
+                        "from": str(original_values[idx]),
+                        "to": str(dates[idx]),
+                        "index": int(idx)
+                    })
+            
+            # Keep the conversion only if it was successful
+            if not (pd.api.types.is_datetime64_dtype(dates.dtype) and success_rate > 50):
+                return None
+            # Formats the column was parsed with, described like detection does
+            format_detected = _describe_date_formats(analysis.date_formats, default="Unknown")
+            
+            # Extract date range
+            min_date = None
+            max_date = None
+            if not dates.isna().all():
+                min_date = dates.min().strftime("%Y-%m-%d") if pd.notna(dates.min()) else None
+                max_date = dates.max().strftime("%Y-%m-%d") if pd.notna(dates.max()) else None
+            
+            operation = {
+                "operation": "convert_datetime",
+                "column": col,
+                "from_type": str(original_dtype),
+                "to_type": "datetime64",
+                "success_rate": f"{success_rate}%",
+                "format_detected": format_detected,
+                "date_range": f"{min_date} to {max_date}" if min_date and max_date else "unknown"
+            }
+            
+            # Detailed results with enhanced information
+            details = {
+                "column": col,
+                "from_type": str(original_dtype),
+                "to_type": "datetime64",
+                "success_rate": success_rate,
+                "values_converted": int(conversion_count),
+                "format_detected": format_detected,
+                "date_range": {
+                    "min": min_date,
+                    "max": max_date
+                },
+                "examples": date_examples,
+                "formats": analysis.date_formats,
+                "dayfirst": bool(analysis.date_inference and analysis.date_inference.dayfirst),
+                "na_before": int(original_values.isna().sum()),
+                "na_after": int(dates.isna().sum()),
+                "time_components": not dates.dropna().dt.time.eq(pd.Timestamp('00:00:00').time()).all() if not dates.empty else False
+            }
+            return dates, operation, details
+        except Exception as e:
+            logger.error(f"[{self.name}] Error converting column {col} to datetime: {str(e)}")
+            return None
+
+    def _map_columns(self, func: Callable[[str], Any], columns: List[str]) -> Iterator[Any]:
+        """
+        Apply a per-column step to every column, on a thread pool when more than one
+        worker is configured. Results are yielded in column order either way, so the
+        caller applies them, and builds its reports, exactly as in sequential mode.
+        The step must only read the working frame.
+        """
+        workers = min(self.config.workers, len(columns))
+        if workers <= 1:
+            yield from map(func, columns)
+            return
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="cleaner") as pool:
+            yield from pool.map(func, columns)
+
+    def _analysis(self, column: str) -> ColumnAnalysis:
+        """Shared parse results for the current values of a column"""
+        return self.column_analysis.get(column, self.df[column])
+
+    def _may_convert(self, column: str, kind: str) -> bool:
+        """
+        False if a stratified sample shows, with the configured confidence, that the
+        column cannot reach the 50% conversion rate. Only large frames are sampled;
+        columns that pass are still converted in full, so reported rates are exact.
+        """
+        config = self.config
+        if config.sample_rows <= 0 or len(self.df) < config.sample_min_rows:
+            return True
+        passed = self._analysis(column).may_convert(kind, config.sample_rows, config.sample_confidence)
+        if not passed:
+            logger.debug(f"[{self.name}] Column {column} ruled out for {kind} conversion from a sample")
+        return passed
+
+    def _load(self, df: pd.DataFrame) -> None:
+        """
+        Start a cleaning run on `df` without copying it. The source frame is treated
+        as read-only: the working frame is a shallow copy whose columns are only ever
+        replaced (see _set_column), never written in place, and every replacement is
+        recorded in the change log.
+        """
+        self.original_df = df
+        self.df = df.copy(deep=False)
+        self.change_log = ColumnChangeLog(df)
+        self.column_analysis.invalidate()
+        self.row_hashes.invalidate()
+
+    def _set_column(self, column: str, values: pd.Series, step: str) -> None:
+        """Replace a column, log the replacement and drop its now stale analysis"""
+        self.change_log.record_column(column, self.df[column], step)
+        self.df[column] = values
+        self.column_analysis.invalidate(column)
+        self.row_hashes.invalidate(column)
+
+    def _drop_rows(self, mask: pd.Series, step: str) -> None:
+        """Drop the rows selected by a boolean mask, materializing the working frame"""
+        self.change_log.record_rows(self.df, int(mask.sum()), step)
+        self.df = self.df[~mask]
+        self.column_analysis.invalidate()
+        self.row_hashes.drop(~mask.to_numpy())
+
+    def _needs_inference(self, column: str) -> bool:
+        """Return True if a column is an untyped object column that should be type-inferred"""
+        return self.df[column].dtype == "object" and column not in self.typed_columns
+
     def _is_likely_date(self, series: pd.Series) -> bool:
         """Helper method to detect if a series likely contains dates"""
         # Sample the series to avoid processing the entire column
@@ -650,7 +928,9 @@ class DataCleanerAgent(BaseAgent):
     
     def handle_outliers(self) -> pd.DataFrame:
         """
-        Detect and handle outliers in numeric columns.
+        Detect and handle outliers in numeric columns. Quartiles of all columns come
+        from one DataFrame.quantile call (on a row sample for large frames, see
+        DataCleanerConfig) and outliers are found with broadcast masks.
         Returns:
             pd.DataFrame: DataFrame with outliers handled.
         """
@@ -660,103 +940,101 @@ class DataCleanerAgent(BaseAgent):
                 logger.warning(f"[{self.name}] Cannot handle outliers on empty DataFrame")
                 return self.df
             
-            numeric_cols = self.df.select_dtypes(include=['number']).columns
+            # Skip ID-like columns
+            numeric_cols = [
+                col for col in self.df.select_dtypes(include=['number']).columns
+                if not col.lower().endswith('id')
+            ]
+            if not numeric_cols:
+                logger.info(f"[{self.name}] handle_outliers completed.")
+                return self.df
+            
+            # Calculate IQR for every column at once
+            quartiles, approximate = self._quartiles(numeric_cols)
+            Q1 = quartiles.loc[0.25].to_numpy(dtype=float)
+            Q3 = quartiles.loc[0.75].to_numpy(dtype=float)
+            IQR = Q3 - Q1
+            
+            # Define outlier bounds
+            lower_bounds = Q1 - 1.5 * IQR
+            upper_bounds = Q3 + 1.5 * IQR
             
-            for col in numeric_cols:
-                # Skip ID-like columns
-                if col.lower().endswith('id'):
+            # Identify outliers: one (rows x columns) mask per side
+            values = self.df[numeric_cols].to_numpy(dtype=float, na_value=np.nan)
+            lower_mask = values < lower_bounds
+            upper_mask = values > upper_bounds
+            lower_counts = lower_mask.sum(axis=0)
+            upper_counts = upper_mask.sum(axis=0)
+            
+            for j, col in enumerate(numeric_cols):
+                lower_bound, upper_bound = lower_bounds[j], upper_bounds[j]
+                outlier_count = int(lower_counts[j] + upper_counts[j])
+                if pd.notna(lower_bound) and pd.notna(upper_bound):
+                    self.outlier_bounds[col] = (float(lower_bound), float(upper_bound))
+                    self.clipped_shares[col] = outlier_count / len(self.df)
+                if outlier_count == 0:
                     continue
-                    
-                # Calculate IQR
-                Q1 = self.df[col].quantile(0.25)
-                Q3 = self.df[col].quantile(0.75)
-                IQR = Q3 - Q1
                 
-                # Define outlier bounds
-                lower_bound = Q1 - 1.5 * IQR
-                upper_bound = Q3 + 1.5 * IQR
+                # Sample outliers (up to 3 per side) before fixing
+                lower_pos = np.flatnonzero(lower_mask[:, j])
+                upper_pos = np.flatnonzero(upper_mask[:, j])
+                lower_samples = [
+                    {"index": int(self.df.index[pos]), "value": float(values[pos, j]), "boundary": float(lower_bound)}
+                    for pos in lower_pos[:3]
+                ]
+                upper_samples = [
+                    {"index": int(self.df.index[pos]), "value": float(values[pos, j]), "boundary": float(upper_bound)}
+                    for pos in upper_pos[:3]
+                ]
                 
-                # Identify outliers
-                outliers = ((self.df[col] < lower_bound) | (self.df[col] > upper_bound))
-                outlier_count = outliers.sum()
+                # Apply capping on a copy of this column only (the source frame is never written to)
+                capped = self.df[col].copy()
+                capped[lower_mask[:, j]] = lower_bound
+                capped[upper_mask[:, j]] = upper_bound
+                self._set_column(col, capped, "handle_outliers")
                 
-                if outlier_count > 0:
-                    # Handle outliers by capping
-                    original_values = self.df[col].copy()
-                    
-                    # Collect samples of outlier values before fixing
-                    outlier_indices = outliers[outliers].index
-                    lower_outliers = outlier_indices[self.df.loc[outlier_indices, col] < lower_bound]
-                    upper_outliers = outlier_indices[self.df.loc[outlier_indices, col] > upper_bound]
-                    
-                    # Sample outliers
-                    lower_samples = []
-                    if len(lower_outliers) > 0:
-                        for idx in lower_outliers[:min(3, len(lower_outliers))]:
-                            lower_samples.append({
-                                "index": int(idx),
-                                "value": float(self.df.loc[idx, col]),
-                                "boundary": float(lower_bound)
-                            })
-                    
-                    upper_samples = []
-                    if len(upper_outliers) > 0:
-                        for idx in upper_outliers[:min(3, len(upper_outliers))]:
-                            upper_samples.append({
-                                "index": int(idx),
-                                "value": float(self.df.loc[idx, col]),
-                                "boundary": float(upper_bound)
-                            })
-                    
-                    # Apply capping
-                    self.df.loc[self.df[col] < lower_bound, col] = lower_bound
-                    self.df.loc[self.df[col] > upper_bound, col] = upper_bound
-                    
-                    # Calculate column stats
-                    column_mean = float(self.df[col].mean())
-                    column_median = float(self.df[col].median())
-                    column_std = float(self.df[col].std())
-                    
-                    # Calculate percentages
-                    lower_pct = len(lower_outliers) / outlier_count * 100 if outlier_count > 0 else 0
-                    upper_pct = len(upper_outliers) / outlier_count * 100 if outlier_count > 0 else 0
-                    total_pct = outlier_count / len(self.df) * 100
-                    
-                    self.cleaning_operations.append({
-                        "operation": "handle_outliers",
-                        "column": col,
-                        "outlier_count": int(outlier_count),
-                        "lower_outliers": len(lower_outliers),
-                        "upper_outliers": len(upper_outliers),
-                        "lower_bound": float(lower_bound),
-                        "upper_bound": float(upper_bound),
-                        "percentage_affected": round(total_pct, 2)
-                    })
-                    
-                    # Update detailed results with comprehensive information
-                    self.detailed_results["outliers_fixed"].append({
-                        "column": col,
-                        "total_outliers": int(outlier_count),
-                        "lower_outliers": len(lower_outliers),
-                        "upper_outliers": len(upper_outliers),
-                        "percentage_of_data": round(total_pct, 2),
-                        "bounds": {
-                            "lower": float(lower_bound),
-                            "upper": float(upper_bound),
-                            "q1": float(Q1),
-                            "q3": float(Q3),
-                            "iqr": float(IQR)
-                        },
-                        "statistics": {
-                            "mean": column_mean,
-                            "median": column_median,
-                            "std": column_std
-                        },
-                        "lower_samples": lower_samples,
-                        "upper_samples": upper_samples,
-                        "lower_bound": float(lower_bound),
-                        "upper_bound": float(upper_bound)
-                    })
+                # Calculate percentages
+                total_pct = outlier_count / len(self.df) * 100
+                
+                self.cleaning_operations.append({
+                    "operation": "handle_outliers",
+                    "column": col,
+                    "outlier_count": outlier_count,
+                    "lower_outliers": len(lower_pos),
+                    "upper_outliers": len(upper_pos),
+                    "lower_bound": float(lower_bound),
+                    "upper_bound": float(upper_bound),
+                    "percentage_affected": round(total_pct, 2)
+                })
+                
+                bounds = {
+                    "lower": float(lower_bound),
+                    "upper": float(upper_bound),
+                    "q1": float(Q1[j]),
+                    "q3": float(Q3[j]),
+                    "iqr": float(IQR[j])
+                }
+                if approximate:
+                    bounds["approximate"] = True
+                
+                # Update detailed results with comprehensive information
+                self.detailed_results["outliers_fixed"].append({
+                    "column": col,
+                    "total_outliers": outlier_count,
+                    "lower_outliers": len(lower_pos),
+                    "upper_outliers": len(upper_pos),
+                    "percentage_of_data": round(total_pct, 2),
+                    "bounds": bounds,
+                    "statistics": {
+                        "mean": float(capped.mean()),
+                        "median": float(capped.median()),
+                        "std": float(capped.std())
+                    },
+                    "lower_samples": lower_samples,
+                    "upper_samples": upper_samples,
+                    "lower_bound": float(lower_bound),
+                    "upper_bound": float(upper_bound)
+                })
             
             logger.info(f"[{self.name}] handle_outliers completed.")
             return self.df
@@ -764,7 +1042,25 @@ class DataCleanerAgent(BaseAgent):
         except Exception as e:
             logger.error(f"[{self.name}] Error in handle_outliers: {str(e)}")
             return self.df
-    
+
+    def _quartiles(self, columns: List[str]) -> tuple:
+        """
+        First and third quartiles of numeric columns in one DataFrame.quantile call.
+        Frames with at least outlier_sample_min_rows rows use a seeded row sample of
+        outlier_sample_rows rows instead.
+        Args:
+            columns (List[str]): Numeric columns.
+        Returns:
+            tuple: (DataFrame indexed by 0.25 and 0.75, whether the quartiles are approximate)
+        """
+        frame = self.df[columns]
+        config = self.config
+        approximate = 0 < config.outlier_sample_min_rows <= len(frame) and config.outlier_sample_rows < len(frame)
+        if approximate:
+            frame = frame.sample(n=config.outlier_sample_rows, random_state=0)
+            logger.info(f"[{self.name}] Outlier quartiles estimated from {len(frame)} sampled rows")
+        return frame.quantile([0.25, 0.75]), approximate
+
     def remove_duplicates(self) -> pd.DataFrame:
         """
         Remove duplicate rows from the DataFrame.
@@ -780,8 +1076,8 @@ class DataCleanerAgent(BaseAgent):
             # Look for duplicate rows and analyze them before removal
             original_count = len(self.df)
             
-            # Find duplicates
-            duplicate_mask = self.df.duplicated(keep='first')
+            # Find duplicates (only columns replaced since the last analysis are rehashed)
+            duplicate_mask = self.row_hashes.duplicated(self.df)
             duplicate_count = duplicate_mask.sum()
             
             # Analyze duplicates if present
@@ -813,8 +1109,9 @@ class DataCleanerAgent(BaseAgent):
                     "sample_rows": duplicate_samples
                 }
             
-            # Remove duplicates
-            self.df = self.df.drop_duplicates()
+            # Remove duplicates (the only step that materializes a new frame)
+            if duplicate_count > 0:
+                self._drop_rows(duplicate_mask, "remove_duplicates")
             new_count = len(self.df)
             
             duplicates_removed = original_count - new_count
@@ -868,6 +1165,237 @@ class DataCleanerAgent(BaseAgent):
             logger.error(f"[{self.name}] Error in clean: {str(e)}")
             return self.original_df  # Return original DataFrame if error
             
+    def learn_column_decisions(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Summarize the per-column decisions of the last cleaning run so they can be
+        replayed on new rows of the same dataset without re-running detection. They
+        also record what this run observed, which replay_plan checks for drift.
+        Returns:
+            Dict[str, Dict[str, Any]]: column -> {"dtype", "normalize_units", "date_formats",
+                "clip", "conversion_failure", "clipped_share"}
+        """
+        units_columns = {entry["column"] for entry in self.detailed_results.get("units_normalized", [])}
+        decisions = {}
+        for col in self.df.columns:
+            bounds = self.outlier_bounds.get(col)
+            decisions[col] = {
+                "dtype": str(self.df[col].dtype),
+                "normalize_units": col in units_columns,
+                "date_formats": self.date_formats.get(col),
+                "clip": list(bounds) if bounds else None,
+                "conversion_failure": self.conversion_failures.get(col),
+                "clipped_share": self.clipped_shares.get(col),
+            }
+        return decisions
+
+    def apply_column_decisions(self, decisions: Dict[str, Dict[str, Any]]) -> pd.DataFrame:
+        """
+        Clean the DataFrame by replaying decisions learned on an earlier run
+        (see learn_column_decisions), then drop duplicate rows. Columns whose values
+        do not fit their learned dtype keep their own dtype and are listed in plan_drift.
+        Args:
+            decisions (Dict[str, Dict[str, Any]]): Learned per-column decisions.
+        Returns:
+            pd.DataFrame: The cleaned DataFrame.
+        """
+        logger.info(f"[{self.name}] apply_column_decisions called for {len(decisions)} columns.")
+        self.plan_drift = []
+        if self.df is None or self.df.empty:
+            return self.df
+        columns = [col for col in decisions if col in self.df.columns]
+        replayed = self._map_columns(lambda col: self._replay_column(col, decisions[col]), columns)
+        for col, (series, _, _, lossy) in zip(columns, replayed):
+            if lossy:
+                self.plan_drift.append(f"{col}: values do not fit {decisions[col]['dtype']} ({series.dtype} kept)")
+            if series is not self.df[col]:
+                self._set_column(col, series, "apply_column_decisions")
+        rows_before = len(self.df)
+        duplicate_mask = self.row_hashes.duplicated(self.df)
+        if duplicate_mask.any():
+            self._drop_rows(duplicate_mask, "apply_column_decisions")
+        self.cleaning_operations.append({
+            "operation": "apply_column_decisions",
+            "columns": len(decisions),
+            "duplicates_removed": rows_before - len(self.df),
+        })
+        logger.info(f"[{self.name}] apply_column_decisions completed: {len(self.df)} rows.")
+        return self.df
+
+    def _replay_column(self, col: str, decision: Dict[str, Any]) -> tuple:
+        """
+        Replay one column's learned decision without touching the working frame.
+        Args:
+            col (str): Column to clean.
+            decision (Dict[str, Any]): Its entry from learn_column_decisions.
+        Returns:
+            tuple: (cleaned series, share of non-null values the conversion lost or None
+                if nothing was converted, (lower, upper) counts of clipped values or None,
+                whether the values do not fit the planned dtype and were left uncast)
+        """
+        series = self.df[col]
+        failure = None
+        lossy = False
+        if decision.get("normalize_units") and series.dtype == "object":
+            series = self._standardize_units(series)[0]
+        try:
+            target_dtype = pd.api.types.pandas_dtype(decision["dtype"])
+            converted = None
+            if pd.api.types.is_datetime64_any_dtype(target_dtype):
+                if not pd.api.types.is_datetime64_any_dtype(series):
+                    planned = decision.get("date_formats")
+                    if planned and planned["formats"]:
+                        # Parse with the formats detection found, no inference
+                        inferred = DateFormats(planned["formats"], planned["dayfirst"], 1.0)
+                        converted = parse_dates(series, inferred=inferred)[0]
+                    else:
+                        converted = pd.to_datetime(series, errors="coerce")
+            elif pd.api.types.is_numeric_dtype(target_dtype) and not pd.api.types.is_bool_dtype(target_dtype):
+                if not pd.api.types.is_numeric_dtype(series):
+                    converted = pd.to_numeric(series, errors="coerce")
+            if converted is not None:
+                non_null = int(series.notna().sum())
+                failure = (non_null - int(converted.notna().sum())) / non_null if non_null else 0.0
+                series = converted
+            if series.dtype != target_dtype:
+                cast = series.astype(target_dtype)
+                if (
+                    pd.api.types.is_numeric_dtype(series)
+                    and pd.api.types.is_numeric_dtype(target_dtype)
+                    and not pd.api.types.is_float_dtype(target_dtype)
+                ):
+                    # Integer and boolean casts truncate fractions and wrap out-of-range values
+                    valid = series.notna()
+                    lossy = not bool((cast[valid] == series[valid]).all())
+                if not lossy:
+                    series = cast
+        except (TypeError, ValueError) as e:
+            logger.warning(f"[{self.name}] Could not cast {col} to {decision['dtype']}: {e}")
+            lossy = True
+        bounds = decision.get("clip")
+        clipped = None
+        if bounds and pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            clipped = (int((series < bounds[0]).sum()), int((series > bounds[1]).sum()))
+            if any(clipped):
+                series = series.clip(bounds[0], bounds[1])
+        return series, failure, clipped, lossy
+
+    def replay_plan(
+        self, decisions: Dict[str, Dict[str, Any]], tolerance: float = PLAN_DRIFT_TOLERANCE
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Clean the DataFrame with a compiled plan (the decisions of an earlier full run
+        on the same schema, see learn_column_decisions) instead of running detection.
+        Every column is replayed and validated before anything is applied: a conversion
+        that loses, or clip bounds that cap, a larger share of values than the plan
+        observed (by more than `tolerance`) count as drift. On drift the working frame
+        is left untouched, the reasons are kept in plan_drift and None is returned so
+        the caller can run full detection.
+        Args:
+            decisions (Dict[str, Dict[str, Any]]): The plan's per-column decisions.
+            tolerance (float): Allowed increase of the failed/clipped shares.
+        Returns:
+            Optional[Dict[str, Any]]: The same result structure as _execute, or None on drift.
+        """
+        logger.info(f"[{self.name}] replay_plan called for {len(decisions)} columns.")
+        self.detailed_results = self._empty_detailed_results()
+        self.cleaning_operations = []
+        self.plan_drift = []
+        if self.df is None or self.df.empty:
+            self.plan_drift.append("no rows to validate the plan on")
+            return None
+        columns = self.df.columns.tolist()
+        if set(columns) != set(decisions):
+            self.plan_drift.append("columns differ from the plan")
+            return None
+
+        replayed = list(self._map_columns(lambda col: self._replay_column(col, decisions[col]), columns))
+        for col, (series, failure, clipped, lossy) in zip(columns, replayed):
+            decision = decisions[col]
+            if lossy:
+                self.plan_drift.append(f"{col}: values do not fit {decision['dtype']} ({series.dtype} kept)")
+            if failure is not None and failure > (decision.get("conversion_failure") or 0.0) + tolerance:
+                self.plan_drift.append(f"{col}: {failure:.1%} of values failed the conversion to {decision['dtype']}")
+            if clipped is not None:
+                clipped_share = sum(clipped) / len(self.df)
+                if clipped_share > (decision.get("clipped_share") or 0.0) + tolerance:
+                    self.plan_drift.append(f"{col}: {clipped_share:.1%} of rows fall outside the planned bounds")
+        if self.plan_drift:
+            logger.info(f"[{self.name}] Cleaning plan drifted: {'; '.join(self.plan_drift)}")
+            return None
+
+        for col, (series, failure, clipped, _) in zip(columns, replayed):
+            original = self.df[col]
+            if series is original:
+                continue
+            self._set_column(col, series, "replay_plan")
+            self._report_replayed_column(col, original, series, failure, clipped, decisions[col])
+
+        duplicate_mask = self.row_hashes.duplicated(self.df)
+        duplicate_count = int(duplicate_mask.sum())
+        if duplicate_count > 0:
+            self.detailed_results["duplicates_removed"] = duplicate_count
+            self.detailed_results["duplicate_details"].update({
+                "total_duplicates": duplicate_count,
+                "percentage_of_data": round((duplicate_count / len(self.df)) * 100, 1),
+                "sample_rows": self.df[duplicate_mask].iloc[0:1].to_dict('records')
+            })
+            self._drop_rows(duplicate_mask, "replay_plan")
+
+        self.cleaning_operations = self._report_operations()
+        stats = self._calculate_cleaning_stats()
+        logger.info(f"[{self.name}] replay_plan completed: {len(self.df)} rows.")
+        return {
+            "cleaned_data": self.df,
+            "operations": self.cleaning_operations,
+            "cleaning_stats": stats,
+            "detailed_results": self.detailed_results
+        }
+
+    def _report_replayed_column(
+        self,
+        col: str,
+        original: pd.Series,
+        series: pd.Series,
+        failure: Optional[float],
+        clipped: Optional[tuple],
+        decision: Dict[str, Any],
+    ) -> None:
+        """Add the detailed_results entries of a column cleaned by replay_plan"""
+        if failure is not None:
+            entry = {
+                "column": col,
+                "from_type": str(original.dtype),
+                "to_type": str(series.dtype),
+                "success_rate": round((1 - failure) * 100, 2),
+                "values_converted": int(series.notna().sum()),
+                "na_before": int(original.isna().sum()),
+                "na_after": int(series.isna().sum()),
+            }
+            if pd.api.types.is_datetime64_any_dtype(series):
+                formats = (decision.get("date_formats") or {}).get("formats")
+                entry["format_detected"] = _describe_date_formats(formats, default="auto-detected")
+                entry["date_range"] = {
+                    "min": series.min().strftime("%Y-%m-%d") if pd.notna(series.min()) else "",
+                    "max": series.max().strftime("%Y-%m-%d") if pd.notna(series.max()) else ""
+                }
+                self.detailed_results["date_conversions"].append(entry)
+            else:
+                entry["min_value"] = None if series.isna().all() else float(series.min())
+                entry["max_value"] = None if series.isna().all() else float(series.max())
+                self.detailed_results["numeric_conversions"].append(entry)
+        if clipped is not None and any(clipped):
+            lower_bound, upper_bound = decision["clip"]
+            self.detailed_results["outliers_fixed"].append({
+                "column": col,
+                "total_outliers": sum(clipped),
+                "lower_outliers": clipped[0],
+                "upper_outliers": clipped[1],
+                "percentage_of_data": round(sum(clipped) / len(series) * 100, 2),
+                "bounds": {"lower": lower_bound, "upper": upper_bound},
+                "lower_bound": lower_bound,
+                "upper_bound": upper_bound
+            })
+
     def _calculate_cleaning_stats(self) -> Dict[str, Any]:
         """Calculate statistics about the cleaning impact"""
         stats = {
@@ -921,28 +1449,23 @@ class DataCleanerAgent(BaseAgent):
                 list(stats["operation_details"]["normalize_units"]["unit_types"])
         
         # Calculate data changes
-        if not self.df.empty and not self.original_df.empty:
+        # Before-side figures come from the change log, not from a copy of the source
+        change_log = self.change_log
+        if not self.df.empty and change_log.rows_before and change_log.columns_before:
             # Calculate shape difference
-            stats["rows_before"] = len(self.original_df)
+            stats["rows_before"] = change_log.rows_before
             stats["rows_after"] = len(self.df)
-            stats["row_count_change"] = len(self.df) - len(self.original_df)
+            stats["row_count_change"] = len(self.df) - change_log.rows_before
             
             # Calculate missing values change
-            missing_before = self.original_df.isna().sum().sum()
+            missing_before = change_log.missing_before(self.df)
             missing_after = self.df.isna().sum().sum()
             stats["missing_values_before"] = int(missing_before)
             stats["missing_values_after"] = int(missing_after)
             stats["missing_values_change"] = int(missing_after - missing_before)
             
             # Calculate data type changes
-            dtype_changes = []
-            for col in self.df.columns:
-                if col in self.original_df.columns and self.df[col].dtype != self.original_df[col].dtype:
-                    dtype_changes.append({
-                        "column": col,
-                        "from_type": str(self.original_df[col].dtype),
-                        "to_type": str(self.df[col].dtype)
-                    })
+            dtype_changes = change_log.dtype_changes(self.df)
             
             if dtype_changes:
                 stats["dtype_changes"] = dtype_changes
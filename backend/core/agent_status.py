@@ -5,18 +5,79 @@ This module provides functionality to track the status of different agents in th
 including their current activity, progress, and any relevant messages.
 
 It uses a simple in-memory store that can be accessed and updated from different parts of the application.
+Every update or clear is also recorded as a change with a sequence number in a per-session ring
+buffer, so clients can ask for the changes since the last sequence number they saw (or wait for
+them, see wait_for_status_changes) instead of re-reading every status.
 """
 
-from typing import Dict, List, Optional
+import asyncio
+import itertools
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Set, Tuple
 from datetime import datetime
 import threading
 
-# Thread-safe lock for the agent status dictionary
+from config.constants import AGENT_STATUS_HISTORY
+
+# Sequence numbers start at the current time in microseconds, so they keep increasing across
+# restarts and a client resuming from a sequence number of the previous process gets a snapshot
+_seq = itertools.count(time.time_ns() // 1000)
+
+
+class _SessionStatuses:
+    """Agent statuses of one session, with its recent changes and waiting stream clients."""
+
+    def __init__(self):
+        self.agents: List[Dict] = []
+        self.changes: Deque[Dict] = deque(maxlen=AGENT_STATUS_HISTORY)
+        self.seq = 0  # sequence number of the latest change
+        self.dropped_seq = 0  # sequence number of the latest change evicted from `changes`
+        self.lock = threading.Lock()
+        self.waiters: Set[Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = set()
+
+    def record(self, change: Dict) -> None:
+        """Append a change (caller holds the lock) and wake waiting clients."""
+        if len(self.changes) == self.changes.maxlen:
+            self.dropped_seq = self.changes[0]['seq']
+        self.seq = next(_seq)
+        self.changes.append({'seq': self.seq, **change})
+        for loop, event in self.waiters:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                pass  # the client's event loop is closed
+
+    def since(self, seq: Optional[int]) -> Dict:
+        """Changes after `seq`, or a full snapshot if they are no longer all buffered."""
+        if seq is None or not self.dropped_seq <= seq <= self.seq:
+            return {'seq': self.seq, 'reset': True, 'agents': [dict(agent) for agent in self.agents]}
+        return {'seq': self.seq, 'reset': False, 'changes': [c for c in self.changes if c['seq'] > seq]}
+
+
+# Thread-safe lock for the session dictionary (each session has its own lock for its statuses)
 _lock = threading.Lock()
 
+# Read paths never create sessions (ids come from clients); waiting on an unknown one polls
+_UNKNOWN_SESSION_POLL_S = 1.0
+
 # In-memory store for agent statuses
-# Format: {session_id: [list of agent status dictionaries]}
-_agent_statuses: Dict[str, List[Dict]] = {}
+# Format: {session_id: _SessionStatuses}
+_sessions: Dict[str, _SessionStatuses] = {}
+
+def _unknown_session(since: Optional[int]) -> Dict:
+    """Changes of a session no agent has reported for: an empty snapshot, once."""
+    if since == 0:
+        return {'seq': 0, 'reset': False, 'changes': []}
+    return {'seq': 0, 'reset': True, 'agents': []}
+
+def _session(session_id: str) -> _SessionStatuses:
+    """The session's statuses, created on first use (only by writers, see update_agent_status)."""
+    with _lock:
+        state = _sessions.get(session_id)
+        if state is None:
+            state = _sessions[session_id] = _SessionStatuses()
+        return state
 
 def update_agent_status(session_id: str, agent_name: str, status: str, 
                        agent_type: str, message: str, additional_data: Dict = None):
@@ -31,12 +92,10 @@ def update_agent_status(session_id: str, agent_name: str, status: str,
         message (str): Status message or current activity description
         additional_data (Dict, optional): Any additional data to store with the agent status
     """
-    with _lock:
-        if session_id not in _agent_statuses:
-            _agent_statuses[session_id] = []
-        
+    state = _session(session_id)
+    with state.lock:
         # Check if the agent already exists in the status list
-        for agent in _agent_statuses[session_id]:
+        for agent in state.agents:
             if agent['name'] == agent_name:
                 # Update existing agent
                 agent['status'] = status
@@ -50,6 +109,7 @@ def update_agent_status(session_id: str, agent_name: str, status: str,
                 if additional_data:
                     for key, value in additional_data.items():
                         agent[key] = value
+                state.record({'op': 'update', 'agent': dict(agent)})
                 return
         
         # Agent doesn't exist, add it
@@ -67,7 +127,8 @@ def update_agent_status(session_id: str, agent_name: str, status: str,
             for key, value in additional_data.items():
                 new_agent[key] = value
             
-        _agent_statuses[session_id].append(new_agent)
+        state.agents.append(new_agent)
+        state.record({'op': 'update', 'agent': dict(new_agent)})
 
 def get_agent_statuses(session_id: str) -> List[Dict]:
     """
@@ -80,7 +141,73 @@ def get_agent_statuses(session_id: str) -> List[Dict]:
         List[Dict]: List of agent status dictionaries
     """
     with _lock:
-        return _agent_statuses.get(session_id, [])
+        state = _sessions.get(session_id)
+    if state is None:
+        return []
+    with state.lock:
+        return [dict(agent) for agent in state.agents]
+
+def get_status_changes(session_id: str, since: Optional[int] = None) -> Dict:
+    """
+    Get the status changes of a session since a sequence number.
+
+    Args:
+        session_id (str): The session identifier
+        since (int, optional): Sequence number of the last change the client has seen
+
+    Returns:
+        Dict: {"seq": latest sequence number, "reset": False, "changes": [{"seq", "op", "agent"}]},
+        where op is "update" (agent holds the agent's full status) or "clear"; or
+        {"seq", "reset": True, "agents": List[Dict]} when since is omitted or the changes
+        after it are no longer buffered
+    """
+    with _lock:
+        state = _sessions.get(session_id)
+    if state is None:
+        return _unknown_session(since)
+    with state.lock:
+        return state.since(since)
+
+async def wait_for_status_changes(session_id: str, since: Optional[int], timeout: float) -> Dict:
+    """
+    Like get_status_changes, but waits up to `timeout` seconds for a change when there is none yet.
+
+    Args:
+        session_id (str): The session identifier
+        since (int, optional): Sequence number of the last change the client has seen
+        timeout (float): Seconds to wait for a change
+
+    Returns:
+        Dict: See get_status_changes ("changes" is empty if the wait timed out)
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    with _lock:
+        state = _sessions.get(session_id)
+    while state is None:
+        result = _unknown_session(since)
+        remaining = deadline - loop.time()
+        if result['reset'] or remaining <= 0:
+            return result
+        # No statuses to wait on until an agent reports for the session: poll for them
+        await asyncio.sleep(min(remaining, _UNKNOWN_SESSION_POLL_S))
+        with _lock:
+            state = _sessions.get(session_id)
+    waiter = (loop, asyncio.Event())
+    with state.lock:
+        result = state.since(since)
+        if result['reset'] or result['changes']:
+            return result
+        state.waiters.add(waiter)
+    try:
+        await asyncio.wait_for(waiter[1].wait(), max(0.0, deadline - loop.time()))
+    except asyncio.TimeoutError:
+        pass
+    finally:
+        with state.lock:
+            state.waiters.discard(waiter)
+    with state.lock:
+        return state.since(since)
 
 def clear_agent_statuses(session_id: str):
     """
@@ -90,12 +217,47 @@ def clear_agent_statuses(session_id: str):
         session_id (str): The session identifier
     """
     with _lock:
-        if session_id in _agent_statuses:
-            _agent_statuses[session_id] = []
+        state = _sessions.get(session_id)
+    if state is None:
+        return
+    with state.lock:
+        state.agents = []
+        state.record({'op': 'clear'})
 
 def reset_all_statuses():
     """
     Reset all agent statuses across all sessions (mainly for testing).
     """
     with _lock:
-        _agent_statuses.clear()
+        _sessions.clear()
+
+def export_statuses() -> Dict[str, List[Dict]]:
+    """
+    Copy the agent statuses of every session (for session snapshots).
+    
+    Returns:
+        Dict[str, List[Dict]]: Agent status dictionaries by session identifier
+    """
+    with _lock:
+        states = list(_sessions.items())
+    statuses = {}
+    for session_id, state in states:
+        with state.lock:
+            statuses[session_id] = [dict(agent) for agent in state.agents]
+    return statuses
+
+def restore_statuses(statuses: Dict[str, List[Dict]]):
+    """
+    Restore agent statuses saved by export_statuses. Sessions that already have
+    statuses in this process keep them.
+    
+    Args:
+        statuses (Dict[str, List[Dict]]): Agent status dictionaries by session identifier
+    """
+    for session_id, agents in statuses.items():
+        if not agents:
+            continue
+        state = _session(session_id)
+        with state.lock:
+            if not state.agents:
+                state.agents = agents
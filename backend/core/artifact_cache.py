@@ -0,0 +1,242 @@
+"""
+ArtifactCache: on-disk cache of processed uploads keyed by a content hash of the
+uploaded bytes. Stores the cleaned frame, the cleaning report and the vector ids
+so that re-uploading an identical file skips cleaning and embedding.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from backend.core.logging import logger
+from config.constants import ARTIFACT_CACHE_PATH
+
+
+def file_sha256(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    """
+    Hash a file on disk in fixed-size chunks.
+
+    Args:
+        file_path (str): Path of the file to hash.
+        chunk_size (int): Bytes read per chunk.
+
+    Returns:
+        str: Hex SHA-256 digest of the file contents.
+    """
+    hasher = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def schema_fingerprint(df: pd.DataFrame) -> str:
+    """
+    Fingerprint a DataFrame schema (column names and dtypes, in order).
+
+    Args:
+        df (pd.DataFrame): The frame to fingerprint.
+
+    Returns:
+        str: Hex SHA-256 digest of the schema.
+    """
+    schema = [[str(col), str(dtype)] for col, dtype in df.dtypes.items()]
+    return hashlib.sha256(json.dumps(schema).encode("utf-8")).hexdigest()
+
+
+def _json_default(value: Any) -> Any:
+    """JSON encoder fallback for numpy scalars, timestamps and sets found in cleaning reports."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (pd.Timestamp, datetime)):
+        return value.isoformat()
+    if isinstance(value, set):
+        return list(value)
+    return str(value)
+
+
+class CachedDataset:
+    """A dataset restored from the artifact cache."""
+
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        cleaning_result: Dict[str, Any],
+        vector_ids: Optional[List[str]],
+        manifest: Dict[str, Any],
+        column_decisions: Optional[Dict[str, Dict[str, Any]]] = None,
+    ):
+        self.df = df
+        self.cleaning_result = cleaning_result
+        self.vector_ids = vector_ids
+        self.manifest = manifest
+        self.column_decisions = column_decisions
+
+
+class ArtifactCache:
+    """
+    Content-addressed store of cleaned upload artifacts.
+
+    Layout per entry: <root>/<content_hash>/{manifest.json, report.json,
+    decisions.json, vector_ids.json, cleaned.parquet | cleaned.pkl}.
+    """
+
+    def __init__(self, root: Optional[str] = None, enabled: bool = True):
+        self.root = Path(root or os.getenv("ARTIFACT_CACHE_DIR", str(ARTIFACT_CACHE_PATH)))
+        self.enabled = enabled
+        self._lock = threading.Lock()
+
+    def _entry_dir(self, content_hash: str) -> Path:
+        return self.root / content_hash
+
+    def get(self, content_hash: str) -> Optional[CachedDataset]:
+        """
+        Restore a processed upload by content hash.
+
+        Returns None on a miss, or if the stored frame no longer matches the
+        schema fingerprint recorded when it was cached.
+
+        Args:
+            content_hash (str): SHA-256 of the uploaded bytes.
+
+        Returns:
+            Optional[CachedDataset]: The restored dataset, or None.
+        """
+        if not self.enabled or not content_hash:
+            return None
+        entry = self._entry_dir(content_hash)
+        manifest_path = entry / "manifest.json"
+        if not manifest_path.exists():
+            return None
+        try:
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            frame_path = entry / manifest["frame_file"]
+            if manifest["frame_file"].endswith(".parquet"):
+                df = pd.read_parquet(frame_path)
+            else:
+                df = pd.read_pickle(frame_path)
+            if schema_fingerprint(df) != manifest["schema_fingerprint"]:
+                logger.warning(f"[ArtifactCache] Schema fingerprint mismatch for {content_hash}, ignoring entry")
+                return None
+            with open(entry / "report.json", "r", encoding="utf-8") as f:
+                cleaning_result = json.load(f)
+            vector_ids = None
+            ids_path = entry / "vector_ids.json"
+            if ids_path.exists():
+                with open(ids_path, "r", encoding="utf-8") as f:
+                    vector_ids = json.load(f)
+            column_decisions = None
+            decisions_path = entry / "decisions.json"
+            if decisions_path.exists():
+                with open(decisions_path, "r", encoding="utf-8") as f:
+                    column_decisions = json.load(f)
+        except Exception as e:
+            logger.error(f"[ArtifactCache] Failed to restore {content_hash}: {e}")
+            return None
+        logger.info(f"[ArtifactCache] Hit for {content_hash}: shape {df.shape}")
+        return CachedDataset(df, cleaning_result, vector_ids, manifest, column_decisions)
+
+    def put(
+        self,
+        content_hash: str,
+        df: pd.DataFrame,
+        cleaning_result: Dict[str, Any],
+        filename: str,
+        vector_ids: Optional[List[str]] = None,
+        column_decisions: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> None:
+        """
+        Store the artifacts of a processed upload.
+
+        Args:
+            content_hash (str): SHA-256 of the uploaded bytes.
+            df (pd.DataFrame): The cleaned frame.
+            cleaning_result (Dict[str, Any]): operations, cleaning_stats and detailed_results.
+            filename (str): Original upload filename.
+            vector_ids (List[str], optional): Ids upserted into the vector store.
+            column_decisions (Dict, optional): Cleaner decisions used for appends.
+        """
+        if not self.enabled or not content_hash:
+            return
+        entry = self._entry_dir(content_hash)
+        with self._lock:
+            try:
+                entry.mkdir(parents=True, exist_ok=True)
+                try:
+                    frame_file = "cleaned.parquet"
+                    df.to_parquet(entry / frame_file)
+                except Exception:
+                    # Mixed-type object columns cannot be written as Parquet
+                    frame_file = "cleaned.pkl"
+                    df.to_pickle(entry / frame_file)
+                with open(entry / "report.json", "w", encoding="utf-8") as f:
+                    json.dump(cleaning_result, f, default=_json_default)
+                if vector_ids is not None:
+                    with open(entry / "vector_ids.json", "w", encoding="utf-8") as f:
+                        json.dump(vector_ids, f)
+                if column_decisions is not None:
+                    with open(entry / "decisions.json", "w", encoding="utf-8") as f:
+                        json.dump(column_decisions, f, default=_json_default)
+                manifest = {
+                    "content_hash": content_hash,
+                    "filename": filename,
+                    "frame_file": frame_file,
+                    "schema_fingerprint": schema_fingerprint(df),
+                    "rows": len(df),
+                    "created_at": datetime.now().isoformat(),
+                }
+                # Manifest is written last so partially written entries are never read
+                with open(entry / "manifest.json", "w", encoding="utf-8") as f:
+                    json.dump(manifest, f)
+                logger.info(f"[ArtifactCache] Stored {content_hash} ({frame_file}, {len(df)} rows)")
+            except Exception as e:
+                logger.error(f"[ArtifactCache] Failed to store {content_hash}: {e}")
+                shutil.rmtree(entry, ignore_errors=True)
+
+    def forget_vectors(self, ids: Optional[Iterable[str]] = None) -> None:
+        """
+        Drop recorded vector ids so the entries are re-embedded on their next upload.
+
+        Args:
+            ids (Iterable[str], optional): Vectors deleted or overwritten in the vector
+                store; only entries recording one of them forget their ids. None forgets
+                every entry's ids (e.g. after the vector store is cleared).
+        """
+        if not self.root.exists():
+            return
+        gone = set(ids) if ids is not None else None
+        if gone is not None and not gone:
+            return
+        forgotten = 0
+        with self._lock:
+            for ids_path in self.root.glob("*/vector_ids.json"):
+                if gone is not None:
+                    try:
+                        with open(ids_path, "r", encoding="utf-8") as f:
+                            if gone.isdisjoint(json.load(f)):
+                                continue
+                    except (OSError, ValueError):
+                        pass  # unreadable ids cannot be trusted either
+                ids_path.unlink(missing_ok=True)
+                forgotten += 1
+        logger.info(f"[ArtifactCache] Forgot the recorded vector ids of {forgotten} entries.")
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+        with self._lock:
+            shutil.rmtree(self.root, ignore_errors=True)
+        logger.info("[ArtifactCache] Cleared.")
+
+
+artifact_cache = ArtifactCache(
+    enabled=os.getenv("ARTIFACT_CACHE_ENABLED", "true").lower() == "true"
+)
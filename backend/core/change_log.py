@@ -0,0 +1,98 @@
+"""
+ColumnChangeLog: the column replacements and row removals a cleaning run applied on
+top of a read-only source frame. Before/after statistics are derived from the log,
+so the cleaner never needs a private copy of the source.
+"""
+
+from typing import Dict, List
+
+import pandas as pd
+
+
+class ColumnChangeLog:
+    """
+    Change log of one cleaning run. Only metadata of the source frame is kept: its
+    row count, dtypes and, once a column is replaced or rows are removed, the NA
+    count the column had in the source.
+    """
+
+    def __init__(self, source: pd.DataFrame):
+        self.rows_before = len(source)
+        self.columns_before = list(source.columns)
+        self.dtypes_before = {col: dtype for col, dtype in source.dtypes.items()}
+        self.steps: Dict[str, List[str]] = {}  # column -> steps that replaced it, in order
+        self.row_steps: List[Dict[str, int]] = []  # {"step", "rows_removed"} in order
+        self._na_before: Dict[str, int] = {}
+
+    @property
+    def changed_columns(self) -> List[str]:
+        return list(self.steps)
+
+    @property
+    def rows_removed(self) -> int:
+        return sum(entry["rows_removed"] for entry in self.row_steps)
+
+    def record_column(self, column: str, before: pd.Series, step: str) -> None:
+        """
+        Record that `step` replaced a column.
+
+        Args:
+            column (str): The replaced column.
+            before (pd.Series): The column's values before the replacement.
+            step (str): Name of the cleaning step.
+        """
+        if column not in self._na_before:
+            # Untouched so far (rows were not removed yet, see record_rows): these are the source values
+            self._na_before[column] = int(before.isna().sum())
+        self.steps.setdefault(column, []).append(step)
+
+    def record_rows(self, frame_before: pd.DataFrame, rows_removed: int, step: str) -> None:
+        """
+        Record that `step` removed rows. NA counts of columns not yet recorded are
+        taken from `frame_before` first, since they still hold the source values.
+
+        Args:
+            frame_before (pd.DataFrame): The working frame before the removal.
+            rows_removed (int): Number of rows removed.
+            step (str): Name of the cleaning step.
+        """
+        for column in frame_before.columns:
+            if column not in self._na_before:
+                self._na_before[column] = int(frame_before[column].isna().sum())
+        self.row_steps.append({"step": step, "rows_removed": int(rows_removed)})
+
+    def missing_before(self, current: pd.DataFrame) -> int:
+        """
+        Total NA count of the source frame.
+
+        Args:
+            current (pd.DataFrame): The working frame; columns never recorded still hold source values.
+
+        Returns:
+            int: NA cells in the source.
+        """
+        return sum(
+            self._na_before[col] if col in self._na_before else int(current[col].isna().sum())
+            for col in self.columns_before
+            if col in self._na_before or col in current.columns
+        )
+
+    def dtype_changes(self, current: pd.DataFrame) -> List[Dict[str, str]]:
+        """
+        Columns whose dtype differs from the source, in the working frame's column order.
+
+        Args:
+            current (pd.DataFrame): The working frame.
+
+        Returns:
+            List[Dict[str, str]]: {"column", "from_type", "to_type"} per changed column.
+        """
+        return [
+            {
+                "column": col,
+                "from_type": str(self.dtypes_before[col]),
+                "to_type": str(current[col].dtype),
+            }
+            for col in current.columns
+            if col in self.dtypes_before and current[col].dtype != self.dtypes_before[col]
+        ]
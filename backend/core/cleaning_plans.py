@@ -0,0 +1,58 @@
+"""
+Compiled cleaning plans for recurring schemas. A full DataCleanerAgent run emits its
+per-column decisions (target dtype, unit normalization, date formats, clip bounds)
+together with the conversion-failure and clipped shares it observed. The plan is
+stored under the schema fingerprint of the raw frame (column names and dtypes), so
+a later upload with the same schema replays it instead of re-running detection;
+detection runs again only when the replay shows drift (see
+DataCleanerAgent.replay_plan).
+"""
+
+import hashlib
+import json
+import os
+from typing import Iterable, Optional
+
+import pandas as pd
+
+from backend.core.artifact_cache import schema_fingerprint
+from backend.core.report_store import ReportStore
+from config.constants import PLAN_CACHE_SIZE, PLAN_STORE_PATH
+
+
+def plan_fingerprint(df: pd.DataFrame, typed_columns: Optional[Iterable[str]] = None) -> str:
+    """
+    Key of a raw frame's cleaning plan: its schema fingerprint (column names and
+    dtypes, see artifact_cache.schema_fingerprint), combined with the columns whose
+    dtype came from the file schema, since the cleaner skips inference on those.
+
+    Args:
+        df (pd.DataFrame): The parsed, not yet cleaned, frame.
+        typed_columns (Iterable[str], optional): Columns typed by the file format.
+
+    Returns:
+        str: Hex SHA-256 digest.
+    """
+    fingerprint = schema_fingerprint(df)
+    typed = sorted(str(col) for col in typed_columns or [])
+    if not typed:
+        return fingerprint
+    return hashlib.sha256(json.dumps([fingerprint, typed]).encode("utf-8")).hexdigest()
+
+
+class CleaningPlanStore(ReportStore):
+    """
+    Compiled cleaning plans by schema fingerprint: {"fingerprint", "decisions"}.
+
+    Layout: <root>/<fingerprint>.json, kept like cleaning reports (in-memory LRU,
+    persisted so plans survive restarts).
+    """
+
+    kind = "cleaning plan"
+    key_name = "schema fingerprint"
+
+    def __init__(self, root: Optional[str] = None, capacity: int = PLAN_CACHE_SIZE):
+        super().__init__(root or os.getenv("PLAN_STORE_DIR", str(PLAN_STORE_PATH)), capacity)
+
+
+plan_store = CleaningPlanStore()
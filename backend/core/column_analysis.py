@@ -0,0 +1,226 @@
+"""
+ColumnAnalysis: per-column parse results shared by the detection (reporting) and
+transformation phases of DataCleanerAgent, so each column is parsed once per upload.
+On large frames a column can first be screened on a stratified sample, so columns
+that are clearly text are never parsed in full.
+"""
+
+import math
+import threading
+from statistics import NormalDist
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from backend.core.date_formats import DateFormats, parse_dates
+from config.constants import DATE_FORMAT_SAMPLE_ROWS
+
+PARSE_NUMERIC = "numeric"
+PARSE_DATETIME = "datetime"
+
+
+def stratified_sample(series: pd.Series, size: int, seed: int = 0) -> pd.Series:
+    """
+    Draw up to `size` non-null values, one from each of `size` equal blocks of rows,
+    so clustered data (e.g. text rows followed by numeric rows) is represented. The
+    first non-null value is always kept first: pd.to_datetime infers the format from
+    it when no explicit format can be inferred.
+
+    Args:
+        series (pd.Series): Column to sample.
+        size (int): Number of values to draw.
+        seed (int): Seed for the position inside each block.
+
+    Returns:
+        pd.Series: The sample, in row order.
+    """
+    values = series.dropna()
+    if len(values) <= size:
+        return values
+    edges = np.linspace(0, len(values), size + 1).astype(np.int64)
+    offsets = (np.random.default_rng(seed).random(size) * np.diff(edges)).astype(np.int64)
+    positions = edges[:-1] + offsets
+    positions[0] = 0
+    return values.iloc[positions]
+
+
+def wilson_upper_bound(successes: int, n: int, confidence: float) -> float:
+    """
+    One-sided Wilson score upper bound of a success proportion.
+
+    Args:
+        successes (int): Successes in the sample.
+        n (int): Sample size.
+        confidence (float): Confidence level, e.g. 0.999.
+
+    Returns:
+        float: Upper bound of the true proportion, between 0 and 1.
+    """
+    if n == 0:
+        return 1.0
+    z = NormalDist().inv_cdf(confidence)
+    p = successes / n
+    centre = p + z * z / (2 * n)
+    margin = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n))
+    return min(1.0, (centre + margin) / (1 + z * z / n))
+
+
+class ColumnAnalysis:
+    """
+    Parse results for one column. Each result is computed on first use; a parse
+    error is remembered and raised again to every caller.
+    """
+
+    def __init__(self, series: pd.Series):
+        self.series = series
+        self._na_mask: Optional[pd.Series] = None
+        self._numeric: Optional[pd.Series] = None
+        self._datetime: Optional[pd.Series] = None
+        self._datetime_error: Optional[Exception] = None
+        self._date_formats: Dict[str, int] = {}
+        self._date_inference: Optional[DateFormats] = None
+        self._screens: Dict[str, bool] = {}
+
+    @property
+    def na_mask(self) -> pd.Series:
+        if self._na_mask is None:
+            self._na_mask = self.series.isna()
+        return self._na_mask
+
+    @property
+    def na_count(self) -> int:
+        return int(self.na_mask.sum())
+
+    @property
+    def numeric(self) -> pd.Series:
+        """The column parsed with pd.to_numeric(errors="coerce")."""
+        if self._numeric is None:
+            self._numeric = pd.to_numeric(self.series, errors="coerce")
+        return self._numeric
+
+    @property
+    def numeric_na_count(self) -> int:
+        return int(self.numeric.isna().sum())
+
+    @property
+    def numeric_success_rate(self) -> float:
+        """Percentage of rows that parse as numbers."""
+        return _success_rate(len(self.series), self.numeric_na_count)
+
+    @property
+    def datetime(self) -> pd.Series:
+        """
+        The column parsed to datetime (NaT where unparseable), with explicit formats
+        inferred from a sample where possible (see date_formats.parse_dates).
+        """
+        if self._datetime_error is not None:
+            raise self._datetime_error
+        if self._datetime is None:
+            try:
+                sample = stratified_sample(self.series, DATE_FORMAT_SAMPLE_ROWS)
+                self._datetime, self._date_formats, self._date_inference = parse_dates(self.series, sample)
+            except Exception as e:
+                self._datetime_error = e
+                raise
+        return self._datetime
+
+    @property
+    def date_formats(self) -> Dict[str, int]:
+        """Rows parsed per explicit format; empty if pandas inferred the format."""
+        self.datetime  # parses on first use
+        return self._date_formats
+
+    @property
+    def date_inference(self) -> Optional[DateFormats]:
+        """Formats inferred from the sample, or None if pandas inferred the format."""
+        self.datetime  # parses on first use
+        return self._date_inference
+
+    @property
+    def datetime_na_count(self) -> int:
+        return int(self.datetime.isna().sum())
+
+    @property
+    def datetime_success_rate(self) -> float:
+        """Percentage of rows that parse as dates."""
+        return _success_rate(len(self.series), self.datetime_na_count)
+
+    def may_convert(
+        self, kind: str, sample_rows: int, confidence: float, threshold: float = 50.0
+    ) -> bool:
+        """
+        Screen the column on a stratified sample: False only if, at `confidence`,
+        at most `threshold` percent of its non-null values parse as `kind`. Columns
+        that pass must still be parsed in full for their actual success rate.
+
+        Args:
+            kind (str): PARSE_NUMERIC or PARSE_DATETIME.
+            sample_rows (int): Sample size.
+            confidence (float): Confidence required to rule the column out.
+            threshold (float): Success rate (percent of non-null values) the cleaner requires.
+
+        Returns:
+            bool: Whether the column may convert.
+        """
+        if kind in self._screens:
+            return self._screens[kind]
+        sample = stratified_sample(self.series, sample_rows)
+        try:
+            if kind == PARSE_NUMERIC:
+                parsed = pd.to_numeric(sample, errors="coerce")
+            else:
+                parsed = parse_dates(sample)[0]
+        except Exception:
+            # Let the full parse decide (and raise)
+            self._screens[kind] = True
+            return True
+        upper = wilson_upper_bound(int(parsed.notna().sum()), len(sample), confidence)
+        self._screens[kind] = upper * 100 > threshold
+        return self._screens[kind]
+
+
+def _success_rate(total: int, na_count: int) -> float:
+    return (total - na_count) / total * 100 if total else 0.0
+
+
+class ColumnAnalysisCache:
+    """
+    ColumnAnalysis entries by column name. Callers must invalidate a column
+    whenever they replace or modify it, and everything when rows change. Safe to
+    share between threads that analyse different columns.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, ColumnAnalysis] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, column: str, series: pd.Series) -> ColumnAnalysis:
+        """
+        Return the analysis of a column, creating it for `series` on a miss.
+
+        Args:
+            column (str): Column name.
+            series (pd.Series): Current values of the column.
+
+        Returns:
+            ColumnAnalysis: The shared analysis.
+        """
+        with self._lock:
+            analysis = self._entries.get(column)
+            if analysis is None:
+                self.misses += 1
+                analysis = self._entries[column] = ColumnAnalysis(series)
+            else:
+                self.hits += 1
+            return analysis
+
+    def invalidate(self, column: Optional[str] = None) -> None:
+        """Drop one column's analysis, or every analysis if no column is given."""
+        with self._lock:
+            if column is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(column, None)
@@ -0,0 +1,95 @@
+"""
+Memory compaction of cleaned frames: low-cardinality string columns become
+`category`; numeric columns keep their 64-bit dtypes. Runs after DataCleanerAgent,
+before a frame is kept in SessionMemory, and reports the bytes saved per column.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from backend.core.logging import logger
+from config.constants import COMPACT_CATEGORY_MAX_RATIO
+
+
+def _nbytes(series: pd.Series) -> int:
+    return int(series.memory_usage(index=False, deep=True))
+
+
+def compact_column(
+    series: pd.Series, category_max_ratio: float = COMPACT_CATEGORY_MAX_RATIO
+) -> Optional[pd.Series]:
+    """
+    Return a smaller, value-identical version of a column, or None if there is none.
+
+    Object columns holding only strings become `category` when their distinct count
+    is at most `category_max_ratio` of their non-null values. Numeric columns are
+    kept as they are: narrower integers overflow and float32 sums drift once agents
+    and DuckDB compute on them.
+
+    Args:
+        series (pd.Series): Column to compact.
+        category_max_ratio (float): Largest distinct/non-null ratio converted to category.
+
+    Returns:
+        Optional[pd.Series]: The compacted column, or None to keep it.
+    """
+    if series.dtype != object:
+        return None
+    non_null = int(series.notna().sum())
+    if non_null == 0 or pd.api.types.infer_dtype(series, skipna=True) != "string":
+        return None
+    if series.nunique() > non_null * category_max_ratio:
+        return None
+    compacted = series.astype("category")
+    if _nbytes(compacted) >= _nbytes(series):
+        return None
+    return compacted
+
+
+def compact_frame(
+    df: pd.DataFrame, category_max_ratio: float = COMPACT_CATEGORY_MAX_RATIO
+) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    Compact every column of a frame (see compact_column). The input is not modified.
+
+    Args:
+        df (pd.DataFrame): The cleaned frame.
+        category_max_ratio (float): Largest distinct/non-null ratio converted to category.
+
+    Returns:
+        Tuple[pd.DataFrame, Dict[str, Any]]: The compacted frame and a report with
+        bytes_before, bytes_after, bytes_saved and one entry per compacted column.
+    """
+    compacted = df.copy(deep=False)
+    columns: List[Dict[str, Any]] = []
+    bytes_before = bytes_after = 0
+    for col in df.columns:
+        series = df[col]
+        before = _nbytes(series)
+        after = before
+        smaller = compact_column(series, category_max_ratio)
+        if smaller is not None:
+            compacted[col] = smaller
+            after = _nbytes(smaller)
+            columns.append({
+                "column": col,
+                "from_type": str(series.dtype),
+                "to_type": str(smaller.dtype),
+                "bytes_before": before,
+                "bytes_after": after,
+                "bytes_saved": before - after,
+            })
+        bytes_before += before
+        bytes_after += after
+    report = {
+        "bytes_before": bytes_before,
+        "bytes_after": bytes_after,
+        "bytes_saved": bytes_before - bytes_after,
+        "columns": columns,
+    }
+    logger.info(
+        f"[compaction] Compacted {len(columns)}/{len(df.columns)} columns: "
+        f"{bytes_before} -> {bytes_after} bytes"
+    )
+    return compacted, report
@@ -0,0 +1,183 @@
+"""
+Date format inference for string columns. A sample of values is classified with
+regular expressions into explicit strptime formats (deciding day-first vs
+month-first from the values themselves), and the full column is parsed with the
+dominant format; only rows it does not match are retried with the other formats.
+Columns whose values cannot be classified fall back to pandas inference.
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Date part shapes: (regex, format) or (regex, (month-first format, day-first format))
+_DATE_SHAPES = [
+    (r"\d{4}-\d{1,2}-\d{1,2}", "%Y-%m-%d"),
+    (r"\d{4}/\d{1,2}/\d{1,2}", "%Y/%m/%d"),
+    (r"\d{1,2}/\d{1,2}/\d{4}", ("%m/%d/%Y", "%d/%m/%Y")),
+    (r"\d{1,2}-\d{1,2}-\d{4}", ("%m-%d-%Y", "%d-%m-%Y")),
+    (r"\d{1,2}\.\d{1,2}\.\d{4}", "%d.%m.%Y"),
+    (r"\d{1,2} [A-Za-z]{3} \d{4}", "%d %b %Y"),
+    (r"\d{1,2} [A-Za-z]{4,9} \d{4}", "%d %B %Y"),
+    (r"[A-Za-z]{3} \d{1,2}, \d{4}", "%b %d, %Y"),
+    (r"[A-Za-z]{4,9} \d{1,2}, \d{4}", "%B %d, %Y"),
+]
+# Optional time part shapes: (regex, format suffix)
+_TIME_SHAPES = [
+    ("", ""),
+    (r" \d{1,2}:\d{2}", " %H:%M"),
+    (r" \d{1,2}:\d{2}:\d{2}", " %H:%M:%S"),
+    (r" \d{1,2}:\d{2}:\d{2}\.\d{1,6}", " %H:%M:%S.%f"),
+    (r"T\d{1,2}:\d{2}", "T%H:%M"),
+    (r"T\d{1,2}:\d{2}:\d{2}", "T%H:%M:%S"),
+    (r"T\d{1,2}:\d{2}:\d{2}\.\d{1,6}", "T%H:%M:%S.%f"),
+]
+_SHAPES = [
+    (re.compile(f"{date_regex}{time_regex}"), date_format, time_format)
+    for date_regex, date_format in _DATE_SHAPES
+    for time_regex, time_format in _TIME_SHAPES
+]
+_LEADING_FIELDS = re.compile(r"^(\d{1,2})[/-](\d{1,2})[/-]")
+
+# Classified share of a sample needed before explicit formats are used
+MIN_CLASSIFIED = 0.5
+
+
+class DateFormats:
+    """
+    Result of inferring the formats of a date column.
+
+    Attributes:
+        formats (List[str]): Explicit formats, most frequent in the sample first.
+        dayfirst (bool): Whether ambiguous dd/mm vs mm/dd values read day-first.
+        classified (float): Share of the sample matching one of the formats.
+    """
+
+    def __init__(self, formats: List[str], dayfirst: bool, classified: float):
+        self.formats = formats
+        self.dayfirst = dayfirst
+        self.classified = classified
+
+    @property
+    def usable(self) -> bool:
+        return bool(self.formats) and self.classified >= MIN_CLASSIFIED
+
+
+def _classify(values: pd.Series) -> List[Tuple[object, str, int]]:
+    """(date format or candidate pair, time suffix, count) for every shape present in values."""
+    shapes = []
+    remaining = values
+    for pattern, date_format, time_format in _SHAPES:
+        if remaining.empty:
+            break
+        matched = remaining.str.fullmatch(pattern)
+        count = int(matched.sum())
+        if count:
+            shapes.append((date_format, time_format, count))
+            remaining = remaining[~matched]
+    return shapes
+
+
+def _infer_dayfirst(values: pd.Series) -> bool:
+    """Day-first if more values have a leading field above 12 than a second field above 12."""
+    fields = values.str.extract(_LEADING_FIELDS).dropna().astype(int)
+    if fields.empty:
+        return False
+    return int((fields[0] > 12).sum()) > int((fields[1] > 12).sum())
+
+
+def _expand(shapes: List[Tuple[object, str, int]], dayfirst: bool) -> List[str]:
+    """Explicit formats in order of count; ambiguous shapes give the preferred order first."""
+    formats: List[str] = []
+    for date_format, time_format, _ in sorted(shapes, key=lambda shape: -shape[2]):
+        if isinstance(date_format, tuple):
+            month_first, day_first = date_format
+            candidates = (day_first, month_first) if dayfirst else (month_first, day_first)
+        else:
+            candidates = (date_format,)
+        for candidate in candidates:
+            fmt = candidate + time_format
+            if fmt not in formats:
+                formats.append(fmt)
+    return formats
+
+
+def infer_date_formats(sample: pd.Series) -> DateFormats:
+    """
+    Classify sample values into explicit date formats.
+
+    Args:
+        sample (pd.Series): Non-null values of the column.
+
+    Returns:
+        DateFormats: The inferred formats.
+    """
+    values = sample.dropna()
+    if values.empty or not all(isinstance(value, str) for value in values):
+        return DateFormats([], False, 0.0)
+    values = values.str.strip()
+    shapes = _classify(values)
+    dayfirst = _infer_dayfirst(values)
+    classified = sum(count for _, _, count in shapes) / len(values)
+    return DateFormats(_expand(shapes, dayfirst), dayfirst, classified)
+
+
+def parse_dates(
+    series: pd.Series, sample: Optional[pd.Series] = None, inferred: Optional[DateFormats] = None
+) -> Tuple[pd.Series, Dict[str, int], Optional[DateFormats]]:
+    """
+    Parse a column to datetime. With usable formats inferred from `sample`, the
+    column is parsed with the dominant format and only unmatched rows are retried
+    with the other sampled formats, then with formats classified among the rows
+    still unmatched. Otherwise pd.to_datetime infers the format itself.
+
+    Args:
+        series (pd.Series): Column to parse.
+        sample (pd.Series, optional): Values to infer formats from (default: the column).
+        inferred (DateFormats, optional): Formats known in advance (e.g. from a
+            cleaning plan); skips the inference.
+
+    Returns:
+        Tuple[pd.Series, Dict[str, int], Optional[DateFormats]]: The parsed column
+        (NaT where unparseable), rows parsed per explicit format, and the inference
+        (None if pandas inference was used).
+    """
+    if series.dtype != object:
+        inferred = None
+    elif inferred is None:
+        inferred = infer_date_formats(series if sample is None else sample)
+    if inferred is None or not inferred.usable:
+        return pd.to_datetime(series, errors="coerce"), {}, None
+
+    stripped = series.str.strip()
+    parsed = pd.to_datetime(stripped, format=inferred.formats[0], errors="coerce")
+    values = parsed.to_numpy(copy=True)
+    counts = {inferred.formats[0]: int(parsed.notna().sum())}
+    pending = (stripped.notna() & parsed.isna()).to_numpy()
+    tried = set(counts)
+
+    def retry(fmt: str) -> None:
+        positions = np.flatnonzero(pending)
+        part = pd.to_datetime(stripped.iloc[positions], format=fmt, errors="coerce")
+        matched = part.notna().to_numpy()
+        if matched.any():
+            values[positions[matched]] = part.to_numpy()[matched]
+            pending[positions[matched]] = False
+            counts[fmt] = int(matched.sum())
+        tried.add(fmt)
+
+    for fmt in inferred.formats[1:]:
+        if not pending.any():
+            break
+        retry(fmt)
+    if pending.any():
+        # Formats the sample did not contain
+        for fmt in _expand(_classify(stripped[pending]), inferred.dayfirst):
+            if not pending.any():
+                break
+            if fmt not in tried:
+                retry(fmt)
+    parsed = pd.Series(values, index=series.index, name=series.name)
+    return parsed, {fmt: count for fmt, count in counts.items() if count}, inferred
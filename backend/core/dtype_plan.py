@@ -0,0 +1,247 @@
+"""
+DtypePlan: sample-driven column type planning for CSV parsing.
+
+A sample of rows is read as strings and every column is assigned a numeric,
+datetime (with an explicit format), category or string type. The full file is
+then parsed once with explicit dtype=/parse_dates=/date_format= arguments;
+columns whose plan turns out to be wrong fall back individually: the numeric
+columns a parse error blames are relaxed and the file is read again.
+"""
+
+import re
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from backend.core.logging import logger
+from config.constants import DTYPE_PLAN_SAMPLE_ROWS, CATEGORY_MAX_UNIQUE
+
+# Candidate date formats, tried in order; month-first before day-first to match pandas
+DATE_FORMATS = [
+    "%Y-%m-%d",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%d %H:%M",
+    "%Y/%m/%d",
+    "%m/%d/%Y",
+    "%d/%m/%Y",
+    "%m/%d/%Y %H:%M",
+    "%m/%d/%Y %H:%M:%S",
+    "%d-%m-%Y",
+    "%m-%d-%Y",
+    "%d.%m.%Y",
+    "%d %b %Y",
+    "%b %d, %Y",
+]
+
+_INT_PATTERN = re.compile(r"^[+-]?\d+$")
+_DIGIT_PATTERN = re.compile(r"\d")
+_BOOL_VALUES = {"true", "false"}
+# The C engine names a failing column only by position (or not at all)
+_COLUMN_POSITION_PATTERN = re.compile(r"in column (\d+)$")
+
+PLAN_INT = "int64"
+PLAN_FLOAT = "float64"
+PLAN_DATETIME = "datetime"
+PLAN_CATEGORY = "category"
+PLAN_STRING = "string"
+
+
+class DtypePlan:
+    """
+    Per-column parse plan. Columns absent from `types` are left to pandas inference.
+    `columns` is the file's column order, used to resolve errors that name a column
+    by position.
+    """
+
+    def __init__(
+        self,
+        types: Dict[str, str],
+        date_formats: Dict[str, str],
+        relaxed_numeric: Optional[List[str]] = None,
+        columns: Optional[List[str]] = None,
+    ):
+        self.types = types
+        self.date_formats = date_formats
+        # Planned-numeric columns read as strings after the plan failed (see relaxed())
+        self.relaxed_numeric = relaxed_numeric or []
+        self.columns = columns or list(types)
+
+    def columns_of(self, *kinds: str) -> List[str]:
+        return [col for col, kind in self.types.items() if kind in kinds]
+
+    def read_csv_kwargs(self, parse_dates: bool = True) -> Dict[str, Any]:
+        """
+        Arguments for pd.read_csv. Category columns are read as strings and cast
+        in finalize(), so chunks of one file share a single category set. Chunked
+        reads pass parse_dates=False: date columns are then read as strings and
+        parsed as a whole in finalize(), so a chunk whose values do not match the
+        format cannot leave a column mixing timestamps and strings.
+        """
+        dtype = {}
+        for col, kind in self.types.items():
+            if kind in (PLAN_INT, PLAN_FLOAT):
+                dtype[col] = kind
+            elif kind in (PLAN_STRING, PLAN_CATEGORY) or (kind == PLAN_DATETIME and not parse_dates):
+                dtype[col] = str
+        kwargs: Dict[str, Any] = {"dtype": dtype}
+        date_cols = self.columns_of(PLAN_DATETIME)
+        if date_cols and parse_dates:
+            kwargs["parse_dates"] = date_cols
+            kwargs["date_format"] = {col: self.date_formats[col] for col in date_cols}
+        return kwargs
+
+    def failed_columns(self, error: Exception) -> List[str]:
+        """
+        Planned numeric columns a pd.read_csv error blames. The pyarrow and python
+        engines name the column, the C engine gives its position or, for values
+        that are not numbers, only the value: then every column of the kind that
+        failed (int or float) is blamed, and every numeric column if the error
+        says nothing about the column.
+        """
+        numeric = self.columns_of(PLAN_INT, PLAN_FLOAT)
+        message = str(error)
+        named = [col for col in numeric if f"column '{col}'" in message or f"column {col} to type" in message]
+        if named:
+            return named
+        position = _COLUMN_POSITION_PATTERN.search(message)
+        if position and int(position.group(1)) < len(self.columns):
+            col = self.columns[int(position.group(1))]
+            if col in numeric:
+                return [col]
+        if "for int()" in message:
+            return self.columns_of(PLAN_INT) or numeric
+        if "to float" in message:
+            return self.columns_of(PLAN_FLOAT) or numeric
+        return numeric
+
+    def relaxed(self, error: Optional[Exception] = None) -> "DtypePlan":
+        """
+        A copy whose numeric columns blamed by `error` (all of them without an error)
+        are read as strings and converted one by one in finalize.
+        """
+        failed = self.failed_columns(error) if error is not None else self.columns_of(PLAN_INT, PLAN_FLOAT)
+        types = {col: (PLAN_STRING if col in failed else kind) for col, kind in self.types.items()}
+        return DtypePlan(types, dict(self.date_formats), self.relaxed_numeric + failed, self.columns)
+
+    def finalize(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Apply the post-read part of the plan: cast category columns, convert
+        relaxed numeric columns one by one (keeping strings where a column is not
+        fully numeric, as pandas inference would) and parse date columns still
+        held as strings with their planned format. A date column is converted only
+        if every value matches; otherwise it stays strings, as a whole-file read
+        leaves it, for the cleaner.
+
+        Args:
+            df (pd.DataFrame): Frame read with read_csv_kwargs() (all chunks of it).
+
+        Returns:
+            pd.DataFrame: The frame with planned dtypes.
+        """
+        for col in self.relaxed_numeric:
+            if col not in df.columns:
+                continue
+            try:
+                df[col] = pd.to_numeric(df[col])
+            except (ValueError, TypeError):
+                logger.info(f"[dtype_plan] Column {col} is not fully numeric; kept as strings.")
+        for col in self.columns_of(PLAN_CATEGORY):
+            if col in df.columns:
+                df[col] = df[col].astype("category")
+        for col in self.columns_of(PLAN_DATETIME):
+            if col not in df.columns or pd.api.types.is_datetime64_any_dtype(df[col]):
+                continue
+            parsed = pd.to_datetime(df[col], format=self.date_formats[col], errors="coerce")
+            if parsed.notna().sum() == df[col].notna().sum():
+                df[col] = parsed
+            else:
+                logger.info(
+                    f"[dtype_plan] Column {col} did not match {self.date_formats[col]}; left for the cleaner."
+                )
+        return df
+
+    def to_dict(self) -> Dict[str, str]:
+        return {
+            col: (f"datetime:{self.date_formats[col]}" if kind == PLAN_DATETIME else kind)
+            for col, kind in self.types.items()
+        }
+
+
+def _detect_date_format(values: pd.Series) -> Optional[str]:
+    for fmt in DATE_FORMATS:
+        parsed = pd.to_datetime(values, format=fmt, errors="coerce")
+        if parsed.notna().all():
+            return fmt
+    return None
+
+
+def plan_column(values: pd.Series, category_max_unique: int = CATEGORY_MAX_UNIQUE) -> Optional[tuple]:
+    """
+    Choose a parse type for one column from its non-null sample values (as strings).
+
+    Args:
+        values (pd.Series): Non-null sample values of the column.
+        category_max_unique (int): Largest distinct count planned as category.
+
+    Returns:
+        Optional[tuple]: (kind, date_format) or None to leave the column to pandas inference.
+    """
+    if values.empty:
+        return None
+    stripped = values.str.strip()
+    if stripped.str.lower().isin(_BOOL_VALUES).all():
+        return None
+    if pd.to_numeric(stripped, errors="coerce").notna().all():
+        return (PLAN_INT if stripped.str.match(_INT_PATTERN).all() else PLAN_FLOAT), None
+    if stripped.str.contains(_DIGIT_PATTERN).any():
+        date_format = _detect_date_format(stripped)
+        if date_format is not None:
+            return PLAN_DATETIME, date_format
+        # Digits mixed with text (units, currency, ids): keep as strings for the cleaner
+        return PLAN_STRING, None
+    n_unique = stripped.nunique()
+    if n_unique <= category_max_unique and n_unique <= len(stripped) // 2:
+        return PLAN_CATEGORY, None
+    return PLAN_STRING, None
+
+
+def plan_csv_dtypes(
+    file_path: str,
+    sample_rows: int = DTYPE_PLAN_SAMPLE_ROWS,
+    compression: Optional[str] = "infer",
+) -> Optional[DtypePlan]:
+    """
+    Sniff the first rows of a CSV and plan a type for every column.
+
+    Args:
+        file_path (str): Path to the CSV file (optionally stream-compressed).
+        sample_rows (int): Rows read for planning.
+        compression (str, optional): Compression passed to pd.read_csv.
+
+    Returns:
+        Optional[DtypePlan]: The plan, or None if the sample could not be read.
+    """
+    try:
+        sample = pd.read_csv(
+            file_path, nrows=sample_rows, dtype=str, compression=compression
+        )
+    except Exception as e:
+        logger.warning(f"[dtype_plan] Could not sample {file_path}: {e}")
+        return None
+    types, date_formats = {}, {}
+    # An int column with a null in the sample must be planned as float
+    has_nulls = sample.isna().any()
+    for col in sample.columns:
+        planned = plan_column(sample[col].dropna())
+        if planned is None:
+            continue
+        kind, date_format = planned
+        if kind == PLAN_INT and has_nulls[col]:
+            kind = PLAN_FLOAT
+        types[col] = kind
+        if date_format:
+            date_formats[col] = date_format
+    plan = DtypePlan(types, date_formats, columns=list(sample.columns))
+    logger.info(f"[dtype_plan] Planned {len(types)}/{len(sample.columns)} columns for {file_path}: {plan.to_dict()}")
+    return plan
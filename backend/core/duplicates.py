@@ -0,0 +1,125 @@
+"""
+RowHashes: duplicate-row analysis on one row-hash vector. Each column is hashed
+once (pd.util.hash_pandas_object) and the column hashes are combined into row
+hashes; when a cleaning step replaces a column only that column is hashed again,
+and removed rows are dropped from every cached vector instead of rehashing.
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+_SEED = np.uint64(0x345678)
+_MULTIPLIER = np.uint64(1000003)
+
+
+def column_hashes(series: pd.Series) -> np.ndarray:
+    """
+    Hash the values of a column, ignoring its index. Values that duplicated()
+    treats as equal get equal hashes.
+
+    Args:
+        series (pd.Series): The column.
+
+    Returns:
+        np.ndarray: uint64 hash per row.
+    """
+    if series.dtype == object:
+        # Hash the factorized codes: factorize compares objects as duplicated() does
+        # on several columns (1 == True, every missing value alike), while hashing
+        # mixed objects would go through their string forms
+        series = pd.Series(pd.factorize(series)[0])
+    elif series.dtype.kind == "f":
+        series = series + 0.0  # -0.0 and 0.0 are the same value for duplicated()
+    return pd.util.hash_pandas_object(series, index=False).to_numpy()
+
+
+class RowHashes:
+    """
+    Row hashes of a working frame, kept in step with it by the caller: invalidate a
+    column when it is replaced and call drop() when rows are removed.
+    """
+
+    def __init__(self):
+        self._columns: Dict[str, np.ndarray] = {}
+        self._rows: Optional[np.ndarray] = None
+
+    def column(self, df: pd.DataFrame, column: str) -> np.ndarray:
+        """Hashes of one column of `df`, computed on first use."""
+        hashes = self._columns.get(column)
+        if hashes is None:
+            hashes = self._columns[column] = column_hashes(df[column])
+        return hashes
+
+    def rows(self, df: pd.DataFrame) -> np.ndarray:
+        """One hash per row of `df`, combining its column hashes in column order."""
+        if self._rows is None:
+            with np.errstate(over="ignore"):
+                rows = np.full(len(df), _SEED, dtype=np.uint64)
+                for col in df.columns:
+                    rows ^= self.column(df, col)
+                    rows *= _MULTIPLIER
+            self._rows = rows
+        return self._rows
+
+    def duplicated(self, df: pd.DataFrame) -> pd.Series:
+        """
+        Same as df.duplicated(keep="first"). Rows whose hash repeats are compared
+        with the first row of that hash, so hash collisions never drop a row.
+
+        Args:
+            df (pd.DataFrame): The working frame.
+
+        Returns:
+            pd.Series: Boolean mask aligned to df.index.
+        """
+        if len(df.columns) == 1:
+            # pandas compares a single column with Series.duplicated, which (unlike
+            # the multi-column path) tells None, NaN and NaT apart
+            return df.duplicated(keep="first")
+        rows = self.rows(df)
+        codes, _ = pd.factorize(rows)
+        first_of_code = np.unique(codes, return_index=True)[1]
+        duplicate_pos = np.flatnonzero(first_of_code[codes] != np.arange(len(codes)))
+        if len(duplicate_pos):
+            first_pos = first_of_code[codes[duplicate_pos]]
+            for col in df.columns:
+                values = df[col]
+                later = values.iloc[duplicate_pos].reset_index(drop=True)
+                first = values.iloc[first_pos].reset_index(drop=True)
+                try:
+                    # Compared as Series so pd.NA in nullable columns gives NA, not a TypeError
+                    same = later.eq(first).fillna(False).to_numpy(dtype=bool) | (
+                        later.isna().to_numpy() & first.isna().to_numpy()
+                    )
+                except TypeError:
+                    return df.duplicated(keep="first")
+                if not np.all(same):
+                    # A hash collision: fall back to the exact comparison
+                    return df.duplicated(keep="first")
+        mask = np.zeros(len(df), dtype=bool)
+        mask[duplicate_pos] = True
+        return pd.Series(mask, index=df.index)
+
+    def has_repeats(self, df: pd.DataFrame, column: str) -> bool:
+        """
+        False if no non-null value of the column occurs twice. A True may still be
+        a hash collision; callers confirm with the actual values.
+        """
+        hashes = self.column(df, column)[df[column].notna().to_numpy()]
+        return len(pd.unique(hashes)) < len(hashes)
+
+    def drop(self, keep: np.ndarray) -> None:
+        """Keep only the rows selected by a boolean array in every cached vector."""
+        self._columns = {col: hashes[keep] for col, hashes in self._columns.items()}
+        if self._rows is not None:
+            self._rows = self._rows[keep]
+
+    def invalidate(self, column: Optional[str] = None) -> None:
+        """Drop one column's hashes (and the row hashes), or everything."""
+        if column is None:
+            self._columns.clear()
+        else:
+            self._columns.pop(column, None)
+        self._rows = None
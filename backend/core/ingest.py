@@ -0,0 +1,583 @@
+"""
+Tabular ingest pipeline: parse an uploaded file in chunks, clean it, store it in
+session memory and embed its rows into the vector store chunk by chunk.
+Uploads whose bytes were processed before are restored from the artifact cache.
+"""
+
+import os
+import threading
+import traceback
+import uuid
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backend.agents.data_cleaner_agent import DataCleanerAgent
+from backend.core.agent_status import update_agent_status
+from backend.core.artifact_cache import artifact_cache, file_sha256
+from backend.core.cleaning_plans import plan_fingerprint, plan_store
+from backend.core.compaction import compact_frame
+from backend.core.loader import (
+    DECOMPRESSION_ERRORS,
+    PLAN_UNRELATED_ERRORS,
+    TYPED_TABULAR_EXTENSIONS,
+    dataframe_to_texts,
+    load_tabular,
+    plan_tabular,
+    read_csv_planned,
+)
+from backend.core.logging import logger
+from backend.core.report_store import report_store
+from backend.core.session_memory import dataset_store
+from config.constants import CSV_CHUNK_ROWS
+
+
+# Called as progress(stage, counters) after each unit of work
+ProgressCallback = Callable[[str, Dict[str, int]], None]
+
+
+class IngestError(ValueError):
+    """Raised when an uploaded file cannot be turned into a usable dataset."""
+
+
+class IngestCancelled(Exception):
+    """Raised inside the pipeline when its cancel event has been set."""
+
+
+class IngestProgress:
+    """Thread-safe per-stage counters for one ingest run."""
+
+    def __init__(self, callback: Optional[ProgressCallback] = None):
+        self.callback = callback
+        self.counters = {
+            "rows_parsed": 0,
+            "rows_cleaned": 0,
+            "vectors_embedded": 0,
+            "vectors_upserted": 0,
+        }
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, counter: str, n: int) -> None:
+        with self._lock:
+            self.counters[counter] += n
+            snapshot = dict(self.counters)
+        if self.callback:
+            self.callback(stage, snapshot)
+
+    def stage(self, stage: str) -> None:
+        if self.callback:
+            with self._lock:
+                snapshot = dict(self.counters)
+            self.callback(stage, snapshot)
+
+
+def check_cancelled(cancel_event: Optional[threading.Event]) -> None:
+    """Raise IngestCancelled if the run was asked to stop."""
+    if cancel_event is not None and cancel_event.is_set():
+        raise IngestCancelled()
+
+
+def parse_tabular(
+    file_path: str,
+    chunk_rows: int = CSV_CHUNK_ROWS,
+    progress: Optional[IngestProgress] = None,
+    cancel_event: Optional[threading.Event] = None,
+) -> pd.DataFrame:
+    """
+    Parse a tabular file and assemble the session frame.
+
+    CSV (optionally gzip/bz2/zstd compressed) goes through the chunked reader with
+    a dtype plan sniffed from its first rows; Parquet/Feather/Arrow IPC files are
+    memory-mapped and keep their stored dtypes.
+
+    Args:
+        file_path (str): Path of the spooled upload.
+        chunk_rows (int): Rows parsed per chunk.
+        progress (IngestProgress, optional): Receives rows_parsed updates.
+        cancel_event (threading.Event, optional): Checked between chunks.
+
+    Returns:
+        pd.DataFrame: The parsed dataset.
+
+    Raises:
+        IngestError: If the file cannot be parsed or has no data rows.
+        IngestCancelled: If cancel_event is set while parsing.
+    """
+    if is_typed_tabular(file_path):
+        try:
+            df = load_tabular(file_path)
+        except ImportError:
+            raise
+        except Exception as e:
+            logger.error(f"[ingest] Failed to read {file_path}: {e}")
+            raise IngestError("Could not read the uploaded columnar file. Please check the file format.")
+        if df.empty:
+            raise IngestError("Uploaded file contains no data rows.")
+        if progress:
+            progress.add("parse", "rows_parsed", len(df))
+        logger.info(f"[ingest] Loaded typed dataset with shape {df.shape}")
+        return df
+    rows_before = progress.counters["rows_parsed"] if progress else 0
+
+    def on_chunk(chunk: pd.DataFrame) -> None:
+        check_cancelled(cancel_event)
+        if progress:
+            progress.add("parse", "rows_parsed", len(chunk))
+
+    def on_retry() -> None:
+        # The file is read again with a relaxed plan: rewind the parse counter
+        if progress:
+            progress.add("parse", "rows_parsed", rows_before - progress.counters["rows_parsed"])
+
+    try:
+        df = read_csv_planned(
+            file_path, plan_tabular(file_path), chunk_rows=chunk_rows, on_chunk=on_chunk, on_retry=on_retry
+        )
+    except ImportError as e:
+        raise IngestError(str(e))
+    except PLAN_UNRELATED_ERRORS as e:
+        logger.error(f"[ingest] Failed to parse {file_path}: {e}")
+        raise IngestError(
+            "No valid rows found in CSV. Please check the file format and try again."
+        )
+    except DECOMPRESSION_ERRORS as e:
+        # Corrupt or truncated gzip/bz2/zstd stream
+        logger.error(f"[ingest] Failed to decompress {file_path}: {e}")
+        raise IngestError("Could not decompress the uploaded file. Please check that it is not corrupt.")
+    if df.empty:
+        raise IngestError("Uploaded CSV contains no data rows.")
+    logger.info(f"[ingest] Parsed CSV into shape {df.shape}")
+    return df
+
+
+def is_typed_tabular(file_path: str) -> bool:
+    """Return True if the file format stores its own column types (Parquet/Feather/Arrow)."""
+    return os.path.splitext(file_path)[1].lower() in TYPED_TABULAR_EXTENSIONS
+
+
+def clean_dataset(
+    df: pd.DataFrame,
+    session_id: str = "default",
+    typed_columns: Optional[Iterable[str]] = None,
+    progress: Optional[IngestProgress] = None,
+) -> Dict[str, Any]:
+    """
+    Run the DataCleanerAgent, compact the cleaned frame (see compact_frame) and
+    publish the report through the agent status.
+
+    Frames whose schema fingerprint has a compiled cleaning plan replay it instead
+    of running detection; full detection runs (and recompiles the plan) for new
+    schemas and when the replay reports drift.
+
+    Args:
+        df (pd.DataFrame): The parsed dataset.
+        session_id (str): Session whose agent status receives the cleaning report.
+        typed_columns (Iterable[str], optional): Columns whose dtype came from the
+            file schema; the cleaner skips string-to-numeric/date inference on them.
+        progress (IngestProgress, optional): Receives the rows_cleaned count.
+
+    Returns:
+        Dict[str, Any]: The cleaner result (cleaned_data, operations, cleaning_stats,
+        detailed_results) plus cleaning_result and the column_decisions it applied.
+    """
+    fingerprint = plan_fingerprint(df, typed_columns)
+    plan = plan_store.get(fingerprint)
+    cleaner = DataCleanerAgent(df, typed_columns=typed_columns)
+    result = cleaner.replay_plan(plan["decisions"]) if plan else None
+    replayed = result is not None
+    if replayed:
+        column_decisions = plan["decisions"]
+    else:
+        result = cleaner._execute("", df)  # Use _execute to get the full result dict
+        column_decisions = cleaner.learn_column_decisions()
+        plan_store.put(fingerprint, {"fingerprint": fingerprint, "decisions": column_decisions})
+    # Shrink the frame before it is kept in session memory
+    result["cleaned_data"], compaction = compact_frame(result["cleaned_data"])
+    cleaning_result = {
+        "operations": result["operations"],
+        "cleaning_stats": result["cleaning_stats"],
+        "detailed_results": result.get("detailed_results", {}),
+        "memory_compaction": compaction,
+        "cleaning_plan": {"fingerprint": fingerprint, "replayed": replayed, "drift": cleaner.plan_drift},
+    }
+    logger.info(f"[ingest] Real cleaning operations: {result['operations']}")
+    logger.info(f"[ingest] Cleaning stats: {result['cleaning_stats']}")
+    publish_cleaning_result(session_id, cleaning_result)
+    if progress:
+        progress.add("clean", "rows_cleaned", len(result["cleaned_data"]))
+    result["cleaning_result"] = cleaning_result
+    result["column_decisions"] = column_decisions
+    return result
+
+
+def publish_cleaning_result(
+    session_id: str, cleaning_result: Dict[str, Any], message: str = "Data cleaning completed successfully"
+) -> None:
+    """Publish a cleaning report through the "Data Cleaner" agent status."""
+    update_agent_status(
+        session_id=session_id,
+        agent_name="Data Cleaner",
+        status="complete",
+        agent_type="cleaner",
+        message=message,
+        additional_data={"cleaningResult": cleaning_result},
+    )
+
+
+def row_vector_ids(df: pd.DataFrame, filename: str) -> pd.Series:
+    """Positional vector ids ({filename}_{index}) used for a full upload."""
+    return pd.Series([f"{filename}_{idx}" for idx in df.index], index=df.index, dtype=object)
+
+
+def row_hashes(df: pd.DataFrame) -> pd.Series:
+    """Content hash of every row, independent of the index and of numeric widths."""
+    narrow = [
+        col for col in df.columns
+        if df[col].dtype != np.bool_
+        and pd.api.types.is_numeric_dtype(df[col].dtype)
+        and not pd.api.types.is_extension_array_dtype(df[col].dtype)
+        and df[col].dtype.itemsize < 8
+    ]
+    if narrow:
+        # Narrow (e.g. typed-file) columns hash like their 64-bit equivalents (categories hash like strings)
+        df = df.astype({col: (np.float64 if df[col].dtype.kind == "f" else np.int64) for col in narrow})
+    return pd.util.hash_pandas_object(df, index=False)
+
+
+def embed_dataset(
+    df: pd.DataFrame,
+    filename: str,
+    chunk_rows: int = CSV_CHUNK_ROWS,
+    progress: Optional[IngestProgress] = None,
+    cancel_event: Optional[threading.Event] = None,
+    vector_ids: Optional[pd.Series] = None,
+) -> Tuple[List[str], Optional[str]]:
+    """
+    Serialize and upsert dataset rows into the vector store one chunk at a time.
+
+    Args:
+        df (pd.DataFrame): The cleaned dataset.
+        filename (str): Upload filename, used as the vector id prefix.
+        chunk_rows (int): Rows serialized and upserted per chunk.
+        progress (IngestProgress, optional): Receives vectors_embedded/vectors_upserted updates.
+        cancel_event (threading.Event, optional): Checked between chunks.
+        vector_ids (pd.Series, optional): Id of each row; defaults to row_vector_ids.
+
+    Returns:
+        Tuple[List[str], Optional[str]]: The vector ids that were upserted, and a
+        user-facing warning if any chunk failed to index (else None).
+
+    Raises:
+        IngestCancelled: If cancel_event is set between chunks; the vectors upserted
+            so far are deleted first.
+    """
+    from backend.core.llm_rag import upsert_documents_batch
+
+    def on_batch(kind: str, n: int) -> None:
+        if progress:
+            progress.add("embed", f"vectors_{kind}", n)
+
+    if vector_ids is None:
+        vector_ids = row_vector_ids(df, filename)
+    failed_chunks = 0
+    upserted_ids: List[str] = []
+    for start in range(0, len(df), chunk_rows):
+        if upserted_ids and cancel_event is not None and cancel_event.is_set():
+            # A cancelled run must not leave its rows searchable
+            try:
+                delete_vectors(upserted_ids)
+            except Exception as e:
+                logger.error(f"[ingest] Failed to delete {len(upserted_ids)} vectors of a cancelled run: {e}")
+        check_cancelled(cancel_event)
+        chunk = df.iloc[start : start + chunk_rows]
+        ids = vector_ids.iloc[start : start + chunk_rows].tolist()
+        texts = dataframe_to_texts(chunk)
+        try:
+            upsert_documents_batch(
+                ids, texts, batch_size=100, max_workers=16, progress_callback=on_batch
+            )
+            upserted_ids.extend(ids)
+        except Exception as upsert_exc:
+            failed_chunks += 1
+            logger.error(f"[ingest] Error upserting rows {start}-{start + len(chunk) - 1}: {upsert_exc}")
+            logger.error(traceback.format_exc())
+    if failed_chunks:
+        return upserted_ids, (
+            "Some or all rows failed to index due to system or API limits. "
+            "Try a smaller file or contact support if this persists."
+        )
+    logger.info("[ingest] All rows batch upserted.")
+    return upserted_ids, None
+
+
+def ingest_tabular_file(
+    file_path: str,
+    filename: str,
+    session_id: str = "default",
+    chunk_rows: int = CSV_CHUNK_ROWS,
+    on_progress: Optional[ProgressCallback] = None,
+    cancel_event: Optional[threading.Event] = None,
+    content_hash: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Run the full tabular ingest pipeline for a spooled upload.
+
+    If the same bytes were ingested before, the cleaned frame, cleaning report and
+    vector ids are restored from the artifact cache and cleaning/embedding are skipped.
+    The cleaning report is recorded in the report store under the dataset version
+    (the content hash, or a random id when hashing is disabled).
+
+    Args:
+        file_path (str): Path of the spooled upload.
+        filename (str): Original upload filename.
+        session_id (str): Session that receives the dataset and agent status updates.
+        chunk_rows (int): Rows parsed and embedded per chunk.
+        on_progress (ProgressCallback, optional): Called with (stage, counters) as work completes.
+        cancel_event (threading.Event, optional): Stops the run between chunks and stages.
+        content_hash (str, optional): SHA-256 of the upload, if computed while spooling;
+            otherwise the file is hashed here.
+
+    Returns:
+        Dict[str, Any]: rows_indexed, preview, content_hash, dataset_version, snapshot_id
+        (version id of the stored frame), cached and an optional warning.
+
+    Raises:
+        IngestError: If the file cannot be parsed or has no data rows.
+        IngestCancelled: If cancel_event is set before the run finishes.
+    """
+    progress = IngestProgress(on_progress)
+    if artifact_cache.enabled and content_hash is None:
+        content_hash = file_sha256(file_path)
+    cached = artifact_cache.get(content_hash) if content_hash else None
+    if cached is not None:
+        df = cached.df
+        progress.stage("restore")
+        progress.add("restore", "rows_parsed", len(df))
+        progress.add("restore", "rows_cleaned", len(df))
+        column_decisions = cached.column_decisions
+        cleaning_result = cached.cleaning_result
+        publish_cleaning_result(
+            session_id, cached.cleaning_result, message="Data cleaning restored from cache"
+        )
+        logger.info(f"[ingest] Restored {filename} from artifact cache ({content_hash})")
+    else:
+        progress.stage("parse")
+        df = parse_tabular(file_path, chunk_rows=chunk_rows, progress=progress, cancel_event=cancel_event)
+        check_cancelled(cancel_event)
+        progress.stage("clean")
+        typed_columns = list(df.columns) if is_typed_tabular(file_path) else None
+        result = clean_dataset(df, session_id=session_id, typed_columns=typed_columns, progress=progress)
+        df = result["cleaned_data"]
+        column_decisions = result["column_decisions"]
+        cleaning_result = result["cleaning_result"]
+        logger.info(f"[ingest] DataFrame shape after clean: {df.shape}")
+    check_cancelled(cancel_event)
+    if cached is not None and cached.vector_ids is not None and len(cached.vector_ids) == len(df):
+        vector_ids = pd.Series(cached.vector_ids, index=df.index, dtype=object)
+    else:
+        vector_ids = row_vector_ids(df, filename)
+    upsert_warning = None
+    if cached is not None and cached.vector_ids is not None:
+        progress.add("restore", "vectors_upserted", len(cached.vector_ids))
+        logger.info(f"[ingest] Skipping embedding, {len(cached.vector_ids)} vectors already indexed")
+    else:
+        progress.stage("embed")
+        upserted_ids, upsert_warning = embed_dataset(
+            df,
+            filename,
+            chunk_rows=chunk_rows,
+            progress=progress,
+            cancel_event=cancel_event,
+            vector_ids=vector_ids,
+        )
+        if content_hash:
+            # Only a fully indexed upload records its vector ids; a partial one re-embeds next time
+            artifact_cache.put(
+                content_hash,
+                df,
+                cleaning_result,
+                filename,
+                vector_ids=None if upsert_warning else upserted_ids,
+                column_decisions=column_decisions,
+            )
+    # Installed only once embedding finished, so a cancelled run leaves the session as it was
+    dataset_version = content_hash or uuid.uuid4().hex
+    report_store.put(dataset_version, cleaning_result)
+    dataset_store.session(session_id).update(
+        df, filename, vector_ids=vector_ids, column_decisions=column_decisions, dataset_version=dataset_version
+    )
+    preview_df = df.head(5)
+    response = {
+        "rows_indexed": len(df),
+        "preview": {
+            "columns": list(preview_df.columns),
+            "rows": preview_df.to_dict(orient="records"),
+        },
+        "content_hash": content_hash,
+        "dataset_version": dataset_version,
+        "snapshot_id": dataset_store.session(session_id).snapshot_id,
+        "cached": cached is not None,
+    }
+    if upsert_warning:
+        response["warning"] = upsert_warning
+    return response
+
+
+def delete_vectors(ids: List[str]) -> None:
+    """Remove vectors of replaced rows from the vector store."""
+    from backend.core.llm_rag import delete_documents
+
+    delete_documents(ids)
+
+
+def append_tabular_file(
+    file_path: str,
+    filename: str,
+    key: Optional[List[str]] = None,
+    session_id: str = "default",
+    chunk_rows: int = CSV_CHUNK_ROWS,
+    on_progress: Optional[ProgressCallback] = None,
+    cancel_event: Optional[threading.Event] = None,
+) -> Dict[str, Any]:
+    """
+    Merge a spooled upload into the session dataset, cleaning and embedding only the delta.
+
+    The delta is cleaned by replaying the column decisions learned when the session
+    dataset was first ingested, or by a full clean if its values do not fit the
+    learned dtypes. Rows identical to existing rows are skipped. With key columns,
+    delta rows whose key matches an existing row replace it (and its vector); all
+    other rows are appended. New vectors are identified by row hash and row label.
+
+    Args:
+        file_path (str): Path of the spooled upload.
+        filename (str): Original upload filename.
+        key (List[str], optional): Columns identifying a row for upserts.
+        session_id (str): Session whose dataset is appended to and whose agent status is updated.
+        chunk_rows (int): Rows parsed and embedded per chunk.
+        on_progress (ProgressCallback, optional): Called with (stage, counters) as work completes.
+        cancel_event (threading.Event, optional): Stops the run between chunks and stages.
+
+    Returns:
+        Dict[str, Any]: rows_added, rows_updated, rows_unchanged, rows_total, snapshot_id
+        (version id of the merged frame), preview and an optional warning.
+
+    Raises:
+        IngestError: If there is no session dataset, the file cannot be parsed, or its
+            columns do not match the session dataset.
+        IngestCancelled: If cancel_event is set before the run finishes.
+    """
+    memory = dataset_store.session(session_id)
+    if memory.df is None or memory.column_decisions is None:
+        raise IngestError("No dataset loaded. Upload a file with /api/v1/index before appending.")
+    base = memory.df
+    key = list(key or [])
+    missing_key = [col for col in key if col not in base.columns]
+    if missing_key:
+        raise IngestError(f"Key column(s) not in the session dataset: {', '.join(missing_key)}")
+    progress = IngestProgress(on_progress)
+    progress.stage("parse")
+    delta = parse_tabular(file_path, chunk_rows=chunk_rows, progress=progress, cancel_event=cancel_event)
+    if set(delta.columns) != set(base.columns):
+        raise IngestError("Appended file columns do not match the session dataset.")
+    delta = delta[list(base.columns)]
+    check_cancelled(cancel_event)
+
+    progress.stage("clean")
+    typed_columns = list(delta.columns) if is_typed_tabular(file_path) else None
+    cleaner = DataCleanerAgent(delta, typed_columns=typed_columns)
+    replayed = cleaner.apply_column_decisions(memory.column_decisions)
+    if cleaner.plan_drift:
+        # Values the upload's decisions cannot hold (e.g. fractions in an integer column)
+        logger.info(f"[ingest] Append drifted from the cleaning plan, running a full clean: {'; '.join(cleaner.plan_drift)}")
+        replayed = cleaner._execute("", delta)["cleaned_data"]
+    delta = replayed
+    progress.add("clean", "rows_cleaned", len(delta))
+    check_cancelled(cancel_event)
+
+    if memory.row_hashes is None:
+        memory.row_hashes = row_hashes(base)
+    base_hashes = memory.row_hashes
+    delta_hashes = row_hashes(delta)
+    unchanged = delta_hashes.isin(base_hashes.values)
+    delta, delta_hashes = delta[~unchanged], delta_hashes[~unchanged]
+    if key:
+        delta = delta.drop_duplicates(subset=key, keep="last")
+        delta_hashes = delta_hashes.loc[delta.index]
+        base_keys = pd.MultiIndex.from_frame(base[key])
+        delta_keys = pd.MultiIndex.from_frame(delta[key])
+        replaced = base_keys.isin(delta_keys)
+        rows_updated = int(delta_keys.isin(base_keys).sum())
+    else:
+        replaced = np.zeros(len(base), dtype=bool)
+        rows_updated = 0
+
+    if len(base) and pd.api.types.is_integer_dtype(base.index):
+        start = int(base.index.max()) + 1
+    else:
+        start = len(base)
+    new_index = pd.RangeIndex(start, start + len(delta))
+    delta.index = new_index
+    delta_hashes.index = new_index
+    prefix = memory.filename or filename
+    # Row hash plus row label: identical rows appended without a key still get distinct ids
+    delta_ids = pd.Series(
+        [f"{prefix}_{h:016x}_{i}" for h, i in zip(delta_hashes, new_index)], index=new_index, dtype=object
+    )
+    base_ids = memory.vector_ids if memory.vector_ids is not None else row_vector_ids(base, prefix)
+
+    progress.stage("embed")
+    upserted_ids, upsert_warning = embed_dataset(
+        delta,
+        prefix,
+        chunk_rows=chunk_rows,
+        progress=progress,
+        cancel_event=cancel_event,
+        vector_ids=delta_ids,
+    )
+    stale_ids = base_ids[replaced].tolist()
+    if stale_ids:
+        try:
+            delete_vectors(stale_ids)
+        except Exception as e:
+            logger.error(f"[ingest] Failed to delete {len(stale_ids)} replaced vectors: {e}")
+        # Cached uploads recording these ids must be re-embedded rather than restored
+        artifact_cache.forget_vectors(stale_ids)
+
+    merged = pd.concat([base[~replaced], delta])
+    for col in base.columns:
+        if merged[col].dtype == base[col].dtype:
+            continue
+        if isinstance(base[col].dtype, pd.CategoricalDtype) and merged[col].dtype == object:
+            # Categoricals with different category sets concatenate to object
+            merged[col] = merged[col].astype("category")
+    merged_ids = pd.concat([base_ids[~replaced], delta_ids])
+    # Appended rows are cleaned with the upload's decisions (or fully, on drift), so its report still applies
+    memory.update(
+        merged,
+        prefix,
+        vector_ids=merged_ids,
+        column_decisions=memory.column_decisions,
+        dataset_version=memory.dataset_version,
+    )
+    memory.row_hashes = pd.concat([base_hashes[~replaced], delta_hashes])
+    logger.info(
+        f"[ingest] Appended {filename}: {len(delta) - rows_updated} added, {rows_updated} updated, "
+        f"{int(unchanged.sum())} unchanged, total {len(merged)}"
+    )
+    preview_df = delta.head(5)
+    response = {
+        "rows_added": len(delta) - rows_updated,
+        "rows_updated": rows_updated,
+        "rows_unchanged": int(unchanged.sum()),
+        "rows_total": len(merged),
+        "snapshot_id": memory.snapshot_id,
+        "vectors_upserted": len(upserted_ids),
+        "preview": {
+            "columns": list(preview_df.columns),
+            "rows": preview_df.to_dict(orient="records"),
+        },
+    }
+    if upsert_warning:
+        response["warning"] = upsert_warning
+    return response
@@ -2,7 +2,7 @@ import io
 import os
 import shutil
 from pathlib import Path
-from config.constants import DATA_PATH
+from config.constants import DATA_PATH, UPLOAD_CHUNK_BYTES
 from backend.core.logging import logger
 from backend.core.utils import clean_string_for_storing
 
@@ -58,3 +58,57 @@ def delete_files(files: list[io.BytesIO], name: str):
     if os.path.exists(path):
         shutil.rmtree(path)
         logger.info(f"[io] Deleted: {path}")
+
+
+class UploadTooLargeError(Exception):
+    """Raised when a spooled upload exceeds the configured size cap."""
+
+    def __init__(self, size: int, max_bytes: int):
+        super().__init__(f"Upload exceeds {max_bytes} bytes (read {size} bytes)")
+        self.size = size
+        self.max_bytes = max_bytes
+
+
+async def spool_upload(
+    upload,
+    dest_path: str,
+    max_bytes: int = None,
+    chunk_size: int = UPLOAD_CHUNK_BYTES,
+    hasher=None,
+) -> int:
+    """
+    Stream an UploadFile to disk in fixed-size chunks without holding it in memory.
+
+    Args:
+        upload: The FastAPI/Starlette UploadFile to read from.
+        dest_path (str): Path of the file to write.
+        max_bytes (int, optional): Size cap; the partial file is removed when exceeded.
+        chunk_size (int): Bytes read per chunk.
+        hasher (optional): hashlib object updated with every chunk, so the upload
+            can be fingerprinted without a second pass over the file.
+
+    Returns:
+        int: Number of bytes written.
+
+    Raises:
+        UploadTooLargeError: If the upload is larger than max_bytes.
+    """
+    size = 0
+    try:
+        with open(dest_path, "wb") as f:
+            while True:
+                chunk = await upload.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if max_bytes is not None and size > max_bytes:
+                    raise UploadTooLargeError(size, max_bytes)
+                f.write(chunk)
+                if hasher is not None:
+                    hasher.update(chunk)
+    except BaseException:
+        if os.path.exists(dest_path):
+            os.remove(dest_path)
+        raise
+    logger.info(f"[io] Spooled upload to {dest_path}: {size} bytes")
+    return size
@@ -1,18 +1,44 @@
 import io
+import os
+import time
+import uuid
 import asyncio
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
 from concurrent.futures import ThreadPoolExecutor
 from backend.core.io import save_files, delete_files
 from backend.core.loader import load_and_split
-from backend.core.llm_rag import upsert_documents_batch
+from backend.core.agent_status import update_agent_status
 from backend.core.logging import logger
+from config.constants import (
+    CHUNK_SIZE,
+    CHUNK_OVERLAP_PCT,
+    DEFAULT_SPLITTER_TYPE,
+    INGEST_JOB_MAX_FINISHED,
+    INGEST_JOB_TTL_S,
+)
 
 
-def create_vector_store(files: list[io.BytesIO], name: str):
+def create_vector_store(
+    files: list[io.BytesIO],
+    name: str,
+    chunk_size=None,
+    chunk_overlap_pct=None,
+    splitter_type=None,
+):
+    from backend.core.llm_rag import upsert_documents_batch
+
     logger.info(
         f"[jobs] create_vector_store called for name: {name}, files: {[f.name for f in files]}"
     )
     data_source = save_files(files, name)
-    docs = load_and_split(data_source)
+    docs = load_and_split(
+        data_source,
+        chunk_size=chunk_size or CHUNK_SIZE,
+        chunk_overlap_pct=chunk_overlap_pct if chunk_overlap_pct is not None else CHUNK_OVERLAP_PCT,
+        splitter_type=splitter_type or DEFAULT_SPLITTER_TYPE,
+    )
     ids = [f"{name}_{i}" for i in range(len(docs))]
     texts = [doc.page_content for doc in docs]
     upsert_documents_batch(ids, texts)
@@ -30,10 +56,20 @@ def create_vector_store_async(
 ):
     logger.info(f"[jobs] create_vector_store_async called for name: {name}")
     loop = asyncio.get_event_loop()
-    return loop.run_in_executor(None, create_vector_store, files, name)
+    return loop.run_in_executor(
+        None,
+        create_vector_store,
+        files,
+        name,
+        chunk_size,
+        chunk_overlap_pct,
+        splitter_type,
+    )
 
 
 async def batch_upsert_async(ids, texts, batch_size=500):
+    from backend.core.llm_rag import upsert_documents_batch
+
     logger.info(
         f"[jobs] batch_upsert_async called for {len(ids)} ids, batch_size={batch_size}"
     )
@@ -50,3 +86,240 @@ async def batch_upsert_async(ids, texts, batch_size=500):
             )
         await asyncio.gather(*tasks)
     logger.info("[jobs] batch_upsert_async completed.")
+
+
+# --- Background ingestion jobs ---
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETE = "complete"
+JOB_ERROR = "error"
+JOB_CANCELLED = "cancelled"
+
+# Agent-status vocabulary used by the frontend for each job state
+_AGENT_STATUS_FOR_JOB = {
+    JOB_QUEUED: "idle",
+    JOB_RUNNING: "working",
+    JOB_COMPLETE: "complete",
+    JOB_ERROR: "error",
+    JOB_CANCELLED: "cancelled",
+}
+
+
+class IngestJob:
+    """
+    State of one background ingestion of a spooled upload.
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        filename: str,
+        session_id: str = "default",
+        content_hash: Optional[str] = None,
+    ):
+        self.job_id = str(uuid.uuid4())
+        self.file_path = file_path
+        self.filename = filename
+        self.session_id = session_id
+        self.content_hash = content_hash
+        self.status = JOB_QUEUED
+        self.stage: Optional[str] = None
+        self.progress: Dict[str, int] = {}
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.created_at = datetime.now().isoformat()
+        self.started_at: Optional[str] = None
+        self.finished_at: Optional[str] = None
+        self.finished_mono: Optional[float] = None
+        self.cancel_event = threading.Event()
+        self.future = None
+
+    @property
+    def agent_name(self) -> str:
+        return f"Ingestion Job {self.job_id[:8]}"
+
+    @property
+    def done(self) -> bool:
+        return self.status in (JOB_COMPLETE, JOB_ERROR, JOB_CANCELLED)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "filename": self.filename,
+            "session_id": self.session_id,
+            "status": self.status,
+            "stage": self.stage,
+            "progress": dict(self.progress),
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class IngestJobManager:
+    """
+    Runs ingestion jobs in a bounded worker pool and publishes their progress
+    through the agent status store. Finished jobs are evicted once they are
+    older than ttl_s or more than max_finished of them are kept.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        ttl_s: float = INGEST_JOB_TTL_S,
+        max_finished: int = INGEST_JOB_MAX_FINISHED,
+    ):
+        self.max_workers = max_workers
+        self.ttl_s = ttl_s
+        self.max_finished = max_finished
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._jobs: Dict[str, IngestJob] = {}
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="ingest-job"
+                )
+            return self._executor
+
+    def submit(
+        self,
+        file_path: str,
+        filename: str,
+        session_id: str = "default",
+        content_hash: Optional[str] = None,
+    ) -> IngestJob:
+        """
+        Queue a spooled upload for ingestion and return immediately.
+
+        Args:
+            file_path (str): Path of the spooled upload; removed when the job finishes.
+            filename (str): Original upload filename.
+            session_id (str): Session whose agent status receives progress.
+            content_hash (str, optional): SHA-256 of the upload computed while spooling.
+
+        Returns:
+            IngestJob: The queued job.
+        """
+        job = IngestJob(file_path, filename, session_id, content_hash=content_hash)
+        with self._lock:
+            self._prune_locked()
+            self._jobs[job.job_id] = job
+        self._publish(job, "Queued for ingestion")
+        job.future = self._get_executor().submit(self._run, job)
+        logger.info(f"[jobs] Submitted ingest job {job.job_id} for {filename}")
+        return job
+
+    def get(self, job_id: str, session_id: Optional[str] = None) -> Optional[IngestJob]:
+        """
+        Look up a job, optionally only if it belongs to the given session.
+        """
+        with self._lock:
+            self._prune_locked()
+            job = self._jobs.get(job_id)
+        if job is not None and session_id is not None and job.session_id != session_id:
+            return None
+        return job
+
+    def list_jobs(self, session_id: Optional[str] = None) -> List[IngestJob]:
+        with self._lock:
+            self._prune_locked()
+            jobs = list(self._jobs.values())
+        if session_id is not None:
+            jobs = [job for job in jobs if job.session_id == session_id]
+        return jobs
+
+    def cancel(self, job_id: str, session_id: Optional[str] = None) -> Optional[IngestJob]:
+        """
+        Request cancellation of a job. Queued jobs never start; running jobs stop
+        at the next chunk or stage boundary.
+
+        Args:
+            job_id (str): The job identifier.
+            session_id (str, optional): Only cancel the job if it belongs to this session.
+
+        Returns:
+            Optional[IngestJob]: The job, or None if it does not exist (in that session).
+        """
+        job = self.get(job_id, session_id=session_id)
+        if job is None or job.done:
+            return job
+        job.cancel_event.set()
+        if job.future is not None and job.future.cancel():
+            self._finish(job, JOB_CANCELLED, "Ingestion cancelled before it started")
+        logger.info(f"[jobs] Cancellation requested for job {job_id}")
+        return job
+
+    def _prune_locked(self) -> None:
+        """Evict expired finished jobs, then the oldest ones above max_finished."""
+        finished = sorted(
+            (job for job in self._jobs.values() if job.finished_mono is not None),
+            key=lambda job: job.finished_mono,
+        )
+        cutoff = time.monotonic() - self.ttl_s
+        excess = len(finished) - self.max_finished
+        for i, job in enumerate(finished):
+            if i < excess or job.finished_mono < cutoff:
+                del self._jobs[job.job_id]
+
+    def _run(self, job: IngestJob) -> None:
+        from backend.core.ingest import ingest_tabular_file, IngestCancelled
+
+        if job.cancel_event.is_set():
+            self._finish(job, JOB_CANCELLED, "Ingestion cancelled before it started")
+            return
+        job.status = JOB_RUNNING
+        job.started_at = datetime.now().isoformat()
+
+        def on_progress(stage: str, counters: Dict[str, int]) -> None:
+            job.stage = stage
+            job.progress = counters
+            self._publish(job, f"Ingesting {job.filename}: {stage}")
+
+        try:
+            job.result = ingest_tabular_file(
+                job.file_path,
+                job.filename,
+                session_id=job.session_id,
+                on_progress=on_progress,
+                cancel_event=job.cancel_event,
+                content_hash=job.content_hash,
+            )
+            self._finish(job, JOB_COMPLETE, f"Ingested {job.result['rows_indexed']} rows from {job.filename}")
+        except IngestCancelled:
+            self._finish(job, JOB_CANCELLED, "Ingestion cancelled")
+        except Exception as e:
+            logger.error(f"[jobs] Ingest job {job.job_id} failed: {e}")
+            job.error = str(e)
+            self._finish(job, JOB_ERROR, f"Ingestion failed: {e}")
+
+    def _finish(self, job: IngestJob, status: str, message: str) -> None:
+        job.status = status
+        job.finished_at = datetime.now().isoformat()
+        job.finished_mono = time.monotonic()
+        if os.path.exists(job.file_path):
+            os.remove(job.file_path)
+        self._publish(job, message)
+        logger.info(f"[jobs] Job {job.job_id} finished with status {status}")
+
+    def _publish(self, job: IngestJob, message: str) -> None:
+        update_agent_status(
+            session_id=job.session_id,
+            agent_name=job.agent_name,
+            status=_AGENT_STATUS_FOR_JOB[job.status],
+            agent_type="ingest",
+            message=message,
+            additional_data={
+                "jobId": job.job_id,
+                "stage": job.stage,
+                "progress": dict(job.progress),
+            },
+        )
+
+
+job_manager = IngestJobManager(max_workers=int(os.getenv("INGEST_MAX_WORKERS", "2")))
@@ -5,7 +5,7 @@ LLM RAG utilities: Embedding, vector store, and retrieval for RAG pipelines usin
 import os
 from pinecone import Pinecone
 from dotenv import load_dotenv
-from typing import List, Any, Callable, Tuple
+from typing import List, Any, Callable, Optional, Tuple
 from backend.core.models import get_openai_client
 from backend.core.prompts import RAG_PROMPT
 from backend.core.utils import clean_string_for_storing
@@ -61,6 +61,15 @@ class VectorStore:
             vector=vector, top_k=top_k, include_metadata=include_metadata
         )
 
+    def delete(self, ids: List[str]) -> None:
+        """
+        Delete vectors by id.
+        Args:
+            ids (List[str]): Ids of the vectors to delete.
+        """
+        logger.info(f"[llm_rag] Deleting {len(ids)} vectors.")
+        self.index.delete(ids=ids)
+
     def clear(self):
         """Delete all vectors in the index (for session reset or new upload)."""
         if hasattr(self.index, 'delete_all'):
@@ -311,8 +320,23 @@ MAX_PINECONE_BATCH_SIZE = (
 MAX_PINECONE_MESSAGE_BYTES = 4 * 1024 * 1024  # 4MB
 
 
+def delete_documents(ids: List[str], batch_size: int = 1000) -> None:
+    """
+    Delete documents from the vector store in batches.
+    Args:
+        ids (List[str]): Document IDs to delete.
+        batch_size (int): Ids per delete request.
+    """
+    for i in range(0, len(ids), batch_size):
+        vector_store.delete(ids[i : i + batch_size])
+
+
 def upsert_documents_batch(
-    ids: List[str], texts: List[str], batch_size: int = 100, max_workers: int = 4
+    ids: List[str],
+    texts: List[str],
+    batch_size: int = 100,
+    max_workers: int = 4,
+    progress_callback: Optional[Callable[[str, int], None]] = None,
 ) -> None:
     """
     Embed and upsert multiple documents in batches into the vector store, using parallel embedding and upsert.
@@ -321,6 +345,8 @@ def upsert_documents_batch(
         texts (List[str]): List of document texts.
         batch_size (int): Batch size for embedding and upsert.
         max_workers (int): Number of parallel workers.
+        progress_callback (Callable, optional): Called as ("embedded", n) after each
+            token batch is embedded and ("upserted", n) after each Pinecone batch is written.
     """
     max_tokens = 100000  # well below OpenAI's 300k limit for safety
     text_batches = batch_by_token_limit(texts, max_tokens)
@@ -339,6 +365,8 @@ def upsert_documents_batch(
             )
             return
         vector_store.upsert(vectors=vectors)
+        if progress_callback:
+            progress_callback("upserted", len(vectors))
 
     for batch in text_batches:
         # Parallel embedding for all Pinecone batches in this text batch
@@ -353,6 +381,8 @@ def upsert_documents_batch(
         embeddings_batches = embed_text_batch_parallel(
             batch, batch_size=batch_size, max_workers=max_workers
         )
+        if progress_callback:
+            progress_callback("embedded", len(embeddings_batches))
         # Split embeddings_batches into pinecone_batches
         emb_idx = 0
         upsert_futures = []
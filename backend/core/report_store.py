@@ -0,0 +1,119 @@
+"""
+ReportStore: cleaning reports keyed by dataset version, recorded once at upload time.
+Recent reports are served from an in-memory LRU; every report is also persisted as
+JSON so it survives restarts and LRU eviction. Reads never re-run the cleaner.
+"""
+
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from backend.core.artifact_cache import _json_default
+from backend.core.logging import logger
+from config.constants import REPORT_STORE_PATH, REPORT_CACHE_SIZE
+
+_VERSION_PATTERN = re.compile(r"^[A-Za-z0-9_.-]+$")
+
+
+class ReportStore:
+    """
+    Cleaning reports by dataset version.
+
+    Layout: <root>/<version>.json. Reports are normalized to plain JSON types on
+    put, so the in-memory and on-disk copies are identical. Subclasses store other
+    JSON documents the same way under their own `kind` and key name.
+    """
+
+    kind = "cleaning report"
+    key_name = "dataset version"
+
+    def __init__(self, root: Optional[str] = None, capacity: int = REPORT_CACHE_SIZE):
+        self.root = Path(root or os.getenv("REPORT_STORE_DIR", str(REPORT_STORE_PATH)))
+        self.capacity = capacity
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _path(self, version: str) -> Path:
+        if not _VERSION_PATTERN.match(version):
+            raise ValueError(f"Invalid {self.key_name}: {version!r}")
+        return self.root / f"{version}.json"
+
+    def _remember(self, version: str, report: Dict[str, Any]) -> None:
+        self._entries[version] = report
+        self._entries.move_to_end(version)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    def put(self, version: str, report: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Store the cleaning report of a dataset version.
+
+        Args:
+            version (str): Dataset version the report belongs to.
+            report (Dict[str, Any]): operations, cleaning_stats and detailed_results.
+
+        Returns:
+            Dict[str, Any]: The stored (JSON-normalized) report.
+        """
+        payload = json.dumps(report, default=_json_default)
+        stored = json.loads(payload)
+        path = self._path(version)
+        with self._lock:
+            self._remember(version, stored)
+            try:
+                self.root.mkdir(parents=True, exist_ok=True)
+                tmp_path = path.with_suffix(".tmp")
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    f.write(payload)
+                # Atomic rename so a reader never sees a partially written report
+                os.replace(tmp_path, path)
+            except Exception as e:
+                logger.error(f"[{type(self).__name__}] Failed to persist {self.kind} for {version}: {e}")
+        logger.info(f"[{type(self).__name__}] Stored {self.kind} for {version}")
+        return stored
+
+    def get(self, version: Optional[str]) -> Optional[Dict[str, Any]]:
+        """
+        Return the cleaning report of a dataset version: from memory if recently
+        used, otherwise read from disk once and kept in memory.
+
+        Args:
+            version (str, optional): Dataset version.
+
+        Returns:
+            Optional[Dict[str, Any]]: The report, or None if none was stored.
+        """
+        if not version:
+            return None
+        with self._lock:
+            report = self._entries.get(version)
+            if report is not None:
+                self._entries.move_to_end(version)
+                return report
+        try:
+            path = self._path(version)
+            if not path.exists():
+                return None
+            with open(path, "r", encoding="utf-8") as f:
+                report = json.load(f)
+        except Exception as e:
+            logger.error(f"[{type(self).__name__}] Failed to read {self.kind} for {version}: {e}")
+            return None
+        with self._lock:
+            self._remember(version, report)
+        return report
+
+    def clear(self) -> None:
+        """Drop every stored report, in memory and on disk."""
+        with self._lock:
+            self._entries.clear()
+            for path in self.root.glob("*.json"):
+                path.unlink(missing_ok=True)
+        logger.info(f"[{type(self).__name__}] Cleared.")
+
+
+report_store = ReportStore()
@@ -1,44 +1,126 @@
 """
 SessionMemory: Stores session-level DataFrame, filename, and per-user chat memory for the backend.
+
+Datasets are kept per session in a DatasetStore under a total memory budget: when the
+resident frames exceed it, the least recently used sessions are spilled to Parquet on
+local disk and reloaded transparently the next time their `df` is read. `memory`
+resolves to the session of the current request (see current_session_id).
+
+With SHARED_DATASET_DIR set (e.g. a directory under /dev/shm), every snapshot is
+also published to SharedDatasets, so other worker processes serving the same session
+attach to the frame by memory-mapping it instead of never seeing the upload.
+
+Every frame assigned to a session is an immutable snapshot with its own id
+(SessionMemory.snapshot_id): a new dataset is assigned, never modified in place.
+Caches and agent flows key on that id (see snapshot_id_of) instead of hashing the
+frame's content on every call.
 """
 
-from typing import Any, Optional
-from collections import defaultdict
+import hashlib
+import os
+import threading
+import time
+import uuid
+import weakref
+from collections import OrderedDict, defaultdict
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
 from backend.core.logging import logger
+from backend.core.shared_datasets import SharedDatasets
+from config.constants import DATASET_MEMORY_BUDGET_MB, DATASET_SPILL_PATH
 
 
 class SessionMemory:
-    def __init__(self):
+    def __init__(self, session_id: str = "default", store: Optional["DatasetStore"] = None):
         """
         Initialize SessionMemory with empty DataFrame and memory store.
+        Args:
+            session_id (str): Session the memory belongs to.
+            store (DatasetStore, optional): Store that accounts for and may spill the frame.
         """
-        self.df: Optional[Any] = None
+        self.session_id = session_id
+        self.store = store
+        self._df: Optional[Any] = None  # resident frame (None while spilled)
+        self.spill_path: Optional[Path] = None  # on-disk copy of the current frame, if any
+        self.shared_path: Optional[Path] = None  # snapshot file in the shared directory, if published
+        self.nbytes = 0  # in-memory size of the frame, resident or not
+        self.snapshot_id: Optional[str] = None  # version id of the current frame
+        self.last_access = 0.0
         self.filename: Optional[str] = None
         self.last_query: Optional[str] = None
         self.columns: Optional[list[str]] = None
+        self.vector_ids: Optional[Any] = None  # Series of vector store ids aligned to df.index
+        self.row_hashes: Optional[Any] = None  # Series of row content hashes, computed on first append
+        self.column_decisions: Optional[Dict[str, Dict[str, Any]]] = None
+        self.dataset_version: Optional[str] = None  # key of the stored cleaning report
         self.memory = defaultdict(list)
-        logger.info("[SessionMemory] Initialized.")
+        logger.info(f"[SessionMemory] Initialized for session {session_id}.")
+
+    @property
+    def df(self) -> Optional[Any]:
+        """The session's DataFrame, reloaded from disk if it was spilled."""
+        if self.store is not None:
+            return self.store.load(self)
+        return self._df
+
+    @df.setter
+    def df(self, value: Optional[Any]) -> None:
+        if self.store is not None:
+            self.store.assign(self, value)
+        else:
+            self._set_snapshot(value)
+
+    def _set_snapshot(self, df: Optional[Any]) -> None:
+        """Install a new frame under a fresh snapshot id."""
+        self._df = df
+        self.snapshot_id = uuid.uuid4().hex if df is not None else None
+        if df is not None:
+            register_snapshot(df, self.snapshot_id)
 
-    def update(self, df: Any, filename: str) -> None:
+    @property
+    def resident(self) -> bool:
+        return self._df is not None
+
+    def update(
+        self,
+        df: Any,
+        filename: str,
+        vector_ids: Optional[Any] = None,
+        column_decisions: Optional[Dict[str, Dict[str, Any]]] = None,
+        dataset_version: Optional[str] = None,
+    ) -> None:
         """
         Update the session with a new DataFrame and filename.
         Args:
             df (Any): The DataFrame to store.
             filename (str): The filename associated with the DataFrame.
+            vector_ids (Any, optional): Series of vector store ids aligned to df.index.
+            column_decisions (Dict, optional): Cleaner decisions replayed on appended rows.
+            dataset_version (str, optional): Version whose cleaning report is in the report store.
         """
-        self.df = df
         self.filename = filename
         self.columns = df.columns.tolist()
+        self.vector_ids = vector_ids
+        self.row_hashes = None
+        self.column_decisions = column_decisions
+        self.dataset_version = dataset_version
+        # Assigned last, so a shared store publishes the metadata with the frame
+        self.df = df
         logger.info(
-            f"[SessionMemory] Updated with filename: {filename}, shape: {df.shape}"
+            f"[SessionMemory] Updated session {self.session_id} with filename: {filename}, shape: {df.shape}"
         )
 
     def clear(self) -> None:
         """
         Clear the session memory and reset all fields.
         """
-        logger.info("[SessionMemory] Cleared.")
-        self.__init__()
+        logger.info(f"[SessionMemory] Cleared session {self.session_id}.")
+        self.df = None
+        self.__init__(self.session_id, self.store)
 
     def is_active(self) -> bool:
         """
@@ -46,7 +128,7 @@ class SessionMemory:
         Returns:
             bool: True if a DataFrame is loaded, else False.
         """
-        active = self.df is not None
+        active = self._df is not None or self.spill_path is not None or self.shared_path is not None
         logger.info(f"[SessionMemory] is_active: {active}")
         return active
 
@@ -74,7 +156,344 @@ class SessionMemory:
         self.memory[user_id].append(message)
 
 
+# id(frame) -> (weak reference to the frame, snapshot id)
+_snapshots: Dict[int, Tuple[weakref.ref, str]] = {}
+_snapshots_lock = threading.RLock()
+
+
+def register_snapshot(df: Any, snapshot_id: str) -> None:
+    """
+    Record the snapshot id of a frame so snapshot_id_of can find it in O(1). The
+    entry is dropped when the frame is garbage collected.
+
+    Args:
+        df (Any): The snapshot frame.
+        snapshot_id (str): Its version id.
+    """
+    key = id(df)
+
+    def forget(ref: weakref.ref) -> None:
+        with _snapshots_lock:
+            if key in _snapshots and _snapshots[key][0] is ref:
+                del _snapshots[key]
+
+    with _snapshots_lock:
+        _snapshots[key] = (weakref.ref(df, forget), snapshot_id)
+
+
+def snapshot_id_of(df: Optional[Any]) -> Optional[str]:
+    """
+    Version id of a frame held by a session, or None for any other frame (including
+    copies and slices of a snapshot, which may differ from it).
+
+    Args:
+        df (Any, optional): A DataFrame.
+
+    Returns:
+        Optional[str]: The snapshot id, if df is a registered snapshot.
+    """
+    if df is None:
+        return None
+    entry = _snapshots.get(id(df))
+    if entry is not None and entry[0]() is df:
+        return entry[1]
+    return None
+
+
+def frame_nbytes(df: Optional[Any]) -> int:
+    """In-memory size of a DataFrame, including object values and the index."""
+    if df is None:
+        return 0
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+class DatasetStore:
+    """
+    Session datasets under a total memory budget.
+
+    Frames are accounted when assigned (SessionMemory.df = ...). Whenever the resident
+    frames exceed the budget, least recently used sessions are spilled to
+    <spill_dir>/<session hash>.parquet (pickle for frames Parquet cannot hold) and
+    dropped from memory; reading their `df` loads them back. A reloaded frame keeps its
+    file, so evicting it again costs no write until the frame is replaced.
+
+    With a shared directory, assigned frames are published to SharedDatasets and a
+    session's metadata follows the latest snapshot any worker published; its frame is
+    attached on first read. Evicting a published frame only drops the reference.
+    """
+
+    def __init__(
+        self,
+        budget_bytes: Optional[int] = None,
+        spill_dir: Optional[str] = None,
+        shared_dir: Optional[str] = None,
+    ):
+        if budget_bytes is None:
+            budget_bytes = int(os.getenv("DATASET_MEMORY_BUDGET_MB", str(DATASET_MEMORY_BUDGET_MB))) * 1024 * 1024
+        self.budget_bytes = budget_bytes
+        self.spill_dir = Path(spill_dir or os.getenv("DATASET_SPILL_DIR", str(DATASET_SPILL_PATH)))
+        shared_dir = shared_dir or os.getenv("SHARED_DATASET_DIR")
+        self.shared: Optional[SharedDatasets] = SharedDatasets(shared_dir) if shared_dir else None
+        self._sessions: "OrderedDict[str, SessionMemory]" = OrderedDict()  # least recently used first
+        self._lock = threading.RLock()
+
+    def session(self, session_id: str = "default") -> SessionMemory:
+        """
+        Return the memory of a session, creating it on first use.
+
+        Args:
+            session_id (str): Session identifier.
+
+        Returns:
+            SessionMemory: The session's memory.
+        """
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = self._sessions[session_id] = SessionMemory(session_id, self)
+            if self.shared is not None:
+                self._sync(session)
+            return session
+
+    def sessions(self) -> List[SessionMemory]:
+        """All sessions this store knows, least recently used first."""
+        with self._lock:
+            return list(self._sessions.values())
+
+    def restore(self, session: SessionMemory, frame_path: Path, snapshot_id: str, nbytes: int, **metadata: Any) -> None:
+        """
+        Point a session at a frame saved on disk, loaded on first access like a
+        spilled frame. The file is not deleted when the frame is later replaced.
+
+        Args:
+            session (SessionMemory): Session to restore.
+            frame_path (Path): Parquet or pickle file of the frame.
+            snapshot_id (str): Version id the frame had when it was saved.
+            nbytes (int): In-memory size of the frame.
+            **metadata: Session attributes (filename, columns, dataset_version, column_decisions).
+        """
+        with self._lock:
+            self._discard_spill(session)
+            session._df = None
+            session.spill_path = frame_path
+            session.snapshot_id = snapshot_id
+            session.nbytes = nbytes
+            for key, value in metadata.items():
+                setattr(session, key, value)
+            self._touch(session)
+
+    def load(self, session: SessionMemory) -> Optional[Any]:
+        """Return a session's frame, reading it back from disk if it was spilled."""
+        with self._lock:
+            if session._df is None and session.shared_path is not None and not self._attach(session):
+                return None
+            reloaded = session._df is None and session.spill_path is not None
+            if reloaded:
+                session._df = self._read(session.spill_path)
+                # Same content, so the reloaded frame keeps the snapshot id
+                register_snapshot(session._df, session.snapshot_id)
+                logger.info(f"[DatasetStore] Reloaded session {session.session_id} ({session.nbytes} bytes)")
+            self._touch(session)
+            if reloaded:
+                self._enforce_budget(keep=session)
+            return session._df
+
+    def assign(self, session: SessionMemory, df: Optional[Any]) -> None:
+        """Replace a session's frame, account for its size and enforce the budget."""
+        with self._lock:
+            self._discard_spill(session)
+            session._set_snapshot(df)
+            session.nbytes = frame_nbytes(df)
+            if self.shared is not None:
+                self._publish(session)
+            self._touch(session)
+            self._enforce_budget(keep=session)
+
+    def drop(self, session_id: str) -> None:
+        """Forget a session and delete its spilled and shared frames."""
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+            if session is not None:
+                self._discard_spill(session)
+                session._df = None
+            if self.shared is not None:
+                self.shared.remove(session_id)
+        logger.info(f"[DatasetStore] Dropped session {session_id}.")
+
+    def usage(self) -> Dict[str, Any]:
+        """
+        Byte accounting for capacity planning.
+
+        Returns:
+            Dict[str, Any]: budget_bytes, resident_bytes, spilled_bytes and one entry per
+            session (session_id, snapshot_id, filename, bytes, resident, shared,
+            last_access), most recent last.
+        """
+        with self._lock:
+            sessions: List[Dict[str, Any]] = [
+                {
+                    "session_id": session.session_id,
+                    "snapshot_id": session.snapshot_id,
+                    "filename": session.filename,
+                    "bytes": session.nbytes,
+                    "resident": session.resident,
+                    "shared": session.shared_path is not None,
+                    "last_access": session.last_access,
+                }
+                for session in self._sessions.values()
+                if session.resident or session.spill_path is not None or session.shared_path is not None
+            ]
+        return {
+            "budget_bytes": self.budget_bytes,
+            "resident_bytes": sum(entry["bytes"] for entry in sessions if entry["resident"]),
+            "spilled_bytes": sum(entry["bytes"] for entry in sessions if not entry["resident"]),
+            "sessions": sessions,
+        }
+
+    def _touch(self, session: SessionMemory) -> None:
+        session.last_access = time.time()
+        if session.session_id in self._sessions:
+            self._sessions.move_to_end(session.session_id)
+
+    def _enforce_budget(self, keep: SessionMemory) -> None:
+        """Spill least recently used frames until the resident ones fit the budget."""
+        resident = sum(session.nbytes for session in self._sessions.values() if session.resident)
+        for session in list(self._sessions.values()):
+            if resident <= self.budget_bytes:
+                break
+            if session is keep or not session.resident:
+                continue
+            if self._spill(session):
+                resident -= session.nbytes
+        if resident > self.budget_bytes:
+            logger.warning(
+                f"[DatasetStore] Resident frames use {resident} bytes, over the {self.budget_bytes} byte budget"
+            )
+
+    def _sync(self, session: SessionMemory) -> None:
+        """Follow the snapshot other workers published for the session, if it changed."""
+        entry = self.shared.lookup(session.session_id)
+        if entry is None:
+            if session.shared_path is not None:
+                # Cleared by another worker
+                session.__init__(session.session_id, self)
+            return
+        if entry["snapshot_id"] == session.snapshot_id:
+            return
+        self._discard_spill(session)
+        session._df = None
+        session.snapshot_id = entry["snapshot_id"]
+        session.shared_path = self.shared.root / entry["frame_file"]
+        session.nbytes = entry.get("nbytes", 0)
+        session.filename = entry.get("filename")
+        session.columns = entry.get("columns")
+        session.dataset_version = entry.get("dataset_version")
+        session.column_decisions = entry.get("column_decisions")
+        session.vector_ids = None
+        session.row_hashes = None
+        logger.info(f"[DatasetStore] Session {session.session_id} follows shared snapshot {session.snapshot_id}")
+
+    def _attach(self, session: SessionMemory) -> bool:
+        """Map the session's published snapshot, following a newer one if it was replaced."""
+        for _ in range(2):
+            entry = self.shared.lookup(session.session_id)
+            if entry is None or entry["snapshot_id"] != session.snapshot_id:
+                self._sync(session)
+                if session.shared_path is None:
+                    return False
+                continue
+            try:
+                session._df, vector_ids = self.shared.attach(entry)
+            except FileNotFoundError:
+                continue
+            if vector_ids is not None:
+                session.vector_ids = vector_ids
+            register_snapshot(session._df, session.snapshot_id)
+            logger.info(f"[DatasetStore] Attached session {session.session_id} snapshot {session.snapshot_id}")
+            return True
+        logger.error(f"[DatasetStore] Failed to attach shared snapshot of session {session.session_id}")
+        return False
+
+    def _publish(self, session: SessionMemory) -> None:
+        if session._df is None:
+            session.shared_path = None
+            self.shared.remove(session.session_id)
+            return
+        session.shared_path = self.shared.publish(
+            session.session_id,
+            session.snapshot_id,
+            session._df,
+            {
+                "filename": session.filename,
+                "columns": [str(col) for col in session._df.columns],
+                "dataset_version": session.dataset_version,
+                "column_decisions": session.column_decisions,
+                "nbytes": session.nbytes,
+            },
+            vector_ids=session.vector_ids,
+        )
+        if session.shared_path is None:
+            # Do not leave other workers (or this one, on its next sync) on the previous snapshot
+            self.shared.remove(session.session_id)
+
+    def _spill(self, session: SessionMemory) -> bool:
+        if session.shared_path is not None:
+            # Published frames are attached again from the shared directory
+            session._df = None
+            logger.info(f"[DatasetStore] Released shared session {session.session_id} ({session.nbytes} bytes)")
+            return True
+        if session.spill_path is None:
+            name = hashlib.sha256(session.session_id.encode("utf-8")).hexdigest()
+            try:
+                self.spill_dir.mkdir(parents=True, exist_ok=True)
+                path = self.spill_dir / f"{name}.parquet"
+                try:
+                    session._df.to_parquet(path)
+                except Exception:
+                    # Mixed-type object columns cannot be written as Parquet
+                    path.unlink(missing_ok=True)
+                    path = self.spill_dir / f"{name}.pkl"
+                    session._df.to_pickle(path)
+            except Exception as e:
+                logger.error(f"[DatasetStore] Failed to spill session {session.session_id}: {e}")
+                return False
+            session.spill_path = path
+        session._df = None
+        logger.info(f"[DatasetStore] Spilled session {session.session_id} ({session.nbytes} bytes)")
+        return True
+
+    def _read(self, path: Path) -> pd.DataFrame:
+        if path.suffix == ".parquet":
+            return pd.read_parquet(path)
+        return pd.read_pickle(path)
+
+    def _discard_spill(self, session: SessionMemory) -> None:
+        if session.spill_path is not None:
+            if session.spill_path.parent == self.spill_dir:
+                # Restored frames belong to their snapshot directory (see restore)
+                session.spill_path.unlink(missing_ok=True)
+            session.spill_path = None
+
+
+class CurrentSession:
+    """Forwards attribute access to the memory of the session in current_session_id."""
+
+    def _session(self) -> SessionMemory:
+        return dataset_store.session(current_session_id.get())
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._session(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._session(), name, value)
+
+
+# Session of the request being served (set by the API middleware)
+current_session_id: ContextVar[str] = ContextVar("current_session_id", default="default")
+
+dataset_store = DatasetStore()
+
 # Singleton session memory for multi-user support (stub)
 session_memory = {}
 
-memory = SessionMemory()
+memory = CurrentSession()
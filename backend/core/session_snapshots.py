@@ -0,0 +1,366 @@
+"""
+SessionSnapshots: periodic and on-shutdown snapshots of session state on local disk,
+so a restart or rolling deploy does not force users to re-upload and re-clean.
+
+Each session's frame is written as Parquet (pickle for frames Parquet cannot hold)
+once per snapshot id; since snapshots are immutable, later saves only write frames
+that changed. Session metadata and chat histories go to one JSON file per session,
+and the global chat histories and agent statuses to state.json. Every worker
+process saves into the same directory, merging its state with what the others
+saved under a directory lock. Restoring reads only the JSON: frames are loaded
+from their snapshot file on first access, like spilled frames.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+import pandas as pd
+
+from backend.core.agent_status import export_statuses, restore_statuses
+from backend.core.artifact_cache import _json_default
+from backend.core.logging import logger
+from backend.core.session_memory import DatasetStore, SessionMemory, dataset_store, session_memory
+from config.constants import SESSION_SNAPSHOT_INTERVAL_S, SESSION_SNAPSHOT_PATH
+
+_FRAME_SUFFIXES = (".parquet", ".pkl")
+_LOCK_TIMEOUT_S = 30  # longest wait for another worker's save
+_LOCK_STALE_S = 120  # a lock held longer than this was left by a crashed worker
+
+
+class SessionSnapshots:
+    """
+    Session state snapshots.
+
+    Layout: <root>/state.json (chat histories by user, agent statuses by session),
+    <root>/<session hash>.json (session_id, snapshot_id, filename, columns,
+    dataset_version, column_decisions, nbytes, frame_file, chat) and
+    <root>/<session hash>.<snapshot_id>.parquet | .pkl (the frame) and
+    <root>/<session hash>.<snapshot_id>.ids.parquet (its vector ids, if known),
+    plus <root>/.lock while a worker saves.
+    """
+
+    def __init__(
+        self,
+        store: DatasetStore = dataset_store,
+        root: Optional[str] = None,
+        interval: Optional[float] = None,
+    ):
+        self.store = store
+        self.root = Path(root or os.getenv("SESSION_SNAPSHOT_DIR", str(SESSION_SNAPSHOT_PATH)))
+        if interval is None:
+            interval = float(os.getenv("SESSION_SNAPSHOT_INTERVAL_S", str(SESSION_SNAPSHOT_INTERVAL_S)))
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _name(self, session_id: str) -> str:
+        return hashlib.sha256(session_id.encode("utf-8")).hexdigest()
+
+    def _write_json(self, path: Path, payload: Dict[str, Any]) -> None:
+        with tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", dir=self.root, suffix=".tmp", delete=False
+        ) as f:
+            json.dump(payload, f, default=_json_default)
+        # Atomic rename so a restore never reads a partially written file
+        os.replace(f.name, path)
+
+    def _read_json(self, path: Path) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @contextmanager
+    def _directory_lock(self) -> Iterator[None]:
+        """
+        Exclusive lock on the snapshot directory, shared by every worker process:
+        a lock file created with O_EXCL (portable, unlike fcntl). A lock older
+        than _LOCK_STALE_S was left by a crashed worker and is broken.
+        """
+        lock_path = self.root / ".lock"
+        deadline = time.monotonic() + _LOCK_TIMEOUT_S
+        while True:
+            try:
+                os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                break
+            except FileExistsError:
+                try:
+                    if time.time() - lock_path.stat().st_mtime > _LOCK_STALE_S:
+                        lock_path.unlink(missing_ok=True)
+                        continue
+                except FileNotFoundError:
+                    continue
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"Snapshot directory {self.root} is locked")
+                time.sleep(0.05)
+        try:
+            yield
+        finally:
+            lock_path.unlink(missing_ok=True)
+
+    def save(self) -> int:
+        """
+        Snapshot every session with a dataset or chat history. Every worker process
+        snapshots into the same directory: frames are written to unique temporary
+        files first, then, under the directory lock, published and merged with the
+        manifests and state other workers saved (see _merge_manifest, _merge_state).
+
+        Returns:
+            int: Number of frames written (unchanged frames are not rewritten).
+        """
+        written = 0
+        with self._lock:
+            self.root.mkdir(parents=True, exist_ok=True)
+            prepared = []
+            for session in self.store.sessions():
+                try:
+                    prepared.append(self._prepare_session(session))
+                except Exception as e:
+                    logger.error(f"[SessionSnapshots] Failed to snapshot session {session.session_id}: {e}")
+            with self._directory_lock():
+                for name, manifest, pending in prepared:
+                    try:
+                        written += self._publish_session(name, manifest, pending)
+                    except Exception as e:
+                        logger.error(f"[SessionSnapshots] Failed to snapshot session {manifest['session_id']}: {e}")
+                    finally:
+                        for tmp_path in pending.values():
+                            tmp_path.unlink(missing_ok=True)
+                for tmp_path in self.root.glob("*.tmp"):
+                    # Left behind by a worker that crashed mid-save
+                    try:
+                        if time.time() - tmp_path.stat().st_mtime > _LOCK_STALE_S:
+                            tmp_path.unlink(missing_ok=True)
+                    except FileNotFoundError:
+                        pass
+                state_path = self.root / "state.json"
+                self._write_json(
+                    state_path,
+                    self._merge_state(
+                        self._read_json(state_path) or {},
+                        {"session_memory": dict(session_memory), "agent_statuses": export_statuses()},
+                    ),
+                )
+        logger.info(f"[SessionSnapshots] Saved {len(prepared)} sessions ({written} frames written)")
+        return written
+
+    def _prepare_session(self, session: SessionMemory) -> Tuple[str, Dict[str, Any], Dict[str, Path]]:
+        """
+        Build a session's manifest and write its frame and vector ids to temporary
+        files unless that snapshot is already on disk.
+
+        Returns:
+            Tuple[str, Dict[str, Any], Dict[str, Path]]: The session's file name stem,
+            its manifest and the temporary files to publish under their final names.
+        """
+        name = self._name(session.session_id)
+        chat = {user_id: messages for user_id, messages in session.memory.items() if messages}
+        frame_file, ids_file, pending = None, None, {}
+        if session.is_active():
+            frame_file, pending = self._save_frame(session, name)
+        if frame_file and session.vector_ids is not None:
+            # Appended rows have content-derived ids, so they cannot be recomputed on restore
+            ids_file = f"{name}.{session.snapshot_id}.ids.parquet"
+            if not (self.root / ids_file).exists():
+                tmp_path = self._tmp_path(".parquet")
+                session.vector_ids.rename("vector_id").to_frame().to_parquet(tmp_path)
+                pending[ids_file] = tmp_path
+        manifest = {
+            "session_id": session.session_id,
+            "snapshot_id": session.snapshot_id if frame_file else None,
+            "filename": session.filename,
+            "columns": [str(col) for col in session.columns or []],
+            "dataset_version": session.dataset_version,
+            "column_decisions": session.column_decisions,
+            "nbytes": session.nbytes,
+            "frame_file": frame_file,
+            "ids_file": ids_file,
+            "chat": chat,
+        }
+        return name, manifest, pending
+
+    def _tmp_path(self, suffix: str) -> Path:
+        fd, tmp_name = tempfile.mkstemp(dir=self.root, suffix=f"{suffix}.tmp")
+        os.close(fd)
+        return Path(tmp_name)
+
+    def _save_frame(self, session: SessionMemory, name: str) -> Tuple[Optional[str], Dict[str, Path]]:
+        """Write the session's frame to a temporary file unless this snapshot is already on disk."""
+        for suffix in _FRAME_SUFFIXES:
+            existing = f"{name}.{session.snapshot_id}{suffix}"
+            if (self.root / existing).exists():
+                return existing, {}
+        spill_path = session.spill_path
+        if not session.resident and spill_path is not None and spill_path.exists():
+            # Copy the spilled file rather than reading the frame back into memory
+            tmp_path = self._tmp_path(spill_path.suffix)
+            shutil.copyfile(spill_path, tmp_path)
+            return f"{name}.{session.snapshot_id}{spill_path.suffix}", {
+                f"{name}.{session.snapshot_id}{spill_path.suffix}": tmp_path
+            }
+        # A resident frame is read directly so snapshotting does not reorder the LRU
+        df = session._df if session.resident else session.df
+        if df is None:
+            return None, {}
+        tmp_path = self._tmp_path(".parquet")
+        frame_file = f"{name}.{session.snapshot_id}.parquet"
+        try:
+            df.to_parquet(tmp_path)
+        except Exception:
+            # Mixed-type object columns cannot be written as Parquet
+            frame_file = f"{name}.{session.snapshot_id}.pkl"
+            df.to_pickle(tmp_path)
+        return frame_file, {frame_file: tmp_path}
+
+    def _publish_session(self, name: str, manifest: Dict[str, Any], pending: Dict[str, Path]) -> int:
+        """Move a session's new files into place and merge its manifest (directory lock held)."""
+        manifest_path = self.root / f"{name}.json"
+        merged = self._merge_manifest(self._read_json(manifest_path), manifest)
+        if merged is None:
+            manifest_path.unlink(missing_ok=True)
+            self._prune(name, keep=set())
+            return 0
+        written = 0
+        for final_name, tmp_path in pending.items():
+            if final_name in (merged["frame_file"], merged["ids_file"]):
+                os.replace(tmp_path, self.root / final_name)
+                written += final_name == merged["frame_file"]
+        self._write_json(manifest_path, merged)
+        self._prune(name, keep={merged["frame_file"], merged["ids_file"]})
+        return written
+
+    @staticmethod
+    def _merge_manifest(saved: Optional[Dict[str, Any]], ours: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Merge this worker's manifest of a session into the one on disk: our frame
+        replaces the saved one if we hold the dataset (a worker without it keeps the
+        saved frame), and each user keeps the longer of the two chat histories
+        (histories only grow). None if neither has anything left to restore.
+        """
+        if saved is None:
+            merged = dict(ours)
+        else:
+            merged = dict(ours if ours["frame_file"] else saved)
+            chat = dict(saved.get("chat", {}))
+            for user_id, messages in ours["chat"].items():
+                if len(messages) >= len(chat.get(user_id, [])):
+                    chat[user_id] = messages
+            merged["chat"] = chat
+        if not merged["frame_file"] and not merged["chat"]:
+            return None
+        return merged
+
+    @staticmethod
+    def _merge_state(saved: Dict[str, Any], ours: Dict[str, Any]) -> Dict[str, Any]:
+        """Merge this worker's chat histories and agent statuses into the saved global state."""
+        histories = dict(saved.get("session_memory", {}))
+        for key, history in ours["session_memory"].items():
+            if len(history) >= len(histories.get(key, [])):
+                histories[key] = history
+        statuses = dict(saved.get("agent_statuses", {}))
+        statuses.update({session_id: agents for session_id, agents in ours["agent_statuses"].items() if agents})
+        return {"session_memory": histories, "agent_statuses": statuses}
+
+    def _prune(self, name: str, keep: set) -> None:
+        """Delete frames (and vector ids) of earlier snapshots of a session."""
+        for path in self.root.glob(f"{name}.*"):
+            if path.suffix in _FRAME_SUFFIXES and path.name not in keep:
+                path.unlink(missing_ok=True)
+
+    def restore(self) -> int:
+        """
+        Restore saved sessions into the store. Frames are loaded on first access;
+        sessions that already hold a dataset in this process keep it.
+
+        Returns:
+            int: Number of sessions restored.
+        """
+        if not self.root.exists():
+            return 0
+        restored = 0
+        state_path = self.root / "state.json"
+        with self._lock:
+            if state_path.exists():
+                try:
+                    with open(state_path, "r", encoding="utf-8") as f:
+                        state = json.load(f)
+                    for key, history in state.get("session_memory", {}).items():
+                        session_memory.setdefault(key, history)
+                    restore_statuses(state.get("agent_statuses", {}))
+                except Exception as e:
+                    logger.error(f"[SessionSnapshots] Failed to restore global state: {e}")
+            for manifest_path in self.root.glob("*.json"):
+                if manifest_path.name == "state.json":
+                    continue
+                try:
+                    with open(manifest_path, "r", encoding="utf-8") as f:
+                        manifest = json.load(f)
+                    restored += self._restore_session(manifest)
+                except Exception as e:
+                    logger.error(f"[SessionSnapshots] Failed to restore {manifest_path.name}: {e}")
+        logger.info(f"[SessionSnapshots] Restored {restored} sessions from {self.root}")
+        return restored
+
+    def _restore_session(self, manifest: Dict[str, Any]) -> int:
+        session = self.store.session(manifest["session_id"])
+        for user_id, messages in manifest.get("chat", {}).items():
+            if not session.memory.get(user_id):
+                session.memory[user_id] = messages
+        frame_file = manifest.get("frame_file")
+        if session.is_active() or not frame_file:
+            return 1
+        frame_path = self.root / frame_file
+        if not frame_path.exists():
+            logger.warning(f"[SessionSnapshots] Frame of session {manifest['session_id']} is missing, skipping it")
+            return 1
+        self.store.restore(
+            session,
+            frame_path,
+            snapshot_id=manifest["snapshot_id"],
+            nbytes=manifest.get("nbytes", 0),
+            filename=manifest.get("filename"),
+            columns=manifest.get("columns"),
+            dataset_version=manifest.get("dataset_version"),
+            column_decisions=manifest.get("column_decisions"),
+        )
+        ids_file = manifest.get("ids_file")
+        if ids_file and (self.root / ids_file).exists():
+            session.vector_ids = pd.read_parquet(self.root / ids_file)["vector_id"]
+        return 1
+
+    def start(self) -> None:
+        """Start snapshotting in the background every `interval` seconds (if positive)."""
+        if self.interval <= 0 or (self._thread is not None and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="session-snapshots", daemon=True)
+        self._thread.start()
+        logger.info(f"[SessionSnapshots] Snapshotting every {self.interval:g}s to {self.root}")
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.save()
+            except Exception as e:
+                logger.error(f"[SessionSnapshots] Periodic snapshot failed: {e}")
+
+    def stop(self) -> None:
+        """Stop the background thread and take a final snapshot."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.save()
+
+
+session_snapshots = SessionSnapshots()
@@ -0,0 +1,152 @@
+"""
+SharedDatasets: session datasets shared between worker processes. Each published
+snapshot is written once as an uncompressed Arrow IPC file in a memory-backed
+directory (e.g. /dev/shm), next to a small JSON index entry per session naming the
+current snapshot and its metadata. Any worker attaches to a session's frame by
+memory-mapping that file: primitive columns without nulls become views of the
+shared pages instead of private copies.
+
+Snapshot files are immutable and named by snapshot id; a new snapshot is written
+before the index entry is atomically replaced, and the previous file is unlinked
+afterwards (workers already mapping it keep a valid mapping).
+"""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import pandas as pd
+import pyarrow as pa
+
+from backend.core.artifact_cache import _json_default
+from backend.core.logging import logger
+
+VECTOR_ID_COLUMN = "__vector_id__"  # vector ids travel as an extra column of the snapshot file
+
+
+class SharedDatasets:
+    """
+    Session datasets in a directory shared by all workers.
+
+    Layout: <root>/<session hash>.json (index entry: session_id, snapshot_id,
+    filename, columns, dataset_version, column_decisions, nbytes, frame_file) and
+    <root>/<session hash>.<snapshot_id>.arrow (the frame).
+    """
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+        self._entries: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}  # parsed index by stat
+        self._lock = threading.Lock()
+
+    def _name(self, session_id: str) -> str:
+        return hashlib.sha256(session_id.encode("utf-8")).hexdigest()
+
+    def publish(
+        self,
+        session_id: str,
+        snapshot_id: str,
+        df: pd.DataFrame,
+        metadata: Dict[str, Any],
+        vector_ids: Optional[pd.Series] = None,
+    ) -> Optional[Path]:
+        """
+        Write a session's snapshot and point its index entry at it.
+
+        Args:
+            session_id (str): Session the dataset belongs to.
+            snapshot_id (str): Version id of the frame.
+            df (pd.DataFrame): The frame.
+            metadata (Dict[str, Any]): filename, columns, dataset_version, column_decisions, nbytes.
+            vector_ids (pd.Series, optional): Vector store ids aligned to df.index.
+
+        Returns:
+            Optional[Path]: The snapshot file, or None if the frame could not be shared.
+        """
+        name = self._name(session_id)
+        frame_path = self.root / f"{name}.{snapshot_id}.arrow"
+        try:
+            table = pa.Table.from_pandas(df)  # a RangeIndex is kept as metadata, others as a column
+            if vector_ids is not None and vector_ids.index.equals(df.index):
+                table = table.append_column(VECTOR_ID_COLUMN, pa.array(vector_ids.astype(str).to_numpy()))
+            self.root.mkdir(parents=True, exist_ok=True)
+            with pa.OSFile(str(frame_path), "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            entry = dict(metadata, session_id=session_id, snapshot_id=snapshot_id, frame_file=frame_path.name)
+            previous = self.lookup(session_id)
+            index_path = self.root / f"{name}.json"
+            tmp_path = index_path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f, default=_json_default)
+            # Atomic rename so other workers never read a partially written entry
+            os.replace(tmp_path, index_path)
+        except Exception as e:
+            # e.g. mixed-type object columns Arrow cannot hold: the dataset stays local to this worker
+            logger.error(f"[SharedDatasets] Failed to publish session {session_id}: {e}")
+            frame_path.unlink(missing_ok=True)
+            return None
+        if previous is not None and previous["frame_file"] != frame_path.name:
+            (self.root / previous["frame_file"]).unlink(missing_ok=True)
+        logger.info(f"[SharedDatasets] Published session {session_id} snapshot {snapshot_id} ({df.shape})")
+        return frame_path
+
+    def lookup(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Current index entry of a session, or None if no worker has published one.
+        The entry is re-read only when its file changes, so this is a stat per call.
+        """
+        index_path = self.root / f"{self._name(session_id)}.json"
+        try:
+            stat = index_path.stat()
+        except FileNotFoundError:
+            with self._lock:
+                self._entries.pop(session_id, None)
+            return None
+        signature = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            cached = self._entries.get(session_id)
+            if cached is not None and cached[0] == signature:
+                return cached[1]
+        try:
+            with open(index_path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        with self._lock:
+            self._entries[session_id] = (signature, entry)
+        return entry
+
+    def attach(self, entry: Dict[str, Any]) -> Tuple[pd.DataFrame, Optional[pd.Series]]:
+        """
+        Map a published snapshot into this process.
+
+        Args:
+            entry (Dict[str, Any]): Index entry returned by lookup().
+
+        Returns:
+            Tuple[pd.DataFrame, Optional[pd.Series]]: The frame and its vector ids, if shared.
+
+        Raises:
+            FileNotFoundError: If the snapshot was replaced after the entry was read.
+        """
+        source = pa.memory_map(str(self.root / entry["frame_file"]), "r")
+        table = pa.ipc.open_file(source).read_all()
+        ids = None
+        if VECTOR_ID_COLUMN in table.column_names:
+            ids = table.column(VECTOR_ID_COLUMN).to_numpy(zero_copy_only=False)
+            table = table.drop_columns([VECTOR_ID_COLUMN])
+        df = table.to_pandas(split_blocks=True)
+        vector_ids = pd.Series(ids, index=df.index, dtype=object) if ids is not None else None
+        return df, vector_ids
+
+    def remove(self, session_id: str) -> None:
+        """Delete a session's index entry and snapshot file."""
+        entry = self.lookup(session_id)
+        (self.root / f"{self._name(session_id)}.json").unlink(missing_ok=True)
+        if entry is not None:
+            (self.root / entry["frame_file"]).unlink(missing_ok=True)
+        with self._lock:
+            self._entries.pop(session_id, None)
@@ -38,10 +38,45 @@ Environment Variables:
 - OPENAI_API_KEY: Required for LLM access.
 - ALLOWED_ORIGINS: CORS configuration.
 - API_KEY: Optional, for protecting sensitive endpoints.
+- INGEST_MAX_WORKERS: Worker pool size for background ingestion jobs (default 2).
+- MAX_FILE_SIZE_MB: Upload size cap (default 10). Uploads are spooled to disk in
+  chunks, so the cap can be raised well beyond available RAM.
+- CLEANER_WORKERS: Threads the data cleaner splits columns across (default 1, sequential).
+- LOADER_WORKERS / DOC_CACHE_DIR: Process-pool size for directory loading (default 1)
+  and location of the parsed-document cache (default data/doc_cache).
+- DOC_CACHE_KEY: Secret used to sign parsed-document cache entries. Required by
+  load_directory(use_cache=True); the cache is off by default.
+- ARTIFACT_CACHE_ENABLED / ARTIFACT_CACHE_DIR: Content-hash cache of processed
+  uploads (default enabled, data/artifacts). Re-uploading identical bytes restores
+  the cleaned frame, cleaning report and vector ids instead of recomputing them.
+- REPORT_STORE_DIR: Where cleaning reports are persisted per dataset version
+  (default data/reports); /api/v1/data-cleaner-results serves them without re-cleaning.
+- PLAN_STORE_DIR: Where compiled cleaning plans are persisted per schema fingerprint
+  (default data/plans); uploads with a known schema replay their plan instead of
+  re-running detection.
+- DATASET_MEMORY_BUDGET_MB / DATASET_SPILL_DIR: Total memory for session datasets
+  (default 1024) and where least recently used ones are spilled as Parquet when it is
+  exceeded (default data/sessions). Requests pick their session with the X-Session-Id
+  header or the session_id query param (default "default").
+- SESSION_SNAPSHOT_DIR / SESSION_SNAPSHOT_INTERVAL_S: Where session state (datasets
+  as Parquet, metadata, chat histories and agent statuses as JSON) is snapshotted
+  (default data/snapshots) and how often (default 300 seconds, 0 for on-shutdown
+  only). Startup restores the snapshots; datasets are read back on first access.
+- SHARED_DATASET_DIR: Directory shared by all workers, ideally memory-backed (e.g.
+  /dev/shm/insights-copilot). When set, session datasets are published there as
+  Arrow IPC files and any uvicorn worker attaches to them memory-mapped, so
+  requests of one session need not be pinned to a single worker (default unset).
 
 Endpoints Overview:
 -------------------
-- /api/v1/index: Upload and index CSV file.
+- /api/v1/index: Upload and index a CSV (plain, .gz, .bz2 or .zst), Parquet,
+  Feather or Arrow IPC file.
+- /api/v1/index/append: Merge new or changed rows into the session dataset,
+  cleaning and embedding only the delta.
+- /api/v1/index-jobs: Submit, list, inspect and cancel background ingestion jobs.
+- /api/v1/agent-status: Agent statuses of a session, or only the changes since a
+  sequence number; /api/v1/agent-status/stream pushes them as server-sent events.
+- /api/v1/datasets/usage: Memory budget and per-session dataset bytes.
 - /api/v1/query: Query data using RAG.
 - /api/v1/chart: Generate chart from data.
 - /api/v1/sql: Generate and run SQL query.
@@ -92,6 +127,7 @@ Note:
 
 import sys
 import os
+import hashlib
 import pandas as pd
 import numpy as np
 import json
@@ -125,10 +161,11 @@ from backend.agentic.agent_executor import get_agent_executor
 from backend.agentic.graph_runner import build_graph
 from backend.agentic.orchestrator import agentic_flow
 import altair as alt
-from backend.core.session_memory import memory, session_memory
+from backend.core.session_memory import current_session_id, dataset_store, memory, session_memory
+from backend.core.session_snapshots import session_snapshots
 from backend.agents.critique_agent import CritiqueAgent
 from backend.agents.report_generator import ReportGenerator
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from backend.agents.debate_agent import DebateAgent
 from backend.core.debate_log import log_debate_entry
 # Use the fixed langgraph flow
@@ -136,7 +173,9 @@ from backend.agentic.langgraph_flow_fixed import run_multiagent_flow
 from fastapi import FastAPI, UploadFile, File, Request
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from backend.core.loader import load_and_split, get_user_data_dir
+from backend.core.loader import load_and_split, get_user_data_dir, tabular_suffix
+from backend.core.io import spool_upload, UploadTooLargeError
+from backend.core.ingest import ingest_tabular_file, append_tabular_file, IngestError
 from backend.core.models import get_openai_client, get_tokenizer
 from backend.core.prompts import RAG_PROMPT, INSIGHT_PROMPT, SQL_PROMPT
 from backend.core.utils import clean_string_for_storing
@@ -162,6 +201,20 @@ app = FastAPI(
     version="1.0.0",
 )
 
+
+@app.on_event("startup")
+def restore_session_snapshots():
+    """Restore session state saved before the last shutdown and start periodic snapshots."""
+    session_snapshots.restore()
+    session_snapshots.start()
+
+
+@app.on_event("shutdown")
+def save_session_snapshots():
+    """Take a final snapshot of session state."""
+    session_snapshots.stop()
+
+
 # --- CORS & Security ---
 ALLOWED_ORIGINS = get_env_var("ALLOWED_ORIGINS", "http://localhost:3000,http://localhost:8501").split(",")
 # Remove any empty strings and strip whitespace
@@ -315,21 +368,35 @@ from fastapi import APIRouter
 api_v1 = APIRouter(prefix="/api/v1")
 
 # Register the API endpoints with the router
+def _status_seq(value: Optional[str]) -> Optional[int]:
+    """Parse a client's last seen status sequence number (None if absent or invalid)."""
+    try:
+        return int(value) if value else None
+    except ValueError:
+        return None
+
+
 @api_v1.get("/agent-status")
 async def get_agent_status(request: Request):
     """
     Get the current status of all agents for a particular session.
-    Optional query param: session_id (defaults to "default")
-    Returns: {"agents": List[Dict]}
+    Optional query params: session_id (if there is no X-Session-Id header; defaults to
+    "default"), since (sequence number of the last change seen; only the changes after
+    it are returned)
+    Returns: {"agents": List[Dict], "seq": int}, or with since
+        {"seq": int, "reset": false, "changes": List[Dict]} (see agent_status.get_status_changes)
     """
     try:
-        from backend.core.agent_status import get_agent_statuses
+        from backend.core.agent_status import get_agent_statuses, get_status_changes
         
-        session_id = request.query_params.get("session_id", "default")
-        agent_statuses = get_agent_statuses(session_id)
+        session_id = current_session_id.get()
+        since = _status_seq(request.query_params.get("since"))
+        if since is not None:
+            return get_status_changes(session_id, since)
+        update = get_status_changes(session_id)
+        agent_statuses = update["agents"]
         
-        # Debug log the agent statuses for troubleshooting
-        logger.info(f"[AGENT-STATUS] Returning agent statuses: {agent_statuses}")
+        logger.debug(f"[AGENT-STATUS] Returning {len(agent_statuses)} agent statuses for session {session_id}")
         
         # Ensure we have the Data Cleaner agent with cleaning results
         cleaner_agents = [agent for agent in agent_statuses if agent.get('type') == 'cleaner']
@@ -346,13 +413,48 @@ async def get_agent_status(request: Request):
             except Exception as recreate_error:
                 logger.error(f"[AGENT-STATUS] Failed to recreate cleaner status: {recreate_error}")
                 
-        return {"agents": agent_statuses}
+        return {"agents": agent_statuses, "seq": update["seq"]}
     except Exception as e:
         logger.error(f"[AGENT-STATUS] Exception: {e}")
         logger.error(traceback.format_exc())
         raise HTTPException(status_code=500, detail=f"Failed to retrieve agent status: {str(e)}")
 
 
+@api_v1.get("/agent-status/stream")
+async def stream_agent_status(request: Request):
+    """
+    Server-sent events with the agent status changes of a session.
+    Optional query params: session_id (if there is no X-Session-Id header; defaults to
+    "default"), since (sequence number to resume after; the Last-Event-ID header of a
+    reconnecting EventSource takes precedence)
+    Events: "snapshot" ({"seq", "reset": true, "agents"}) first and whenever the
+    client fell too far behind, then "changes" ({"seq", "reset": false, "changes"});
+    the event id is the sequence number. Idle streams get a keep-alive comment.
+    """
+    from backend.core.agent_status import wait_for_status_changes
+    from config.constants import AGENT_STATUS_HEARTBEAT_S
+
+    session_id = current_session_id.get()
+    since = _status_seq(request.headers.get("last-event-id") or request.query_params.get("since"))
+
+    async def events():
+        cursor = since
+        while not await request.is_disconnected():
+            update = await wait_for_status_changes(session_id, cursor, timeout=AGENT_STATUS_HEARTBEAT_S)
+            if not update["reset"] and not update["changes"]:
+                yield ": keep-alive\n\n"
+                continue
+            cursor = update["seq"]
+            event = "snapshot" if update["reset"] else "changes"
+            yield f"id: {cursor}\nevent: {event}\ndata: {json.dumps(update, default=str)}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @api_v1.post("/reset-agent-status")
 async def reset_agent_status(request: Request):
     """
@@ -364,7 +466,7 @@ async def reset_agent_status(request: Request):
         from backend.core.agent_status import clear_agent_statuses
         
         data = await request.json()
-        session_id = data.get("session_id", "default")
+        session_id = data.get("session_id") or current_session_id.get()
         clear_agent_statuses(session_id)
         
         return {"status": "success", "message": f"Agent statuses cleared for session {session_id}"}
@@ -446,7 +548,9 @@ except ImportError:
 @api_v1.post("/index")
 async def index_csv(file: UploadFile = File(...)) -> Any:
     """
-    Upload and index a CSV file. Returns success or actionable error message.
+    Upload and index a CSV, Parquet, Feather or Arrow IPC file. Returns success or actionable error message.
+    The upload is spooled to disk in fixed-size chunks, parsed with a chunked
+    reader and embedded chunk by chunk, so the raw bytes are never held in memory.
     Args:
         file (UploadFile): The uploaded CSV file.
     Returns:
@@ -455,122 +559,56 @@ async def index_csv(file: UploadFile = File(...)) -> Any:
     """
     import time
     import psutil
+    import uuid
 
     start_time = time.time()
     process = psutil.Process(os.getpid())
+    temp_path = None
     try:
-        contents = await file.read()
-        file_size = len(contents)
-        logger.info(f"[UPLOAD] Received file: {file.filename}, size: {file_size} bytes")
-        if not contents:
+        filename = file.filename or f"upload_{uuid.uuid4()}.csv"
+        suffix = tabular_suffix(filename)
+        if suffix is None:
             raise HTTPException(
-                status_code=400, detail="Upload a valid CSV file (file is empty)."
+                status_code=400,
+                detail=f"Unsupported file type '{os.path.splitext(filename)[1]}'. Upload a CSV (optionally .gz, .bz2 or .zst compressed), Parquet, Feather or Arrow IPC file.",
             )
         # File size limit from environment variable (default 10MB)
         MAX_SIZE_MB = int(get_env_var("MAX_FILE_SIZE_MB", "10"))
         MAX_SIZE = MAX_SIZE_MB * 1024 * 1024
-        if file_size > MAX_SIZE:
+        # Spool uploaded file to a cross-platform temp path with original extension
+        temp_path = os.path.join(tempfile.gettempdir(), f"upload_{uuid.uuid4()}{suffix}")
+        logger.info(f"[UPLOAD] Spooling file to temp path: {temp_path}")
+        try:
+            upload_hash = hashlib.sha256()
+            file_size = await spool_upload(
+                file, temp_path, max_bytes=MAX_SIZE, hasher=upload_hash
+            )
+        except UploadTooLargeError as too_large:
             logger.warning(
-                f"[UPLOAD] File too large: {file_size} bytes > {MAX_SIZE} bytes"
+                f"[UPLOAD] File too large: {too_large.size} bytes > {MAX_SIZE} bytes"
             )
             raise HTTPException(
                 status_code=413,
                 detail=f"File too large (> {MAX_SIZE_MB}MB). Please upload a smaller file.",
             )
-        # Save uploaded file to a cross-platform temp path with original extension
-        import uuid
-
-        filename = file.filename or f"upload_{uuid.uuid4()}.csv"
-        suffix = os.path.splitext(filename)[1] or ".csv"
-        temp_dir = tempfile.gettempdir()
-        temp_path = os.path.join(temp_dir, f"upload_{uuid.uuid4()}{suffix}")
-        logger.info(f"[UPLOAD] Saving file to temp path: {temp_path}")
-        with open(temp_path, "wb") as f:
-            f.write(contents)
-        # Use modular loader abstraction
-        logger.info(f"[UPLOAD] Loading and splitting file: {temp_path}")
-        docs = load_and_split(temp_path)
-        logger.info(f"[UPLOAD] Loader returned {len(docs)} docs.")
-        
-        rows = []
-        skipped = []
-        for doc in docs:
-            try:
-                rows.append(json.loads(doc.page_content))
-            except Exception as e:
-                logger.warning(f"[UPLOAD] Failed to parse row: {str(e)[:200]}")
-                skipped.append(doc.page_content[:100])
-                
-        logger.info(f"[UPLOAD] Parsed {len(rows)} docs, skipped {len(skipped)} docs.")
-        if skipped:
-            logger.info(f"[UPLOAD] Sample skipped content: {skipped[:2]}")
-        if not rows:
-            logger.error("[UPLOAD] No valid rows found in the uploaded file")
+        logger.info(f"[UPLOAD] Received file: {file.filename}, size: {file_size} bytes")
+        if file_size == 0:
             raise HTTPException(
-                status_code=400,
-                detail="No valid rows found in CSV. Please check the file format and try again.",
+                status_code=400, detail="Upload a valid CSV file (file is empty)."
             )
-        df = pd.DataFrame(rows)
-        if df.empty:
-            raise HTTPException(
-                status_code=400, detail="Uploaded CSV contains no data rows."
+        try:
+            result = ingest_tabular_file(
+                temp_path,
+                file.filename,
+                session_id=current_session_id.get(),
+                content_hash=upload_hash.hexdigest(),
             )
-        cleaner = DataCleanerAgent(df)
-        result = cleaner._execute("", df)  # Use _execute to get the full result dict
-        df = result["cleaned_data"]
-        
-        # Store the cleaner results in agent status
-        from backend.core.agent_status import update_agent_status
-        session_id = "default"  # Use request's session ID if available
-        
-        # Prepare cleaning results for the frontend - include detailed_results
-        cleaning_result = {
-            "operations": result["operations"],
-            "cleaning_stats": result["cleaning_stats"],
-            "detailed_results": result.get("detailed_results", {})
-        }
-        
-        # Log detailed cleaning results for debugging
-        logger.info(f"[UPLOAD] Real cleaning operations: {result['operations']}")
-        logger.info(f"[UPLOAD] Cleaning stats: {result['cleaning_stats']}")
-        logger.info(f"[UPLOAD] Detailed results present: {True if result.get('detailed_results') else False}")
-        
-        # Update the agent status with real cleaning results
-        update_agent_status(
-            session_id=session_id,
-            agent_name="Data Cleaner",
-            status="complete",
-            agent_type="cleaner",
-            message="Data cleaning completed successfully",
-            additional_data={"cleaningResult": cleaning_result}
-        )
-        
-        # Log agent status update for debugging
-        from backend.core.agent_status import get_agent_statuses
-        agent_statuses = get_agent_statuses(session_id)
-        logger.info(f"[UPLOAD] Updated agent statuses: {agent_statuses}")
-        
-        logger.info(f"[UPLOAD] DataFrame shape after clean: {df.shape}")
-        memory.update(df, file.filename)
+        except IngestError as ingest_exc:
+            logger.error(f"[UPLOAD] {ingest_exc}")
+            raise HTTPException(status_code=400, detail=str(ingest_exc))
         logger.info(
             f"[UPLOAD] memory.df is set: {memory.df is not None}, filename: {memory.filename}"
         )
-        ids = [f"{file.filename}_{idx}" for idx in df.index]
-        texts = [row.to_json() for _, row in df.iterrows()]
-        from backend.core.llm_rag import upsert_documents_batch
-
-        # Use parallelized upsert with higher max_workers to test limits
-        try:
-            upsert_documents_batch(ids, texts, batch_size=100, max_workers=16)
-            logger.info("[UPLOAD] All rows batch upserted.")
-            upsert_warning = None
-        except Exception as upsert_exc:
-            logger.error(f"[UPLOAD] Error during parallel upsert: {upsert_exc}")
-            logger.error(traceback.format_exc())
-            upsert_warning = (
-                "Some or all rows failed to index due to system or API limits. "
-                "Try a smaller file or contact support if this persists."
-            )
         elapsed = time.time() - start_time
         mem_mb = process.memory_info().rss / 1024 / 1024
         logger.info(
@@ -578,18 +616,14 @@ async def index_csv(file: UploadFile = File(...)) -> Any:
         )
         response = {
             "status": "success",
-            "rows_indexed": len(df),
+            "rows_indexed": result["rows_indexed"],
             "elapsed": elapsed,
             "mem_mb": mem_mb,
+            "preview": result["preview"],
+            "cached": result["cached"],
         }
-        # Add DataFrame preview (first 5 rows and columns)
-        preview_df = df.head(5)
-        response["preview"] = {
-            "columns": list(preview_df.columns),
-            "rows": preview_df.to_dict(orient="records")
-        }
-        if upsert_warning:
-            response["warning"] = upsert_warning
+        if result.get("warning"):
+            response["warning"] = result["warning"]
         return response
     except HTTPException:
         raise
@@ -601,6 +635,150 @@ async def index_csv(file: UploadFile = File(...)) -> Any:
         )
         logger.error(traceback.format_exc())
         raise HTTPException(status_code=500, detail=f"File upload failed: {str(e)}")
+    finally:
+        if temp_path and os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+@api_v1.post("/index/append")
+async def append_index(request: Request, file: UploadFile = File(...)) -> Any:
+    """
+    Merge new or changed rows into the session dataset.
+    Only the uploaded rows are cleaned (replaying the column decisions learned on
+    the first upload) and only new or changed rows are embedded and upserted.
+    Optional query params: key (comma-separated key columns; matching rows are
+    replaced), session_id (if there is no X-Session-Id header; defaults to "default").
+    Returns: rows_added, rows_updated, rows_unchanged, rows_total and a preview.
+    """
+    import uuid
+
+    session_id = current_session_id.get()
+    key = [col.strip() for col in request.query_params.get("key", "").split(",") if col.strip()]
+    filename = file.filename or f"upload_{uuid.uuid4()}.csv"
+    suffix = tabular_suffix(filename)
+    if suffix is None:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported file type '{os.path.splitext(filename)[1]}'. Upload a CSV (optionally .gz, .bz2 or .zst compressed), Parquet, Feather or Arrow IPC file.",
+        )
+    MAX_SIZE_MB = int(get_env_var("MAX_FILE_SIZE_MB", "10"))
+    MAX_SIZE = MAX_SIZE_MB * 1024 * 1024
+    temp_path = os.path.join(tempfile.gettempdir(), f"upload_{uuid.uuid4()}{suffix}")
+    try:
+        try:
+            file_size = await spool_upload(file, temp_path, max_bytes=MAX_SIZE)
+        except UploadTooLargeError:
+            raise HTTPException(
+                status_code=413,
+                detail=f"File too large (> {MAX_SIZE_MB}MB). Please upload a smaller file.",
+            )
+        if file_size == 0:
+            raise HTTPException(
+                status_code=400, detail="Upload a valid CSV file (file is empty)."
+            )
+        try:
+            result = append_tabular_file(temp_path, filename, key=key, session_id=session_id)
+        except IngestError as ingest_exc:
+            logger.error(f"[APPEND] {ingest_exc}")
+            raise HTTPException(status_code=400, detail=str(ingest_exc))
+        return {"status": "success", **result}
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+@api_v1.post("/index-jobs", status_code=202)
+async def submit_index_job(request: Request, file: UploadFile = File(...)) -> Any:
+    """
+    Upload a tabular file and ingest it in the background.
+    The upload is spooled to disk, then parsing, cleaning, embedding and the
+    vector upsert run in the ingest worker pool. Progress is published through
+    the agent status of the session (agent type "ingest").
+    Optional query param: session_id (if there is no X-Session-Id header; defaults to "default")
+    Returns: {"job_id": str, "status": "queued"}
+    """
+    import uuid
+    from backend.core.jobs import job_manager
+
+    session_id = current_session_id.get()
+    filename = file.filename or f"upload_{uuid.uuid4()}.csv"
+    suffix = tabular_suffix(filename)
+    if suffix is None:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported file type '{os.path.splitext(filename)[1]}'. Upload a CSV (optionally .gz, .bz2 or .zst compressed), Parquet, Feather or Arrow IPC file.",
+        )
+    MAX_SIZE_MB = int(get_env_var("MAX_FILE_SIZE_MB", "10"))
+    MAX_SIZE = MAX_SIZE_MB * 1024 * 1024
+    temp_path = os.path.join(tempfile.gettempdir(), f"upload_{uuid.uuid4()}{suffix}")
+    upload_hash = hashlib.sha256()
+    try:
+        file_size = await spool_upload(file, temp_path, max_bytes=MAX_SIZE, hasher=upload_hash)
+    except UploadTooLargeError:
+        raise HTTPException(
+            status_code=413,
+            detail=f"File too large (> {MAX_SIZE_MB}MB). Please upload a smaller file.",
+        )
+    if file_size == 0:
+        os.remove(temp_path)
+        raise HTTPException(
+            status_code=400, detail="Upload a valid CSV file (file is empty)."
+        )
+    job = job_manager.submit(
+        temp_path, filename, session_id=session_id, content_hash=upload_hash.hexdigest()
+    )
+    logger.info(f"[INDEX-JOBS] Queued job {job.job_id} for {filename} ({file_size} bytes)")
+    return {"job_id": job.job_id, "status": job.status}
+
+
+@api_v1.get("/index-jobs")
+async def list_index_jobs():
+    """
+    List the current session's ingestion jobs.
+    Session: X-Session-Id header or session_id query param (defaults to "default").
+    Returns: {"jobs": List[Dict]}
+    """
+    from backend.core.jobs import job_manager
+
+    session_id = current_session_id.get()
+    return {"jobs": [job.to_dict() for job in job_manager.list_jobs(session_id)]}
+
+
+@api_v1.get("/index-jobs/{job_id}")
+async def get_index_job(job_id: str):
+    """
+    Get the status and per-stage progress of one of the session's ingestion jobs.
+    Returns: job dict (status, stage, progress, result, error); 404 for jobs of other sessions.
+    """
+    from backend.core.jobs import job_manager
+
+    job = job_manager.get(job_id, session_id=current_session_id.get())
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job id: {job_id}")
+    return job.to_dict()
+
+
+@api_v1.delete("/index-jobs/{job_id}")
+async def cancel_index_job(job_id: str):
+    """
+    Cancel one of the session's queued or running ingestion jobs.
+    Returns: job dict; 404 for jobs of other sessions.
+    """
+    from backend.core.jobs import job_manager
+
+    job = job_manager.cancel(job_id, session_id=current_session_id.get())
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job id: {job_id}")
+    return job.to_dict()
+
+
+@api_v1.get("/datasets/usage")
+async def dataset_usage():
+    """
+    Memory accounting of session datasets, for capacity planning.
+    Returns: {"budget_bytes", "resident_bytes", "spilled_bytes", "sessions": List[Dict]}
+    """
+    return dataset_store.usage()
 
 
 @api_v1.post("/query")
@@ -868,7 +1046,7 @@ async def multiagent_query(request: Request):
         
         data = await request.json()
         query = data.get("query")
-        session_id = data.get("session_id", "default")
+        session_id = data.get("session_id") or current_session_id.get()
         if not query:
             raise HTTPException(status_code=400, detail="Missing 'query' in request body.")
         
@@ -892,7 +1070,8 @@ async def multiagent_query(request: Request):
         result = run_multiagent_flow(
             query=query,
             data=memory.df if hasattr(memory, "df") else None,
-            session_id=session_id
+            session_id=session_id,
+            snapshot_id=memory.snapshot_id
         )
         
         return {"steps": result.get("steps", []), "result": result.get("result", "")}
@@ -906,7 +1085,7 @@ async def multiagent_query(request: Request):
 async def multiagent_api(request: Request):
     body = await request.json()
     query = body["query"]
-    session_id = body.get("session_id", "default")
+    session_id = body.get("session_id") or current_session_id.get()
     # For demo: use memory.df or pass an empty DataFrame
     import pandas as pd
     data = memory.df if hasattr(memory, 'df') and memory.df is not None else pd.DataFrame()
@@ -1003,34 +1182,33 @@ async def upload_file(file: UploadFile = File(...), user: str = None):
     start_time = time.time()
     process = psutil.Process(os.getpid())
     try:
-        contents = await file.read()
-        file_size = len(contents)
-        logger.info(f"[UPLOAD] Received file: {file.filename}, size: {file_size} bytes")
-        if not contents:
-            raise HTTPException(
-                status_code=400, detail="Upload a valid file (file is empty)."
-            )
         # File size limit from environment variable (default 10MB)
         MAX_SIZE_MB = int(get_env_var("MAX_FILE_SIZE_MB", "10"))
         MAX_SIZE = MAX_SIZE_MB * 1024 * 1024
-        if file_size > MAX_SIZE:
-            logger.warning(
-                f"[UPLOAD] File too large: {file_size} bytes > {MAX_SIZE} bytes"
-            )
-            raise HTTPException(
-                status_code=413,
-                detail=f"File too large (> {MAX_SIZE_MB}MB). Please upload a smaller file.",
-            )
-        # Save uploaded file to a cross-platform temp path with original extension
+        # Spool uploaded file to a cross-platform temp path with original extension
         import uuid
 
         filename = file.filename or f"upload_{uuid.uuid4()}"
         suffix = os.path.splitext(filename)[1] or ""
         temp_dir = tempfile.gettempdir()
         temp_path = os.path.join(temp_dir, f"upload_{uuid.uuid4()}{suffix}")
-        logger.info(f"[UPLOAD] Saving file to temp path: {temp_path}")
-        with open(temp_path, "wb") as f:
-            f.write(contents)
+        logger.info(f"[UPLOAD] Spooling file to temp path: {temp_path}")
+        try:
+            file_size = await spool_upload(file, temp_path, max_bytes=MAX_SIZE)
+        except UploadTooLargeError as too_large:
+            logger.warning(
+                f"[UPLOAD] File too large: {too_large.size} bytes > {MAX_SIZE} bytes"
+            )
+            raise HTTPException(
+                status_code=413,
+                detail=f"File too large (> {MAX_SIZE_MB}MB). Please upload a smaller file.",
+            )
+        logger.info(f"[UPLOAD] Received file: {file.filename}, size: {file_size} bytes")
+        if file_size == 0:
+            os.remove(temp_path)
+            raise HTTPException(
+                status_code=400, detail="Upload a valid file (file is empty)."
+            )
         # Log the file upload to audit log
         audit_log("file_upload", user=user, details={"filename": file.filename})
         elapsed = time.time() - start_time
@@ -1055,7 +1233,14 @@ async def upload_file(file: UploadFile = File(...), user: str = None):
 async def add_user_id_to_request(request: Request, call_next):
     user_id = request.headers.get("X-User-Id", "anonymous")
     request.state.user_id = user_id
-    response = await call_next(request)
+    # Session whose dataset `memory` resolves to while this request is served
+    session_id = request.headers.get("X-Session-Id") or request.query_params.get("session_id", "default")
+    request.state.session_id = session_id
+    token = current_session_id.set(session_id)
+    try:
+        response = await call_next(request)
+    finally:
+        current_session_id.reset(token)
     return response
 
 
@@ -1064,8 +1249,7 @@ async def user_upload(file: UploadFile = File(...), request: Request = None):
     user_id = request.state.user_id if request else "anonymous"
     user_dir = get_user_data_dir(user_id)
     file_path = os.path.join(user_dir, file.filename)
-    with open(file_path, "wb") as f:
-        f.write(await file.read())
+    await spool_upload(file, file_path)
     audit_log("user_file_upload", user=user_id, details={"filename": file.filename})
     return {"status": "uploaded", "user": user_id}
 
@@ -1105,7 +1289,10 @@ def debug_memory_df():
 def reset_index():
     """Clear the vector store (for new upload or debugging)."""
     from backend.core.llm_rag import vector_store
+    from backend.core.artifact_cache import artifact_cache
     vector_store.clear()
+    # Cached uploads must be re-embedded once the vectors they point at are gone
+    artifact_cache.forget_vectors()
     return {"status": "cleared"}
 
 
@@ -1171,6 +1358,7 @@ async def load_csv_memory(file: UploadFile = File(...)):
             
             # Store in memory for the agents to use
             from backend.core.session_memory import memory
+            memory.dataset_version = None  # not cleaned, so no stored report applies
             memory.df = df
             
             return {
@@ -1191,8 +1379,9 @@ async def load_csv_memory(file: UploadFile = File(...)):
 @api_v1.get("/data-cleaner-results")
 async def get_data_cleaner_results(request: Request):
     """
-    Get the most recent Data Cleaner agent results.
-    Optional query param: session_id (defaults to "default")
+    Get the cleaning report of the loaded dataset. The report is recorded per
+    dataset version at upload time; this endpoint never re-runs the cleaner.
+    Optional query param: session_id (if there is no X-Session-Id header; defaults to "default")
     Returns: {
         "operations": List of cleaning operations,
         "cleaning_stats": Statistics about the cleaning impact,
@@ -1202,107 +1391,29 @@ async def get_data_cleaner_results(request: Request):
     logger.info(f"[DATA-CLEANER] Endpoint called with request: {request.query_params}")
     try:
         from backend.core.agent_status import get_agent_statuses
-        import pandas as pd
-        import traceback
-        from backend.agents.data_cleaner_agent import DataCleanerAgent
+        from backend.core.report_store import report_store
         
-        session_id = request.query_params.get("session_id", "default")
+        session_id = current_session_id.get()
         logger.info(f"[DATA-CLEANER] Getting results for session_id: {session_id}")
+        memory = dataset_store.session(session_id)
         
-        agent_statuses = get_agent_statuses(session_id)
-        logger.info(f"[DATA-CLEANER] Found {len(agent_statuses)} total agents")
-        
-        # Find the Data Cleaner agent
-        cleaner_agents = [agent for agent in agent_statuses if agent.get('type') == 'cleaner']
-        logger.info(f"[DATA-CLEANER] Found {len(cleaner_agents)} cleaner agents")
-        
-        # First try to get results from agent status
-        cleaning_result = {}
-        if cleaner_agents:
-            # Get the most recent Data Cleaner agent
-            cleaner_agent = cleaner_agents[-1]
-            logger.info(f"[DATA-CLEANER] Latest cleaner agent: {cleaner_agent.get('name')}, status: {cleaner_agent.get('status')}")
-            
-            # Look for cleaningResult or any similar property
-            agent_data_keys = list(cleaner_agent.keys())
-            logger.info(f"[DATA-CLEANER] Agent data keys: {agent_data_keys}")
-            
-            for key in cleaner_agent:
-                if key.lower() == 'cleaningresult':
-                    cleaning_result = cleaner_agent[key]
-                    logger.info(f"[DATA-CLEANER] Found cleaning results in agent status with keys: {list(cleaning_result.keys()) if isinstance(cleaning_result, dict) else 'not a dict'}")
-                    break
-                    
-        # If we don't have results from status, try to regenerate them if possible
-        if (not cleaning_result or 
-            not cleaning_result.get("operations") or 
-            not cleaning_result.get("cleaning_stats")):
-            
-            logger.info(f"[DATA-CLEANER] No complete cleaning results found in agent status, trying to regenerate")
-            
-            # Let's check if we have data in memory from the file upload
-            try:
-                from backend.core.session_memory import memory
-                
-                memory_has_data = memory.df is not None and not memory.df.empty
-                logger.info(f"[DATA-CLEANER] Memory check: has_data={memory_has_data}, " + 
-                           f"filename={memory.filename}, " + 
-                           f"shape={memory.df.shape if memory_has_data else 'None'}")
-                
-                if memory_has_data:
-                    logger.info(f"[DATA-CLEANER] Regenerating results from memory DataFrame with shape: {memory.df.shape}")
-                    
-                    # Create a new cleaner instance and clean the data
-                    try:
-                        cleaner = DataCleanerAgent(memory.df)
-                        logger.info(f"[DATA-CLEANER] Created DataCleanerAgent instance")
-                        
-                        result = cleaner._execute("", memory.df)
-                        logger.info(f"[DATA-CLEANER] Executed cleaner with result keys: {list(result.keys())}")
-                        
-                        # Format cleaning results for the frontend including detailed results
-                        cleaning_result = {
-                            "operations": result["operations"],
-                            "cleaning_stats": result["cleaning_stats"],
-                            "detailed_results": result.get("detailed_results", {})
-                        }
-                        
-                        logger.info(f"[DATA-CLEANER] Regenerated cleaning_result with {len(result['operations'])} operations, " + 
-                                   f"{len(result['cleaning_stats'])} stats entries, and " + 
-                                   f"detailed_results={True if result.get('detailed_results') else False}")
-                        
-                        # Log detailed information about what was performed
-                        logger.info(f"[DATA-CLEANER] Cleaning operations performed: {len(result['operations'])}")
-                        for op_type, count in result['cleaning_stats'].get('operations_by_type', {}).items():
-                            logger.info(f"[DATA-CLEANER] {op_type}: {count} operations")
-                            
-                        if 'operation_details' in result['cleaning_stats']:
-                            for op_type, details in result['cleaning_stats']['operation_details'].items():
-                                logger.info(f"[DATA-CLEANER] {op_type} details: {details}")
-                                
-                            # Update the agent status with the enhanced results
-                            from backend.core.agent_status import update_agent_status
-                            update_agent_status(
-                                session_id=session_id,
-                                agent_name="Data Cleaner",
-                                status="complete",
-                                agent_type="cleaner",
-                                message="Data cleaning completed with detailed results",
-                                additional_data={"cleaningResult": cleaning_result}
-                            )
-                            
-                            logger.info(f"[DATA-CLEANER] Generated enhanced cleaning results")
-                    except Exception as cleaner_error:
-                        logger.error(f"[DATA-CLEANER] Error generating cleaning results: {cleaner_error}")
-                        logger.error(traceback.format_exc())
-            except ImportError as e:
-                logger.error(f"[DATA-CLEANER] Import error accessing memory: {e}")
-                logger.error(traceback.format_exc())
-                memory_has_data = False
-                
-            # Check if memory has data outside of the try-except blocks
-            if not memory_has_data:
-                logger.warning("[DATA-CLEANER] No data available in memory to clean")
+        # Report stored for the loaded dataset version
+        cleaning_result = report_store.get(memory.dataset_version)
+        if cleaning_result is not None:
+            logger.info(f"[DATA-CLEANER] Serving stored report for dataset version {memory.dataset_version}")
+        else:
+            # Fall back to the report published through the agent status
+            cleaning_result = {}
+            agent_statuses = get_agent_statuses(session_id)
+            cleaner_agents = [agent for agent in agent_statuses if agent.get('type') == 'cleaner']
+            logger.info(f"[DATA-CLEANER] No stored report, found {len(cleaner_agents)} cleaner agents")
+            if cleaner_agents:
+                # Get the most recent Data Cleaner agent
+                cleaner_agent = cleaner_agents[-1]
+                for key in cleaner_agent:
+                    if key.lower() == 'cleaningresult':
+                        cleaning_result = cleaner_agent[key]
+                        break
         
         # If still no results, create minimal structure with detailed results placeholders
         if not cleaning_result:
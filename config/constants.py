@@ -4,6 +4,12 @@ from pathlib import Path
 MODEL_PATH = Path("models")
 DATA_PATH = Path("data")
 VECTOR_STORE_PATH = Path("stores")
+ARTIFACT_CACHE_PATH = DATA_PATH / "artifacts"
+DOC_CACHE_PATH = DATA_PATH / "doc_cache"
+REPORT_STORE_PATH = DATA_PATH / "reports"
+PLAN_STORE_PATH = DATA_PATH / "plans"
+DATASET_SPILL_PATH = DATA_PATH / "sessions"
+SESSION_SNAPSHOT_PATH = DATA_PATH / "snapshots"
 
 # Embedding/LLM
 TEMPERATURE = 0.0
@@ -34,3 +40,33 @@ RUNTIME_OVERRIDABLE_CONFIG = [
     "DEFAULT_SPLITTER_TYPE",
     "SMART_FAQ_SPLITTER_TYPE",
 ]
+
+# Upload streaming / chunked ingest
+UPLOAD_CHUNK_BYTES = 1024 * 1024  # bytes read from an UploadFile per chunk
+CSV_CHUNK_ROWS = 100_000  # rows parsed/embedded per chunk
+DTYPE_PLAN_SAMPLE_ROWS = 1000  # rows sniffed to plan CSV column dtypes
+CATEGORY_MAX_UNIQUE = 50  # most distinct values a planned category column may have
+
+# Background ingestion jobs
+INGEST_JOB_TTL_S = 3600  # seconds a finished job stays queryable before it is evicted
+INGEST_JOB_MAX_FINISHED = 256  # finished jobs kept at most; the oldest are evicted first
+
+# Agent status
+AGENT_STATUS_HISTORY = 256  # status changes kept per session for "changes since seq N" requests
+AGENT_STATUS_HEARTBEAT_S = 15  # seconds between keep-alive comments on an idle status stream
+
+# Session datasets
+DATASET_MEMORY_BUDGET_MB = 1024  # resident session frames above this are spilled to disk, least recently used first
+SESSION_SNAPSHOT_INTERVAL_S = 300  # seconds between background snapshots of session state (0 disables them)
+
+# Data cleaning
+CLEANER_SAMPLE_MIN_ROWS = 200_000  # frames at least this long screen columns on a sample before full type detection
+CLEANER_SAMPLE_ROWS = 20_000  # non-null values per column in the screening sample
+CLEANER_SAMPLE_CONFIDENCE = 0.999  # confidence required before a column is ruled out from its sample
+DATE_FORMAT_SAMPLE_ROWS = 1000  # values classified to infer a date column's formats
+OUTLIER_SAMPLE_MIN_ROWS = 1_000_000  # frames at least this long estimate outlier quartiles from a sample
+OUTLIER_SAMPLE_ROWS = 200_000  # rows sampled for approximate outlier quartiles
+COMPACT_CATEGORY_MAX_RATIO = 0.5  # string columns with at most this distinct/non-null ratio become category
+REPORT_CACHE_SIZE = 32  # cleaning reports kept in memory; older ones are read back from disk
+PLAN_CACHE_SIZE = 32  # compiled cleaning plans kept in memory; older ones are read back from disk
+PLAN_DRIFT_TOLERANCE = 0.05  # extra share of failed conversions or clipped values before a plan counts as drifted
@@ -53,19 +53,51 @@ export default function Chat({ onAgentDataChange }: ChatProps) {
     }
   };
 
+  // Apply status changes pushed by the server (see /api/v1/agent-status/stream)
+  const applyStatusChanges = (agents: AgentStatus[], changes: any[]): AgentStatus[] => {
+    let next = agents;
+    for (const change of changes) {
+      if (change.op === "clear") {
+        next = [];
+      } else if (change.op === "update") {
+        const index = next.findIndex((agent) => agent.name === change.agent.name);
+        next = index === -1
+          ? [...next, change.agent]
+          : next.map((agent, i) => (i === index ? change.agent : agent));
+      }
+    }
+    return next;
+  };
+
   useEffect(() => {
     let interval: NodeJS.Timeout;
+    let source: EventSource | undefined;
     
-    if (loading) {
-      // Start polling every second when request is in progress
+    if (loading && typeof EventSource !== "undefined") {
+      // Receive status changes as they happen while the request is in progress
+      source = new EventSource(
+        `${API_URL}/api/v1/agent-status/stream?session_id=${encodeURIComponent(sessionId)}`
+      );
+      source.addEventListener("snapshot", (event) => {
+        setActiveAgents(JSON.parse((event as MessageEvent).data).agents);
+      });
+      source.addEventListener("changes", (event) => {
+        const { changes } = JSON.parse((event as MessageEvent).data);
+        setActiveAgents((agents) => applyStatusChanges(agents, changes));
+      });
+    } else if (loading) {
+      // Fall back to polling every second when server-sent events are unavailable
       interval = setInterval(fetchAgentStatusWithErrorHandling, 1000);
     } else {
       // Do one final fetch to get final status after loading completes
       fetchAgentStatusWithErrorHandling();
     }
     
-    // Clean up interval on component unmount or when loading changes
+    // Clean up the stream or interval on component unmount or when loading changes
     return () => {
+      if (source) {
+        source.close();
+      }
       if (interval) {
         clearInterval(interval);
       }
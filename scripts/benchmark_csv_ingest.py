@@ -0,0 +1,85 @@
+"""
+Benchmark the CSV ingest path used by /api/v1/index.
+
+Compares the legacy path (one Document per row via iterrows/to_json, then
+json.loads back into a DataFrame) with the columnar fast path
+(load_tabular + dataframe_to_texts).
+
+Usage:
+    python scripts/benchmark_csv_ingest.py --rows 100000 1000000
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backend.core.loader import load_tabular, dataframe_to_texts
+
+
+def make_csv(path: str, rows: int, seed: int = 42) -> None:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "EmployeeID": np.arange(rows),
+            "Department": rng.choice(["Sales", "HR", "IT", "Finance"], rows),
+            "City": rng.choice(["Pune", "Delhi", "Mumbai", "Chennai"], rows),
+            "Age": rng.integers(21, 65, rows),
+            "Salary": rng.normal(75000, 15000, rows).round(2),
+            "JoinDate": pd.Timestamp("2015-01-01")
+            + pd.to_timedelta(rng.integers(0, 3000, rows), unit="D"),
+        }
+    )
+    df.to_csv(path, index=False)
+
+
+def legacy_ingest(path: str):
+    df = pd.read_csv(path)
+    docs = [row.to_json() for _, row in df.iterrows()]
+    rows = [json.loads(doc) for doc in docs]
+    df = pd.DataFrame(rows)
+    texts = [row.to_json() for _, row in df.iterrows()]
+    return df, texts
+
+
+def fast_ingest(path: str):
+    df = load_tabular(path)
+    texts = dataframe_to_texts(df)
+    return df, texts
+
+
+def timed(fn, path):
+    start = time.perf_counter()
+    df, texts = fn(path)
+    return time.perf_counter() - start, len(df), len(texts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--skip-legacy", action="store_true")
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'path':>8} {'seconds':>9} {'rows/s':>12}")
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, f"bench_{rows}.csv")
+            make_csv(path, rows)
+            paths = [("fast", fast_ingest)]
+            if not args.skip_legacy:
+                paths.insert(0, ("legacy", legacy_ingest))
+            for label, fn in paths:
+                elapsed, n_rows, n_texts = timed(fn, path)
+                assert n_rows == n_texts == rows
+                print(f"{rows:>10} {label:>8} {elapsed:>9.2f} {rows / elapsed:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,8 @@ import requests
 import json
 from typing import Dict, Any
 import unittest
+import asyncio
+import threading
 
 # Add the parent directory to the path so we can import from backend
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -21,7 +23,10 @@ from backend.core.agent_status import (
     get_agent_statuses,
     clear_agent_statuses,
     reset_all_statuses,
+    get_status_changes,
+    wait_for_status_changes,
 )
+from backend.core import agent_status
 
 # Constants
 API_URL = "http://localhost:8000"
@@ -142,6 +147,60 @@ class TestAgentStatusTracking(unittest.TestCase):
         statuses = get_agent_statuses(session_id)
         self.assertEqual(len(statuses), 0)
 
+    def test_changes_since_sequence_number(self):
+        """Test that clients only receive the changes after the sequence number they saw."""
+        session_id = "test-session-5"
+        update_agent_status(session_id, "Agent A", "working", "planner", "Planning")
+        snapshot = get_status_changes(session_id)
+        self.assertTrue(snapshot["reset"])
+        self.assertEqual([agent["name"] for agent in snapshot["agents"]], ["Agent A"])
+        
+        update_agent_status(session_id, "Agent B", "working", "chart", "Charting")
+        clear_agent_statuses(session_id)
+        update = get_status_changes(session_id, since=snapshot["seq"])
+        self.assertFalse(update["reset"])
+        self.assertEqual([change["op"] for change in update["changes"]], ["update", "clear"])
+        self.assertEqual(update["changes"][0]["agent"]["name"], "Agent B")
+        self.assertGreater(update["changes"][1]["seq"], update["changes"][0]["seq"])
+        self.assertEqual(get_status_changes(session_id, since=update["seq"])["changes"], [])
+        
+        # A client from before a restart, or too far behind the ring buffer, gets a snapshot
+        self.assertTrue(get_status_changes(session_id, since=update["seq"] + 1)["reset"])
+        for i in range(agent_status.AGENT_STATUS_HISTORY + 1):
+            update_agent_status(session_id, "Agent C", "working", "sql", f"Step {i}")
+        stale = get_status_changes(session_id, since=update["seq"])
+        self.assertTrue(stale["reset"])
+        self.assertEqual(stale["agents"][0]["message"], f"Step {agent_status.AGENT_STATUS_HISTORY}")
+    
+    def test_waiting_client_is_woken_by_update(self):
+        """Test that a waiting stream client is woken by an update from another thread."""
+        session_id = "test-session-6"
+        seq = get_status_changes(session_id)["seq"]
+        
+        async def wait():
+            timer = threading.Timer(0.05, update_agent_status, (session_id, "Agent A", "complete", "sql", "Done"))
+            timer.start()
+            return await wait_for_status_changes(session_id, seq, timeout=5)
+        
+        update = asyncio.run(wait())
+        self.assertEqual(update["changes"][0]["agent"]["status"], "complete")
+        idle = asyncio.run(wait_for_status_changes(session_id, update["seq"], timeout=0.01))
+        self.assertEqual(idle["changes"], [])
+
+    def test_reads_do_not_create_sessions(self):
+        """Test that polling unknown session ids leaves no state and that reads return copies."""
+        get_agent_statuses("unknown-1")
+        self.assertTrue(get_status_changes("unknown-2")["reset"])
+        self.assertEqual(get_status_changes("unknown-2", since=0)["changes"], [])
+        asyncio.run(wait_for_status_changes("unknown-3", 0, timeout=0.01))
+        self.assertEqual(agent_status._sessions, {})
+        
+        update_agent_status("test-session-7", "Agent A", "working", "sql", "Querying")
+        statuses = get_agent_statuses("test-session-7")
+        statuses[0]["status"] = "error"
+        statuses.clear()
+        self.assertEqual(get_agent_statuses("test-session-7")[0]["status"], "working")
+
 
 def test_api_endpoints():
     """Test the agent status API endpoints."""
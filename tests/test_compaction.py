@@ -0,0 +1,54 @@
+"""
+Unit tests for memory compaction of cleaned frames.
+"""
+
+import numpy as np
+import pandas as pd
+
+from backend.core.compaction import compact_column, compact_frame
+
+
+def test_compact_frame_reports_bytes_saved_per_column():
+    n = 1000
+    df = pd.DataFrame({
+        "department": ["Sales", "HR", "IT", "Ops"] * (n // 4),
+        "name": [f"employee {i}" for i in range(n)],
+        "age": np.arange(n, dtype=np.int64) % 60 + 20,
+        "salary": np.arange(n, dtype=np.float64) * 1000.5,
+    })
+    compacted, report = compact_frame(df)
+
+    assert compacted["department"].dtype == "category"
+    assert compacted["name"].dtype == object
+    assert compacted["age"].dtype == np.int64
+    assert compacted["salary"].dtype == np.float64
+    assert df["department"].dtype == object  # input untouched
+    pd.testing.assert_frame_equal(compacted, df, check_categorical=False, check_dtype=False)
+
+    by_column = {entry["column"]: entry for entry in report["columns"]}
+    assert set(by_column) == {"department"}
+    assert all(entry["bytes_saved"] > 0 for entry in by_column.values())
+    assert report["bytes_saved"] == sum(entry["bytes_saved"] for entry in by_column.values())
+    assert report["bytes_after"] == compacted.memory_usage(index=False, deep=True).sum()
+
+
+def test_compacted_frame_computes_like_the_original():
+    n = 2_000_000
+    df = pd.DataFrame({
+        "qty": np.arange(n, dtype=np.int64) % 100_000,
+        "price": np.arange(n, dtype=np.int64) % 50_000,
+        "amount": np.arange(n, dtype=np.float64) % 100_000 + 0.5,
+    })
+    compacted, _ = compact_frame(df)
+
+    pd.testing.assert_series_equal(compacted["qty"] * compacted["price"], df["qty"] * df["price"])
+    assert (compacted["qty"] * compacted["price"]).min() >= 0
+    assert compacted["amount"].sum() == df["amount"].sum()
+    assert compacted["amount"].cumsum().iloc[-1] == df["amount"].cumsum().iloc[-1]
+
+
+def test_compact_column_keeps_mixed_and_numeric_values():
+    assert compact_column(pd.Series(["a", 1, "a", 1] * 10, dtype=object)) is None
+    assert compact_column(pd.Series([-1, 300], dtype=np.int64)) is None
+    assert compact_column(pd.Series([1.5, 2.5], dtype=np.float64)) is None
+    assert compact_column(pd.Series([True, False])) is None
@@ -0,0 +1,285 @@
+"""
+Unit tests for DataCleanerAgent detection and cleaning phases.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.agents.data_cleaner_agent import DataCleanerAgent
+
+
+def test_typed_columns_skip_inference():
+    df = pd.DataFrame(
+        {
+            "code": ["001", "002", "003", "004"],
+            "amount": ["10", "20", "30", "40"],
+        }
+    )
+    result = DataCleanerAgent(df, typed_columns=["code"])._execute("", df)
+    converted = [c["column"] for c in result["detailed_results"]["numeric_conversions"]]
+    assert "code" not in converted
+    assert "amount" in converted
+    assert result["cleaned_data"]["code"].tolist() == ["001", "002", "003", "004"]
+
+
+def test_column_decisions_replay_on_new_rows():
+    df = pd.DataFrame(
+        {
+            "weight": ["10 kg", "12 kg", "11 kg", "13 kg", "12 kg", "11 kg", "10 kg", "14 kg"],
+            "score": [10, 11, 12, 11, 10, 12, 11, 500],
+        }
+    )
+    cleaner = DataCleanerAgent(df)
+    cleaner._execute("", df)
+    decisions = cleaner.learn_column_decisions()
+    assert decisions["weight"]["normalize_units"] is True
+    assert decisions["score"]["clip"] is not None
+
+    delta = pd.DataFrame({"weight": ["12 kg", "13 kg"], "score": [11, 900]})
+    cleaned = DataCleanerAgent(delta).apply_column_decisions(decisions)
+    assert cleaned["weight"].tolist() == [12.0, 13.0]
+    assert str(cleaned["weight"].dtype) == decisions["weight"]["dtype"]
+    assert cleaned["score"].max() == decisions["score"]["clip"][1]
+
+
+def test_normalize_units_column_at_a_time():
+    df = pd.DataFrame(
+        {"reading": ["10 kg", "5 lbs", "Admin", "$1,200.50", "98.6°F", None, "506.455 KG "]}
+    )
+    cleaner = DataCleanerAgent(df)
+    cleaner.detailed_results = {"units_normalized": []}
+    cleaner.normalize_units()
+
+    # "Admin" matches "mi" but has no number, so it is kept as is
+    assert cleaner.df["reading"].tolist() == [
+        10.0, 2.27, "Admin", 1200.5, 37.0, None, round(506.455, 2)
+    ]
+    report = cleaner.detailed_results["units_normalized"][0]
+    assert report["count_changed"] == 6
+    assert set(report["unit_types"]) == {
+        "weight_kg", "weight_lb_to_kg", "distance_mi_to_km", "currency", "temp_f_to_c"
+    }
+    assert [example["conversion_type"] for example in report["examples"]] == [
+        "weight_kg", "weight_lb_to_kg", "distance_mi_to_km", "currency", "temp_f_to_c"
+    ]
+    assert report["examples"][1] == {"from": "5 lbs", "conversion_type": "weight_lb_to_kg", "to": 2.27}
+    assert "to" not in report["examples"][2]
+
+
+def test_normalize_units_infers_dtype_when_all_strings_convert():
+    df = pd.DataFrame({"price": ["$5", "€7.25", None]})
+    cleaner = DataCleanerAgent(df)
+    cleaner.detailed_results = {"units_normalized": []}
+    cleaner.normalize_units()
+    assert cleaner.df["price"].dtype == "float64"
+    assert cleaner.df["price"].iloc[:2].tolist() == [5.0, 7.25]
+
+
+def test_columns_parsed_once_per_upload(monkeypatch):
+    df = pd.DataFrame(
+        {
+            "amount": ["10", "20", "30", "x"],
+            "order_date": ["2023-01-01", "2023-01-02", "2023-01-03", "2023-01-04"],
+            "city": ["Paris", "Rome", "Oslo", "Rome"],
+        }
+    )
+    numeric_parses, date_parses = [], []
+    to_numeric, to_datetime = pd.to_numeric, pd.to_datetime
+
+    def counting_to_numeric(arg, *args, **kwargs):
+        numeric_parses.append(getattr(arg, "name", None))
+        return to_numeric(arg, *args, **kwargs)
+
+    def counting_to_datetime(arg, *args, **kwargs):
+        date_parses.append(getattr(arg, "name", None))
+        return to_datetime(arg, *args, **kwargs)
+
+    monkeypatch.setattr(pd, "to_numeric", counting_to_numeric)
+    monkeypatch.setattr(pd, "to_datetime", counting_to_datetime)
+    result = DataCleanerAgent(df)._execute("", df)
+
+    assert sorted(numeric_parses) == ["amount", "city", "order_date"]
+    assert sorted(date_parses) == ["amount", "city", "order_date"]
+    assert str(result["cleaned_data"]["amount"].dtype) == "float64"
+    assert str(result["cleaned_data"]["order_date"].dtype) == "datetime64[ns]"
+
+
+def test_sampled_detection_skips_text_columns(monkeypatch):
+    rows = 2000
+    df = pd.DataFrame(
+        {
+            "city": ["Paris", "Rome", "Oslo", "Lima"] * (rows // 4),
+            # Numbers only in the last 60% of rows: a head sample would miss them
+            "amount": ["n/a"] * (rows * 2 // 5) + [str(i) for i in range(rows * 3 // 5)],
+        }
+    )
+    config = {"sample_min_rows": 1000, "sample_rows": 200}
+    full_parses = []
+    to_numeric = pd.to_numeric
+
+    def counting_to_numeric(arg, *args, **kwargs):
+        if len(arg) == rows:
+            full_parses.append(arg.name)
+        return to_numeric(arg, *args, **kwargs)
+
+    monkeypatch.setattr(pd, "to_numeric", counting_to_numeric)
+    sampled = DataCleanerAgent(df, config=config)._execute("", df)
+    assert full_parses == ["amount"]
+    monkeypatch.undo()
+
+    unsampled = DataCleanerAgent(df, config={"sample_rows": 0})._execute("", df)
+    assert sampled["detailed_results"] == unsampled["detailed_results"]
+    assert sampled["cleaned_data"]["amount"].dtype == "float64"
+
+
+def test_cleaning_leaves_read_only_source_untouched():
+    values = np.array([1.0, 2.0, 3.0, 2.0, 1.0, 3.0, 2.0, 500.0, 1.0, 1.0])
+    values.setflags(write=False)
+    df = pd.DataFrame(
+        {"score": values, "amount": ["1", "2", None, "2", "1", "3", "2", "9", "1", "1"]}, copy=False
+    )
+    snapshot = df.copy()
+
+    cleaner = DataCleanerAgent(df)
+    result = cleaner._execute("", df)
+
+    pd.testing.assert_frame_equal(df, snapshot)
+    assert cleaner.original_df is df
+    assert result["cleaned_data"]["score"].max() < 500.0
+    stats = result["cleaning_stats"]
+    assert stats["rows_before"] == 10
+    assert stats["rows_after"] == len(result["cleaned_data"])
+    assert stats["missing_values_before"] == 1
+    assert {"column": "amount", "from_type": "object", "to_type": "float64"} in stats["dtype_changes"]
+    assert cleaner.change_log.steps["score"] == ["handle_outliers"]
+    assert cleaner.change_log.row_steps[0]["step"] == "remove_duplicates"
+
+
+def test_parallel_cleaning_matches_sequential():
+    n = 40
+    df = pd.DataFrame({
+        "order_date": [f"2023-01-{i % 28 + 1:02d}" for i in range(n)],
+        "weight": [f"{i % 9 + 1} kg" for i in range(n)],
+        "price": [f"${i * 3}" for i in range(n)],
+        "amount": [str(i) if i % 10 else "n/a" for i in range(n)],
+        "score": [float(i % 7) if i != 5 else 900.0 for i in range(n)],
+        "city": ["Paris", "Miami"] * (n // 2),
+    })
+
+    sequential = DataCleanerAgent(df, config={"workers": 1})._execute("", df)
+    parallel = DataCleanerAgent(df, config={"workers": 4})._execute("", df)
+
+    pd.testing.assert_frame_equal(parallel["cleaned_data"], sequential["cleaned_data"])
+    assert parallel["operations"] == sequential["operations"]
+    assert parallel["detailed_results"] == sequential["detailed_results"]
+    assert parallel["cleaning_stats"] == sequential["cleaning_stats"]
+    assert [entry["column"] for entry in parallel["detailed_results"]["outliers_fixed"]] == ["score"]
+
+
+def test_duplicate_analysis_reuses_row_hashes(monkeypatch):
+    import backend.core.duplicates as duplicates
+
+    hashed = []
+    column_hashes = duplicates.column_hashes
+
+    def counting_hashes(series):
+        hashed.append(series.name)
+        return column_hashes(series)
+
+    monkeypatch.setattr(duplicates, "column_hashes", counting_hashes)
+    df = pd.DataFrame({
+        "weight": ["5 kg", "7 kg", "5 kg", "7 kg", None, None],
+        "city": ["Paris", "Rome", "Paris", "Rome", "Oslo", "Oslo"],
+        "code": [0.0, 1.0, -0.0, 1.0, np.nan, np.nan],
+    })
+    result = DataCleanerAgent(df)._execute("", df)
+
+    assert result["detailed_results"]["duplicates_removed"] == 3
+    assert len(result["cleaned_data"]) == 3
+    # Every column is hashed once; only the column the cleaner replaced is hashed again
+    assert sorted(hashed) == ["city", "code", "weight", "weight"]
+
+
+def test_row_hashes_match_duplicated():
+    from backend.core.duplicates import RowHashes
+
+    df = pd.DataFrame({
+        "a": pd.Series([1, True, None, np.nan, 0.0, -0.0, "x"], dtype=object),
+        "b": [1.0, 1.0, np.nan, np.nan, 0.0, 0.0, 2.0],
+    })
+    pd.testing.assert_series_equal(RowHashes().duplicated(df), df.duplicated())
+    single = df[["a"]]
+    pd.testing.assert_series_equal(RowHashes().duplicated(single), single.duplicated())
+
+
+def test_row_hashes_compare_nullable_columns():
+    from backend.core.duplicates import RowHashes
+
+    df = pd.DataFrame({
+        "a": [1, 2, 1, 3, 2],
+        "b": pd.array([None, 5, None, 6, 5], dtype="Int64"),
+        "c": pd.array([True, None, True, False, None], dtype="boolean"),
+        "d": pd.array(["x", None, "x", "y", None], dtype="string"),
+    })
+    pd.testing.assert_series_equal(RowHashes().duplicated(df), df.duplicated())
+    assert DataCleanerAgent(df)._execute("", df)["detailed_results"]["duplicates_removed"] == 2
+
+
+def test_outlier_quartiles_sampled_on_large_frames():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"a": rng.normal(size=5000), "b": rng.integers(0, 100, 5000)})
+    exact = DataCleanerAgent(df)
+    exact.detailed_results = {"outliers_fixed": []}
+    exact.handle_outliers()
+    sampled = DataCleanerAgent(df, config={"outlier_sample_min_rows": 1000, "outlier_sample_rows": 2000})
+    sampled.detailed_results = {"outliers_fixed": []}
+    sampled.handle_outliers()
+
+    assert set(sampled.outlier_bounds) == {"a", "b"}
+    for col, (lower, upper) in exact.outlier_bounds.items():
+        assert sampled.outlier_bounds[col] == pytest.approx((lower, upper), rel=0.15)
+    assert all(entry["bounds"]["approximate"] for entry in sampled.detailed_results["outliers_fixed"])
+    assert not any("approximate" in entry["bounds"] for entry in exact.detailed_results["outliers_fixed"])
+
+
+def test_replayed_plan_matches_full_run_and_detects_drift():
+    n = 200
+    df = pd.DataFrame({
+        "order_date": [f"{13 + i % 15}/0{1 + i % 9}/2023" for i in range(n)],
+        "weight": [f"{10 + i % 50} kg" for i in range(n)],
+        "amount": [str(i % 90) if i % 20 else "n/a" for i in range(n)],
+        "score": [50.0 + i % 10 if i % 50 else 1e6 for i in range(n)],
+    })
+    cleaner = DataCleanerAgent(df)
+    full = cleaner._execute("", df)
+    plan = cleaner.learn_column_decisions()
+    assert plan["order_date"]["date_formats"] == {"formats": ["%d/%m/%Y"], "dayfirst": True}
+    assert plan["amount"]["conversion_failure"] == 0.05
+
+    replayer = DataCleanerAgent(df)
+    replayed = replayer.replay_plan(plan)
+    assert replayer.plan_drift == []
+    pd.testing.assert_frame_equal(replayed["cleaned_data"], full["cleaned_data"])
+    assert [entry["column"] for entry in replayed["detailed_results"]["outliers_fixed"]] == ["score"]
+
+    drifted = df.assign(amount=["unknown"] * n)
+    replayer = DataCleanerAgent(drifted)
+    assert replayer.replay_plan(plan) is None
+    assert [reason.split(":")[0] for reason in replayer.plan_drift] == ["amount"]
+    assert replayer.df["amount"].dtype == object  # nothing applied
+
+
+def test_date_conversion_reports_parsed_formats():
+    iso = [f"2023-03-{day:02d}" for day in range(1, 21)]
+    day_first = [f"{day}/04/2023" for day in range(13, 23)]
+    df = pd.DataFrame({"order_date": iso + day_first, "ship_date": iso + iso[:10]})
+    cleaner = DataCleanerAgent(df)
+    result = cleaner._execute("", df)
+
+    operations = {op["column"]: op for op in result["operations"] if op["operation"] == "convert_datetime"}
+    conversions = {entry["column"]: entry for entry in result["detailed_results"]["date_conversions"]}
+    assert operations["order_date"]["format_detected"] == "mixed"
+    assert conversions["order_date"]["format_detected"] == "mixed"
+    assert operations["ship_date"]["format_detected"] == "%Y-%m-%d"
+    assert conversions["ship_date"]["format_detected"] == "%Y-%m-%d"
@@ -0,0 +1,50 @@
+"""
+Unit tests for date format inference and explicit-format date parsing.
+"""
+
+import pandas as pd
+
+from backend.core.date_formats import infer_date_formats, parse_dates
+
+
+def test_mixed_formats_parse_every_row():
+    iso = [f"2023-03-{day:02d}" for day in range(1, 21)]
+    day_first = [f"{day}/04/2023" for day in range(13, 23)]
+    series = pd.Series(iso + day_first, dtype=object)
+
+    parsed, counts, inferred = parse_dates(series)
+
+    assert parsed.notna().all()
+    assert counts == {"%Y-%m-%d": 20, "%d/%m/%Y": 10}
+    assert inferred.dayfirst
+    assert parsed.iloc[20] == pd.Timestamp("2023-04-13")
+
+
+def test_dayfirst_inferred_from_values():
+    month_first = infer_date_formats(pd.Series(["03/25/2023", "04/01/2023", "12/31/2023"]))
+    day_first = infer_date_formats(pd.Series(["25/03/2023", "01/04/2023", "31/12/2023"]))
+
+    assert not month_first.dayfirst
+    assert month_first.formats[0] == "%m/%d/%Y"
+    assert day_first.dayfirst
+    assert day_first.formats[0] == "%d/%m/%Y"
+
+
+def test_formats_missing_from_sample_are_classified_in_leftovers():
+    series = pd.Series(["2023-01-05"] * 50 + ["5 Jan 2023 10:30"], dtype=object)
+
+    parsed, counts, _ = parse_dates(series, sample=series.iloc[:50])
+
+    assert parsed.notna().all()
+    assert counts["%d %b %Y %H:%M"] == 1
+    assert parsed.iloc[-1] == pd.Timestamp("2023-01-05 10:30")
+
+
+def test_unclassified_values_fall_back_to_pandas_inference():
+    series = pd.Series(["Thursday, 5 January 2023", "Friday, 6 January 2023", None], dtype=object)
+
+    parsed, counts, inferred = parse_dates(series)
+
+    assert inferred is None
+    assert counts == {}
+    pd.testing.assert_series_equal(parsed, pd.to_datetime(series, errors="coerce"))
@@ -0,0 +1,92 @@
+"""
+Unit tests for sample-driven CSV dtype planning.
+"""
+
+import pandas as pd
+
+from backend.core.dtype_plan import DtypePlan, plan_csv_dtypes
+from backend.core.loader import read_csv_planned
+from config.constants import DTYPE_PLAN_SAMPLE_ROWS
+
+
+def test_plan_detects_types_and_date_format(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_text(
+        "id,price,dept,joined,weight\n"
+        "1,10.5,Sales,03/15/2024,10 kg\n"
+        "2,20.0,HR,04/01/2024,12 kg\n"
+        "3,,Sales,05/20/2024,9 kg\n"
+        "4,40.25,HR,06/30/2024,11 kg\n"
+    )
+    plan = plan_csv_dtypes(str(path))
+    assert plan.to_dict() == {
+        "id": "int64",
+        "price": "float64",
+        "dept": "category",
+        "joined": "datetime:%m/%d/%Y",
+        "weight": "string",
+    }
+    df = read_csv_planned(str(path), plan)
+    assert str(df["id"].dtype) == "int64"
+    assert str(df["dept"].dtype) == "category"
+    assert pd.api.types.is_datetime64_any_dtype(df["joined"])
+    assert df["weight"].tolist() == ["10 kg", "12 kg", "9 kg", "11 kg"]
+
+
+def test_plan_falls_back_per_column(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_text(
+        "a,b,d\n1,1,2024-01-01\n2,2,2024-01-02\n3,x,not a date\n4,,2024-01-04\n"
+    )
+    plan = plan_csv_dtypes(str(path), sample_rows=2)
+    assert plan.types == {"a": "int64", "b": "int64", "d": "datetime"}
+    df = read_csv_planned(str(path), plan)
+    # Only the columns contradicted by the full file fall back
+    assert str(df["a"].dtype) == "int64"
+    assert df["b"].dtype == object and df["b"].iloc[2] == "x"
+    assert df["d"].dtype == object
+
+
+def test_plan_relaxes_only_the_failing_column(tmp_path, monkeypatch):
+    path = tmp_path / "data.csv"
+    path.write_text("qty,price,score\n1,1.5,7\n2,2.5,8\n,x,9\n")
+    plan = plan_csv_dtypes(str(path), sample_rows=2)
+    assert plan.types == {"qty": "int64", "price": "float64", "score": "int64"}
+    relaxed = []
+    relax = DtypePlan.relaxed
+
+    def recording_relax(self, error=None):
+        relaxed.append(relax(self, error))
+        return relaxed[-1]
+
+    monkeypatch.setattr(DtypePlan, "relaxed", recording_relax)
+
+    # The C engine blames qty by position, then price by its value
+    df = read_csv_planned(str(path), plan, engine="c")
+    assert [p.relaxed_numeric for p in relaxed] == [["qty"], ["qty", "price"]]
+    assert str(df["score"].dtype) == "int64"
+    assert df["qty"].dtype == "float64" and df["price"].dtype == object
+
+    # The python engine names the column
+    relaxed.clear()
+    df = read_csv_planned(str(path), plan, engine="python")
+    assert relaxed[0].relaxed_numeric == ["qty"]
+    assert str(df["score"].dtype) == "int64"
+
+
+def test_chunked_and_whole_reads_agree_on_late_date_mismatch(tmp_path):
+    from backend.core.ingest import parse_tabular
+    from backend.core.loader import load_tabular
+
+    path = tmp_path / "data.csv"
+    rows = [f"{i},2024-01-{i % 28 + 1:02d}" for i in range(DTYPE_PLAN_SAMPLE_ROWS + 500)]
+    path.write_text("id,joined\n" + "\n".join(rows) + "\n")
+    assert pd.api.types.is_datetime64_any_dtype(parse_tabular(str(path), chunk_rows=300)["joined"])
+
+    # A value past the sampled rows that does not match the planned format
+    rows[DTYPE_PLAN_SAMPLE_ROWS + 100] = f"{DTYPE_PLAN_SAMPLE_ROWS + 100},soon"
+    path.write_text("id,joined\n" + "\n".join(rows) + "\n")
+    assert plan_csv_dtypes(str(path)).to_dict()["joined"] == "datetime:%Y-%m-%d"
+    chunked = parse_tabular(str(path), chunk_rows=300)
+    assert chunked["joined"].map(type).eq(str).all()
+    pd.testing.assert_series_equal(chunked["joined"], load_tabular(str(path))["joined"])
@@ -0,0 +1,411 @@
+"""
+Unit tests for the chunked tabular ingest pipeline.
+"""
+
+import asyncio
+import io
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.core.io import spool_upload, UploadTooLargeError
+from backend.core.agent_status import get_agent_statuses
+from backend.core.ingest import (
+    clean_dataset,
+    parse_tabular,
+    ingest_tabular_file,
+    IngestError,
+    IngestCancelled,
+)
+from backend.core.jobs import IngestJobManager
+
+SAMPLE_CSV = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "data", "sample_data.csv")
+)
+
+
+@pytest.fixture(autouse=True)
+def _isolated_report_store(tmp_path, monkeypatch):
+    import backend.core.ingest as ingest
+    from backend.core.cleaning_plans import CleaningPlanStore
+    from backend.core.report_store import ReportStore
+
+    monkeypatch.setattr(ingest, "report_store", ReportStore(root=str(tmp_path / "reports")))
+    monkeypatch.setattr(ingest, "plan_store", CleaningPlanStore(root=str(tmp_path / "plans")))
+
+
+@pytest.fixture
+def isolated_stores(tmp_path, monkeypatch):
+    """Keep the artifact cache and session datasets of ingest runs under tmp_path."""
+    import backend.core.ingest as ingest
+    from backend.core.artifact_cache import ArtifactCache
+    from backend.core.session_memory import DatasetStore
+
+    monkeypatch.setattr(ingest, "artifact_cache", ArtifactCache(root=str(tmp_path / "artifacts")))
+    monkeypatch.setattr(ingest, "dataset_store", DatasetStore(spill_dir=str(tmp_path / "sessions")))
+
+
+class _FakeUpload:
+    def __init__(self, data: bytes):
+        self._buf = io.BytesIO(data)
+
+    async def read(self, size: int = -1) -> bytes:
+        return self._buf.read(size)
+
+
+def test_parse_tabular_chunks_match_full_read():
+    from backend.core.loader import load_tabular
+
+    expected = load_tabular(SAMPLE_CSV)
+    df = parse_tabular(SAMPLE_CSV, chunk_rows=3)
+    pd.testing.assert_frame_equal(df, expected)
+
+
+def test_parse_tabular_header_only(tmp_path):
+    path = tmp_path / "header.csv"
+    path.write_text("a,b\n")
+    with pytest.raises(IngestError):
+        parse_tabular(str(path))
+
+
+def test_spool_upload_writes_in_chunks(tmp_path):
+    data = b"a,b\n" + b"1,2\n" * 1000
+    dest = tmp_path / "spooled.csv"
+    size = asyncio.run(spool_upload(_FakeUpload(data), str(dest), chunk_size=64))
+    assert size == len(data)
+    assert dest.read_bytes() == data
+
+
+def test_spool_upload_enforces_cap(tmp_path):
+    dest = tmp_path / "too_big.csv"
+    with pytest.raises(UploadTooLargeError):
+        asyncio.run(
+            spool_upload(_FakeUpload(b"x" * 1000), str(dest), max_bytes=100, chunk_size=64)
+        )
+    assert not dest.exists()
+
+
+def test_ingest_cancelled_before_parse(isolated_stores):
+    cancel_event = threading.Event()
+    cancel_event.set()
+    with pytest.raises(IngestCancelled):
+        ingest_tabular_file(SAMPLE_CSV, "sample.csv", cancel_event=cancel_event)
+
+
+def test_job_manager_reports_failed_job(tmp_path, isolated_stores):
+    path = tmp_path / "header.csv"
+    path.write_text("a,b\n")
+    manager = IngestJobManager(max_workers=1)
+    job = manager.submit(str(path), "header.csv", session_id="job-test")
+    job.future.result(timeout=10)
+    assert job.status == "error"
+    assert "no data rows" in job.error
+    assert not path.exists()
+    statuses = get_agent_statuses("job-test")
+    assert statuses[-1]["type"] == "ingest"
+    assert statuses[-1]["jobId"] == job.job_id
+
+
+
+def test_job_manager_scopes_jobs_to_sessions_and_evicts_finished(tmp_path, isolated_stores):
+    manager = IngestJobManager(max_workers=1, max_finished=2)
+    jobs = []
+    for i in range(3):
+        path = tmp_path / f"header{i}.csv"
+        path.write_text("a,b\n")
+        job = manager.submit(str(path), path.name, session_id="owner")
+        job.future.result(timeout=10)
+        jobs.append(job)
+
+    job = jobs[-1]
+    assert manager.get(job.job_id, session_id="owner") is job
+    assert manager.get(job.job_id, session_id="intruder") is None
+    assert manager.cancel(job.job_id, session_id="intruder") is None
+    assert manager.list_jobs("intruder") == []
+    assert [j.job_id for j in manager.list_jobs("owner")] == [j.job_id for j in jobs[1:]]
+
+    manager.ttl_s = 0
+    assert manager.list_jobs() == []
+
+def test_artifact_cache_round_trip(tmp_path):
+    from backend.core.artifact_cache import ArtifactCache, schema_fingerprint
+
+    cache = ArtifactCache(root=str(tmp_path / "artifacts"))
+    df = pd.DataFrame({"a": [1, 2, 3], "b": ["x", 2.5, None]})
+    report = {"operations": ["Removed 0 duplicates"], "cleaning_stats": {"rows": np.int64(3)}}
+    assert cache.get("abc") is None
+    cache.put("abc", df, report, "data.csv", vector_ids=["data.csv_0", "data.csv_1", "data.csv_2"])
+    cached = cache.get("abc")
+    assert cached is not None
+    pd.testing.assert_frame_equal(cached.df, df)
+    assert schema_fingerprint(cached.df) == cached.manifest["schema_fingerprint"]
+    assert cached.cleaning_result["cleaning_stats"]["rows"] == 3
+    assert cached.vector_ids == ["data.csv_0", "data.csv_1", "data.csv_2"]
+    cache.forget_vectors(["other.csv_0"])
+    assert cache.get("abc").vector_ids is not None
+    cache.forget_vectors(["data.csv_1"])
+    assert cache.get("abc").vector_ids is None
+
+
+def test_report_store_serves_evicted_reports_from_disk(tmp_path):
+    from backend.core.report_store import ReportStore
+
+    store = ReportStore(root=str(tmp_path / "reports"), capacity=1)
+    assert store.get("v1") is None
+    stored = store.put("v1", {"operations": [], "cleaning_stats": {"rows_before": np.int64(3)}})
+    assert stored["cleaning_stats"]["rows_before"] == 3
+    store.put("v2", {"operations": ["x"]})
+    assert list(store._entries) == ["v2"]
+    assert store.get("v1") == stored
+    assert ReportStore(root=str(tmp_path / "reports")).get("v2") == {"operations": ["x"]}
+    with pytest.raises(ValueError):
+        store.put("../escape", {})
+
+
+def test_ingest_records_report_per_dataset_version(monkeypatch):
+    import backend.core.ingest as ingest
+    from backend.core.artifact_cache import ArtifactCache
+    from backend.core.session_memory import memory
+
+    monkeypatch.setattr(ingest, "artifact_cache", ArtifactCache(enabled=False))
+    monkeypatch.setattr(ingest, "embed_dataset", lambda df, filename, **kwargs: ([], None))
+    result = ingest_tabular_file(SAMPLE_CSV, "sample_data.csv")
+    assert memory.dataset_version == result["dataset_version"]
+    report = ingest.report_store.get(result["dataset_version"])
+    assert set(report) == {
+        "operations", "cleaning_stats", "detailed_results", "memory_compaction", "cleaning_plan"
+    }
+    assert report["cleaning_stats"]["rows_after"] == result["rows_indexed"]
+
+
+def test_recurring_schema_replays_compiled_plan(monkeypatch):
+    import backend.core.ingest as ingest
+    from backend.agents.data_cleaner_agent import DataCleanerAgent
+
+    df = pd.DataFrame({"amount": [str(i) for i in range(40)], "city": ["Paris", "Rome"] * 20})
+    first = clean_dataset(df)
+    assert first["cleaning_result"]["cleaning_plan"]["replayed"] is False
+
+    def no_detection(self, query, data, **kwargs):
+        raise AssertionError("detection should not run for a known schema")
+
+    monkeypatch.setattr(DataCleanerAgent, "_execute", no_detection)
+    second = clean_dataset(df.assign(amount=[str(39 - i) for i in range(40)]))
+    plan_report = second["cleaning_result"]["cleaning_plan"]
+    assert plan_report["replayed"] is True
+    assert plan_report["fingerprint"] == first["cleaning_result"]["cleaning_plan"]["fingerprint"]
+    assert second["cleaned_data"]["amount"].iloc[0] == 39
+    assert ingest.plan_store.get(plan_report["fingerprint"])["decisions"] == second["column_decisions"]
+
+
+def test_row_hashes_ignore_numeric_width_and_categories():
+    from backend.core.ingest import row_hashes
+
+    df = pd.DataFrame({"id": [-1, 2, 3], "price": [1.5, 2.0, None], "city": ["Paris", "Paris", "Rome"]})
+    narrow = df.astype({"id": np.int32, "price": np.float32, "city": "category"})
+    pd.testing.assert_series_equal(row_hashes(narrow), row_hashes(df))
+
+
+def test_spool_upload_hashes_chunks(tmp_path):
+    import hashlib
+    from backend.core.artifact_cache import file_sha256
+
+    data = b"a,b\n" + b"1,2\n" * 1000
+    dest = tmp_path / "upload.csv"
+    hasher = hashlib.sha256()
+    asyncio.run(spool_upload(_FakeUpload(data), str(dest), chunk_size=64, hasher=hasher))
+    assert hasher.hexdigest() == hashlib.sha256(data).hexdigest() == file_sha256(str(dest))
+
+
+def test_repeated_upload_restored_from_cache(tmp_path, monkeypatch):
+    import backend.core.ingest as ingest
+    from backend.core.artifact_cache import ArtifactCache
+
+    calls = []
+
+    def fake_embed(df, filename, **kwargs):
+        calls.append(len(df))
+        return [f"{filename}_{idx}" for idx in df.index], None
+
+    monkeypatch.setattr(ingest, "artifact_cache", ArtifactCache(root=str(tmp_path / "artifacts")))
+    monkeypatch.setattr(ingest, "embed_dataset", fake_embed)
+    first = ingest_tabular_file(SAMPLE_CSV, "sample_data.csv")
+    second = ingest_tabular_file(SAMPLE_CSV, "sample_data.csv")
+    assert first["cached"] is False and second["cached"] is True
+    assert first["content_hash"] == second["content_hash"]
+    assert first["rows_indexed"] == second["rows_indexed"]
+    assert len(calls) == 1
+
+
+def test_append_embeds_only_delta(tmp_path, monkeypatch):
+    import backend.core.ingest as ingest
+    from backend.core.artifact_cache import ArtifactCache
+    from backend.core.session_memory import memory
+
+    embedded, deleted = [], []
+
+    def fake_embed(df, filename, vector_ids=None, **kwargs):
+        ids = vector_ids.tolist() if vector_ids is not None else [f"{filename}_{i}" for i in df.index]
+        embedded.append(ids)
+        return ids, None
+
+    monkeypatch.setattr(ingest, "artifact_cache", ArtifactCache(root=str(tmp_path / "artifacts")))
+    monkeypatch.setattr(ingest, "embed_dataset", fake_embed)
+    monkeypatch.setattr(ingest, "delete_vectors", deleted.extend)
+
+    base = tmp_path / "base.csv"
+    base.write_text("id,name,qty\n1,a,10\n2,b,20\n3,c,30\n")
+    ingest_tabular_file(str(base), "base.csv")
+    assert len(memory.vector_ids) == 3
+
+    delta = tmp_path / "delta.csv"
+    delta.write_text("id,name,qty\n2,b,20\n3,c,35\n4,d,40\n")
+    result = ingest.append_tabular_file(str(delta), "delta.csv", key=["id"])
+    assert result["rows_unchanged"] == 1
+    assert result["rows_updated"] == 1
+    assert result["rows_added"] == 1
+    assert result["rows_total"] == 4
+    assert len(embedded[-1]) == 2
+    assert deleted == ["base.csv_2"]
+    assert sorted(memory.df["qty"].tolist()) == [10, 20, 35, 40]
+    assert memory.vector_ids.index.equals(memory.df.index)
+    memory.clear()
+
+
+@pytest.mark.parametrize("suffix,compression", [(".csv.gz", "gzip"), (".csv.bz2", "bz2"), (".csv.zst", "zstd")])
+def test_parse_compressed_csv_in_chunks(tmp_path, suffix, compression):
+    from backend.core.loader import HAS_ZSTANDARD, tabular_suffix
+
+    if compression == "zstd" and not HAS_ZSTANDARD:
+        pytest.skip("zstandard not installed")
+    df = pd.DataFrame({"a": range(25), "b": [f"row{i}" for i in range(25)]})
+    path = tmp_path / f"export{suffix}"
+    df.to_csv(path, index=False, compression=compression)
+    assert tabular_suffix(path.name) == suffix
+    parsed = parse_tabular(str(path), chunk_rows=10)
+    pd.testing.assert_frame_equal(parsed, df)
+
+
+def test_corrupt_gzip_upload_is_rejected(tmp_path):
+    path = tmp_path / "broken.csv.gz"
+    path.write_bytes(b"\x1f\x8b\x08\x00not really gzip")
+    with pytest.raises(IngestError):
+        parse_tabular(str(path))
+
+
+def test_append_keeps_category_columns(tmp_path, monkeypatch):
+    import backend.core.ingest as ingest
+    from backend.core.artifact_cache import ArtifactCache
+    from backend.core.session_memory import memory
+
+    monkeypatch.setattr(ingest, "artifact_cache", ArtifactCache(root=str(tmp_path / "artifacts")))
+    def fake_embed(df, filename, vector_ids=None, **kwargs):
+        return (vector_ids.tolist() if vector_ids is not None else []), None
+
+    monkeypatch.setattr(ingest, "embed_dataset", fake_embed)
+    base = tmp_path / "base.csv"
+    base.write_text("id,dept\n1,HR\n2,HR\n3,IT\n4,IT\n")
+    ingest_tabular_file(str(base), "base.csv")
+    assert str(memory.df["dept"].dtype) == "category"
+    delta = tmp_path / "delta.csv"
+    delta.write_text("id,dept\n5,Sales\n6,Sales\n")
+    ingest.append_tabular_file(str(delta), "delta.csv")
+    assert str(memory.df["dept"].dtype) == "category"
+    assert memory.df["dept"].tolist() == ["HR", "HR", "IT", "IT", "Sales", "Sales"]
+    memory.clear()
+
+
+def test_append_fractional_value_to_int_column_runs_full_clean(tmp_path, monkeypatch):
+    import backend.core.ingest as ingest
+    from backend.agents.data_cleaner_agent import DataCleanerAgent
+    from backend.core.artifact_cache import ArtifactCache
+    from backend.core.session_memory import memory
+
+    monkeypatch.setattr(ingest, "artifact_cache", ArtifactCache(root=str(tmp_path / "artifacts")))
+    def fake_embed(df, filename, vector_ids=None, **kwargs):
+        return (vector_ids.tolist() if vector_ids is not None else []), None
+
+    monkeypatch.setattr(ingest, "embed_dataset", fake_embed)
+    base = tmp_path / "base.csv"
+    base.write_text("id,qty\n1,10\n2,20\n3,30\n")
+    ingest_tabular_file(str(base), "base.csv")
+    assert memory.column_decisions["qty"]["dtype"] == "int64"
+
+    delta = pd.DataFrame({"id": [4], "qty": [12.5]})
+    cleaner = DataCleanerAgent(delta)
+    assert cleaner.apply_column_decisions(memory.column_decisions)["qty"].tolist() == [12.5]
+    assert cleaner.plan_drift and cleaner.plan_drift[0].startswith("qty:")
+
+    delta_path = tmp_path / "delta.csv"
+    delta.to_csv(delta_path, index=False)
+    ingest.append_tabular_file(str(delta_path), "delta.csv")
+    assert memory.df["qty"].tolist() == [10, 20, 30, 12.5]
+    memory.clear()
+
+
+def test_ingest_cancelled_mid_embed_keeps_previous_dataset(tmp_path, monkeypatch):
+    import sys
+    import types
+    import backend.core.ingest as ingest
+    from backend.core.artifact_cache import ArtifactCache
+    from backend.core.session_memory import memory
+
+    cancel_event = threading.Event()
+    upserted, deleted = [], []
+
+    def fake_upsert(ids, texts, progress_callback=None, **kwargs):
+        upserted.extend(ids)
+        if ids[0].startswith("other.csv"):
+            cancel_event.set()  # cancelled after the first chunk of the second upload
+
+    monkeypatch.setitem(sys.modules, "backend.core.llm_rag", types.SimpleNamespace(upsert_documents_batch=fake_upsert))
+    monkeypatch.setattr(ingest, "artifact_cache", ArtifactCache(enabled=False))
+    monkeypatch.setattr(ingest, "delete_vectors", deleted.extend)
+
+    base = tmp_path / "base.csv"
+    base.write_text("id,qty\n1,10\n2,20\n3,30\n")
+    ingest_tabular_file(str(base), "base.csv")
+    version = memory.dataset_version
+
+    other = tmp_path / "other.csv"
+    other.write_text("id,qty\n" + "".join(f"{i},{i * 7}\n" for i in range(10)))
+    with pytest.raises(IngestCancelled):
+        ingest_tabular_file(str(other), "other.csv", chunk_rows=2, cancel_event=cancel_event)
+    assert deleted == ["other.csv_0", "other.csv_1"]
+    assert memory.filename == "base.csv"
+    assert memory.dataset_version == version
+    assert memory.df["qty"].tolist() == [10, 20, 30]
+    memory.clear()
+
+
+def test_append_replacing_rows_invalidates_cached_vector_ids(tmp_path, monkeypatch):
+    import backend.core.ingest as ingest
+    from backend.core.artifact_cache import ArtifactCache
+    from backend.core.session_memory import memory
+
+    embedded = []
+
+    def fake_embed(df, filename, vector_ids=None, **kwargs):
+        embedded.append(vector_ids.tolist())
+        return vector_ids.tolist(), None
+
+    monkeypatch.setattr(ingest, "artifact_cache", ArtifactCache(root=str(tmp_path / "artifacts")))
+    monkeypatch.setattr(ingest, "embed_dataset", fake_embed)
+    monkeypatch.setattr(ingest, "delete_vectors", lambda ids: None)
+
+    base = tmp_path / "base.csv"
+    base.write_text("id,name,qty\n1,a,10\n2,b,20\n3,c,30\n")
+    ingest_tabular_file(str(base), "base.csv")
+    delta = tmp_path / "delta.csv"
+    delta.write_text("id,name,qty\n3,c,35\n4,d,40\n")
+    ingest.append_tabular_file(str(delta), "delta.csv", key=["id"])
+    assert [vector_id.rsplit("_", 1)[1] for vector_id in embedded[-1]] == ["3", "4"]
+
+    # base.csv_2 was deleted by the append, so the re-upload must embed it again
+    result = ingest_tabular_file(str(base), "base.csv")
+    assert result["cached"] is True
+    assert embedded[-1] == ["base.csv_0", "base.csv_1", "base.csv_2"]
+    memory.clear()
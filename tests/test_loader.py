@@ -3,8 +3,18 @@ import os
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
 
+import json
 import logging
-from backend.core.loader import load_and_split
+from backend.core.loader import (
+    load_and_split,
+    load_document,
+    load_tabular,
+    dataframe_to_texts,
+    load_directory,
+    load_directory_with_stats,
+    DocumentCache,
+)
+import pytest
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
 logger = logging.getLogger("test_loader")
@@ -38,3 +48,85 @@ def test_load_and_split_md():
     except Exception as e:
         logger.error(f"test_load_and_split_md failed: {e}")
         raise
+
+
+def test_load_tabular_csv():
+    logger.info("Running test_load_tabular_csv...")
+    test_file = os.path.abspath(
+        os.path.join(os.path.dirname(__file__), "..", "data", "sample_data.csv")
+    )
+    df = load_tabular(test_file)
+    assert not df.empty
+    texts = dataframe_to_texts(df)
+    assert len(texts) == len(df)
+    assert json.loads(texts[0]).keys() == set(df.columns)
+    docs = load_document(test_file)
+    assert len(docs) == len(df)
+    assert docs[0].page_content == texts[0]
+
+
+def test_load_tabular_parquet_keeps_dtypes(tmp_path):
+    import pandas as pd
+
+    df = pd.DataFrame(
+        {
+            "id": pd.Series([1, 2, 3], dtype="int32"),
+            "code": ["001", "002", "003"],
+            "joined": pd.to_datetime(["2024-01-01", "2024-02-01", "2024-03-01"]),
+        }
+    )
+    for name, writer in (("data.parquet", df.to_parquet), ("data.feather", df.to_feather)):
+        path = str(tmp_path / name)
+        writer(path)
+        loaded = load_tabular(path)
+        assert loaded.dtypes.to_dict() == df.dtypes.to_dict()
+        assert loaded["code"].tolist() == ["001", "002", "003"]
+
+
+def test_load_directory_parallel_and_cached(tmp_path):
+    docs_dir = tmp_path / "kb"
+    (docs_dir / "nested").mkdir(parents=True)
+    for i in range(4):
+        (docs_dir / f"doc{i}.txt").write_text(f"document {i}", encoding="utf-8")
+    (docs_dir / "nested" / "doc4.txt").write_text("document 4", encoding="utf-8")
+    cache = DocumentCache(root=str(tmp_path / "cache"), key=b"test-key")
+
+    docs, stats = load_directory_with_stats(str(docs_dir), workers=2, cache=cache)
+    assert len(docs) == 5
+    assert stats.files_parsed == 5 and stats.files_cached == 0
+    assert stats.bytes_total > 0 and stats.files_per_sec > 0
+
+    (docs_dir / "doc0.txt").write_text("document zero, edited", encoding="utf-8")
+    docs, stats = load_directory_with_stats(str(docs_dir), workers=1, cache=cache)
+    assert stats.files_parsed == 1 and stats.files_cached == 4
+    assert "document zero, edited" in [d.page_content for d in docs]
+
+
+def test_document_cache_is_opt_in_and_signed(tmp_path, monkeypatch):
+    docs_dir = tmp_path / "kb"
+    docs_dir.mkdir()
+    (docs_dir / "doc.txt").write_text("document", encoding="utf-8")
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setenv("DOC_CACHE_DIR", str(cache_dir))
+    monkeypatch.delenv("DOC_CACHE_KEY", raising=False)
+
+    assert len(load_directory(str(docs_dir), workers=1)) == 1
+    assert not cache_dir.exists()
+    with pytest.raises(ValueError):
+        load_directory(str(docs_dir), workers=1, use_cache=True)
+
+    cache = DocumentCache(key=b"test-key")
+    load_directory_with_stats(str(docs_dir), workers=1, cache=cache)
+    entry = next(cache_dir.glob("*.pkl"))
+    _, stats = load_directory_with_stats(str(docs_dir), workers=1, cache=cache)
+    assert stats.files_cached == 1
+
+    # Entries signed with another key, or altered on disk, are re-parsed.
+    _, stats = load_directory_with_stats(str(docs_dir), workers=1, cache=DocumentCache(key=b"other"))
+    assert stats.files_cached == 0
+    load_directory_with_stats(str(docs_dir), workers=1, cache=cache)
+    data = bytearray(entry.read_bytes())
+    data[-2] ^= 0xFF
+    entry.write_bytes(bytes(data))
+    _, stats = load_directory_with_stats(str(docs_dir), workers=1, cache=cache)
+    assert stats.files_cached == 0 and stats.files_parsed == 1
@@ -0,0 +1,117 @@
+"""
+Unit tests for session-keyed datasets under a memory budget.
+"""
+
+import numpy as np
+import pandas as pd
+
+from backend.core.session_memory import DatasetStore, current_session_id, dataset_store, frame_nbytes, memory
+
+
+def _frame(n: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "value": rng.normal(size=n),
+        "city": pd.Series(rng.choice(["Paris", "Rome"], size=n)).astype("category"),
+    })
+
+
+def test_least_recently_used_sessions_spill_and_reload(tmp_path):
+    frames = {name: _frame(1000, seed) for seed, name in enumerate(["a", "b", "c"])}
+    size = frame_nbytes(frames["a"])
+    store = DatasetStore(budget_bytes=2 * size + size // 2, spill_dir=str(tmp_path))
+    for name, df in frames.items():
+        store.session(name).update(df, f"{name}.csv")
+
+    usage = store.usage()
+    assert {entry["session_id"]: entry["resident"] for entry in usage["sessions"]} == {
+        "a": False, "b": True, "c": True
+    }
+    assert usage["resident_bytes"] <= usage["budget_bytes"]
+    assert usage["spilled_bytes"] == size
+    assert len(list(tmp_path.iterdir())) == 1
+
+    # Reading a spilled frame reloads it and spills the now least recently used one
+    pd.testing.assert_frame_equal(store.session("a").df, frames["a"])
+    assert not store.session("b").resident
+    assert store.session("a").resident
+
+    store.session("a").clear()
+    assert store.session("a").df is None
+    assert [entry["session_id"] for entry in store.usage()["sessions"]] == ["b", "c"]
+
+
+def test_memory_follows_current_session():
+    df = _frame(10, 0)
+    token = current_session_id.set("alice")
+    try:
+        memory.update(df, "alice.csv")
+        assert memory.session_id == "alice"
+    finally:
+        current_session_id.reset(token)
+    assert memory.session_id == "default"
+    assert memory.filename != "alice.csv"
+    assert dataset_store.session("alice").df is df
+    dataset_store.drop("alice")
+
+
+def test_snapshot_ids_key_agent_cache_without_hashing(tmp_path, monkeypatch):
+    from backend.agents.base_agent import AgentCache
+    from backend.core.session_memory import snapshot_id_of
+
+    first, second = _frame(1000, 0), _frame(1000, 1)
+    store = DatasetStore(budget_bytes=frame_nbytes(first) + 1, spill_dir=str(tmp_path))
+    session = store.session("a")
+    session.update(first, "a.csv")
+    snapshot_id = session.snapshot_id
+    assert snapshot_id_of(first) == snapshot_id
+    assert snapshot_id_of(first.copy()) is None
+
+    def no_hashing(*args, **kwargs):
+        raise AssertionError("snapshot frames are not hashed")
+
+    monkeypatch.setattr(pd.util, "hash_pandas_object", no_hashing)
+    cache = AgentCache()
+    cache.set("q", session.df, {"answer": 1})
+    assert cache.get("q", first) == {"answer": 1}
+
+    # A spilled and reloaded frame keeps its id; a new frame gets a new one
+    store.session("b").update(second, "b.csv")
+    assert not session.resident
+    reloaded = session.df
+    assert reloaded is not first and snapshot_id_of(reloaded) == snapshot_id
+    assert cache.get("q", reloaded) == {"answer": 1}
+    session.update(second.copy(), "a.csv")
+    assert session.snapshot_id != snapshot_id
+    assert cache.get("q", session.df) is None
+
+
+def test_workers_share_session_datasets(tmp_path):
+    from backend.core.session_memory import snapshot_id_of
+
+    shared, spill = tmp_path / "shm", tmp_path / "spill"
+    worker_a = DatasetStore(budget_bytes=1 << 30, spill_dir=str(spill), shared_dir=str(shared))
+    worker_b = DatasetStore(budget_bytes=1 << 30, spill_dir=str(spill), shared_dir=str(shared))
+    df = _frame(1000, 0)
+    ids = pd.Series([f"a_{i}" for i in range(len(df))], index=df.index, dtype=object)
+    worker_a.session("s").update(df, "a.csv", vector_ids=ids, column_decisions={"value": {"dtype": "float64"}})
+
+    session = worker_b.session("s")
+    assert session.is_active() and not session.resident
+    assert session.filename == "a.csv"
+    assert session.column_decisions == {"value": {"dtype": "float64"}}
+    attached = session.df
+    pd.testing.assert_frame_equal(attached, df)
+    pd.testing.assert_series_equal(session.vector_ids, ids)
+    assert snapshot_id_of(attached) == worker_a.session("s").snapshot_id
+    # Numeric columns are views of the mapped file, not private copies
+    assert not attached["value"].to_numpy().flags.writeable
+
+    # A new snapshot from worker B replaces the old file; clearing it reaches worker A
+    worker_b.session("s").update(_frame(10, 1), "b.csv")
+    assert worker_a.session("s").filename == "b.csv"
+    assert len(worker_a.session("s").df) == 10
+    assert len(list(shared.glob("*.arrow"))) == 1
+    worker_a.session("s").clear()
+    assert not worker_b.session("s").is_active()
+    assert list(shared.iterdir()) == []
@@ -0,0 +1,90 @@
+"""
+Unit tests for session state snapshots and lazy restore.
+"""
+
+import numpy as np
+import pandas as pd
+
+from backend.core.agent_status import get_agent_statuses, reset_all_statuses, update_agent_status
+from backend.core.session_memory import DatasetStore, snapshot_id_of
+from backend.core.session_snapshots import SessionSnapshots
+
+
+def test_snapshot_restores_sessions_lazily(tmp_path):
+    df = pd.DataFrame({"value": np.arange(100, dtype="float64"), "city": ["Paris", "Rome"] * 50})
+    store = DatasetStore(budget_bytes=1 << 30, spill_dir=str(tmp_path / "spill"))
+    session = store.session("alice")
+    ids = pd.Series([f"sales.csv_{i:016x}" for i in range(100)], index=df.index, dtype=object)
+    session.update(
+        df, "sales.csv", vector_ids=ids, column_decisions={"value": {"dtype": "float64"}}, dataset_version="v1"
+    )
+    session.add("user-1", {"role": "user", "content": "hi"})
+    store.session("bob").add("user-2", "chat only")
+    reset_all_statuses()
+    update_agent_status("alice", "Data Cleaner", "complete", "cleaner", "Cleaned")
+
+    snapshots = SessionSnapshots(store, root=str(tmp_path / "snapshots"), interval=0)
+    assert snapshots.save() == 1
+    assert snapshots.save() == 0  # unchanged snapshots are not rewritten
+
+    # A fresh process: metadata is restored eagerly, the frame on first access
+    reset_all_statuses()
+    restored_store = DatasetStore(budget_bytes=1 << 30, spill_dir=str(tmp_path / "spill"))
+    assert SessionSnapshots(restored_store, root=str(tmp_path / "snapshots"), interval=0).restore() == 2
+    restored = restored_store.session("alice")
+    assert restored.is_active() and not restored.resident
+    assert restored.filename == "sales.csv" and restored.dataset_version == "v1"
+    assert restored.column_decisions == {"value": {"dtype": "float64"}}
+    assert restored.get("user-1") == [{"role": "user", "content": "hi"}]
+    assert restored_store.session("bob").get("user-2") == ["chat only"]
+    assert get_agent_statuses("alice")[0]["message"] == "Cleaned"
+    pd.testing.assert_series_equal(restored.vector_ids, ids, check_names=False)
+    pd.testing.assert_frame_equal(restored.df, df)
+    assert snapshot_id_of(restored.df) == session.snapshot_id
+
+    # Replacing the frame keeps the old snapshot file until the next save prunes it
+    restored.update(df.head(10), "sales.csv")
+    assert len(list((tmp_path / "snapshots").glob("*.parquet"))) == 2
+    SessionSnapshots(restored_store, root=str(tmp_path / "snapshots"), interval=0).save()
+    frames = list((tmp_path / "snapshots").glob("*.parquet"))
+    assert len(frames) == 1 and restored.snapshot_id in frames[0].name
+    reset_all_statuses()
+
+
+def test_workers_saving_to_one_directory_merge_their_state(tmp_path):
+    import threading
+
+    root = str(tmp_path / "snapshots")
+    df = pd.DataFrame({"value": np.arange(10, dtype="float64")})
+    first = DatasetStore(budget_bytes=1 << 30, spill_dir=str(tmp_path / "spill-1"))
+    first.session("alice").update(df, "sales.csv")
+    first.session("alice").add("user-1", "from worker 1")
+    second = DatasetStore(budget_bytes=1 << 30, spill_dir=str(tmp_path / "spill-2"))
+    second.session("alice").add("user-2", "from worker 2")
+    second.session("bob").add("user-3", "only on worker 2")
+
+    workers = [SessionSnapshots(store, root=root, interval=0) for store in (first, second)]
+    for _ in range(3):
+        threads = [threading.Thread(target=worker.save) for worker in workers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    assert not list((tmp_path / "snapshots").glob("*.tmp"))
+    assert not (tmp_path / "snapshots" / ".lock").exists()
+
+    restored_store = DatasetStore(budget_bytes=1 << 30, spill_dir=str(tmp_path / "spill-3"))
+    assert SessionSnapshots(restored_store, root=root, interval=0).restore() == 2
+    alice = restored_store.session("alice")
+    pd.testing.assert_frame_equal(alice.df, df)
+    assert alice.get("user-1") == ["from worker 1"] and alice.get("user-2") == ["from worker 2"]
+    assert restored_store.session("bob").get("user-3") == ["only on worker 2"]
+
+
+def test_saved_state_merges_histories_and_statuses():
+    merged = SessionSnapshots._merge_state(
+        {"session_memory": {"a": [1, 2], "b": [1]}, "agent_statuses": {"s1": [{"name": "x"}]}},
+        {"session_memory": {"a": [1], "c": [3]}, "agent_statuses": {"s2": [{"name": "y"}], "s1": []}},
+    )
+    assert merged["session_memory"] == {"a": [1, 2], "b": [1], "c": [3]}
+    assert merged["agent_statuses"] == {"s1": [{"name": "x"}], "s2": [{"name": "y"}]}